@@ -0,0 +1,71 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+from civ.testing import accounts
+
+# Gas usage is compared against a JSON baseline. Missing entries fail; set
+# GAS_BASELINE_UPDATE=1 to record them and re-record everything else.
+BASELINE_PATH = Path(__file__).parent / "gas_baseline.json"
+GAS_TOLERANCE = float(os.environ.get("GAS_TOLERANCE", "0.02"))
+UPDATE_BASELINE = os.environ.get("GAS_BASELINE_UPDATE") == "1"
+
+
+class GasBaseline:
+
+    def __init__(self, path):
+        self.path = path
+        self.gas = json.loads(path.read_text()) if path.exists() else {}
+        self.changed = False
+
+    def check(self, key, gas_used):
+        expected = self.gas.get(key)
+        if UPDATE_BASELINE:
+            self.gas[key] = gas_used
+            self.changed = self.changed or expected != gas_used
+            return
+        if not self.path.exists():
+            pytest.skip(f"No gas baseline at {self.path}, record one with GAS_BASELINE_UPDATE=1")
+        if expected is None:
+            pytest.fail(
+                f"{key} has no baseline ({gas_used} gas), record it with GAS_BASELINE_UPDATE=1"
+            )
+
+        print(f"{key}: {gas_used} gas (baseline {expected})")
+        if gas_used > expected * (1 + GAS_TOLERANCE):
+            pytest.fail(
+                f"{key} regressed: {gas_used} gas vs baseline {expected} "
+                f"(tolerance {GAS_TOLERANCE:.0%})"
+            )
+
+    def save(self):
+        if self.changed:
+            self.path.write_text(json.dumps(self.gas, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture(scope="session")
+def gas_baseline():
+    baseline = GasBaseline(BASELINE_PATH)
+    yield baseline
+    baseline.save()
+
+@pytest.fixture
+def check_gas(gas_baseline):
+    return gas_baseline.check
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+@pytest.fixture
+def make_players():
+    # Dev networks only have 10 accounts, fund extra ones as needed
+    def make_players(n):
+        players = list(accounts[1:n + 1])
+        while len(players) < n:
+            player = accounts.add()
+            accounts[0].transfer(player, "1 ether")
+            players.append(player)
+        return players
+    return make_players
@@ -0,0 +1,142 @@
+import pytest
+from civ.testing import World, accounts
+
+# Gas benchmarks, run with `brownie test benchmarks`
+
+# Domestic actions
+
+@pytest.mark.parametrize('action, strategy', [
+    ('explore', 'explore_strategy'),
+    ('research', 'research_strategy'),
+    ('produce', 'produce_strategy'),
+    ('farm', 'farm_strategy'),
+    ('create', 'create_strategy'),
+])
+def test_play_turn_action(request, check_gas, world, action, strategy):
+    player = accounts[1]
+    world.registerStrategy(request.getfixturevalue(strategy), { 'from': player })
+    world.startGame()
+
+    tx = world.playTurn(player)
+    assert tx.events['TurnAction'][0]['action'] == action
+    check_gas(f"play_turn.{action}", tx.gas_used)
+
+def test_play_turn_train(check_gas, world, attack_strategy):
+    player = accounts[1]
+    world.registerStrategy(attack_strategy, { 'from': player })
+    world.startGame()
+
+    attack_strategy.setTrainTarget(5, { 'from': player })
+    tx = world.playTurn(player)
+    check_gas("play_turn.train", tx.gas_used)
+
+def test_play_turn_no_action(check_gas, world, basic_strategy):
+    player = accounts[1]
+    world.registerStrategy(basic_strategy, { 'from': player })
+    world.startGame()
+
+    tx = world.playTurn(player)
+    check_gas("play_turn.none", tx.gas_used)
+
+# External actions
+
+@pytest.mark.parametrize('approved', [True, False])
+def test_play_turn_trade(check_gas, world, trade_strategy, approved):
+    player, partner = accounts[1:3]
+    world.registerStrategy(trade_strategy, { 'from': player })
+    world.registerStrategy(trade_strategy, { 'from': partner })
+    world.startGame()
+
+    trade_strategy.setTradePartner(partner, { 'from': player })
+    if approved:
+        trade_strategy.setTradePartner(player, { 'from': partner })
+    tx = world.playTurn(player)
+    check_gas(f"play_turn.trade.{'approved' if approved else 'rejected'}", tx.gas_used)
+
+@pytest.mark.parametrize('response, name', [(0, 'retreat'), (1, 'fight'), (2, 'fortify')])
+def test_play_turn_attack(check_gas, world, attack_strategy, response, name):
+    player, defender = accounts[1:3]
+    world.registerStrategy(attack_strategy, { 'from': player })
+    world.registerStrategy(attack_strategy, { 'from': defender })
+    world.startGame()
+
+    attack_strategy.setTrainTarget(5, { 'from': player })
+    attack_strategy.setTrainTarget(2, { 'from': defender })
+    world.playTurn(player)
+    world.playTurn(defender)
+
+    attack_strategy.setAttackTarget(defender, { 'from': player })
+    attack_strategy.setAttackResponse(response, 2, 5, { 'from': defender })
+    tx = world.playTurn(player)
+    check_gas(f"play_turn.attack.{name}", tx.gas_used)
+
+# Packed storage
+
+def test_packed_play_turn_create(check_gas, packed_world, create_strategy):
+    player = accounts[1]
+    packed_world.registerStrategy(create_strategy, { 'from': player })
+    packed_world.startGame()
+
+    tx = packed_world.playTurn(player)
+    check_gas("packed.play_turn.create", tx.gas_used)
+
+def test_packed_play_turn_attack(check_gas, packed_world, attack_strategy):
+    player, defender = accounts[1:3]
+    packed_world.registerStrategy(attack_strategy, { 'from': player })
+    packed_world.registerStrategy(attack_strategy, { 'from': defender })
+    packed_world.startGame()
+
+    attack_strategy.setTrainTarget(5, { 'from': player })
+    attack_strategy.setTrainTarget(2, { 'from': defender })
+    packed_world.playTurn(player)
+    packed_world.playTurn(defender)
+
+    attack_strategy.setAttackTarget(defender, { 'from': player })
+    attack_strategy.setAttackResponse(1, 2, 0, { 'from': defender })
+    tx = packed_world.playTurn(player)
+    check_gas("packed.play_turn.attack.fight", tx.gas_used)
+
+# Admin
+
+def test_register_strategy(check_gas, world, create_strategy):
+    tx = world.registerStrategy(create_strategy, { 'from': accounts[1] })
+    check_gas("register_strategy", tx.gas_used)
+
+# migratePlayers copies every player in one transaction, so N is bounded by
+# the block gas limit
+@pytest.mark.parametrize('num_players', [10, 40])
+def test_migrate_players(check_gas, make_players, world, create_strategy, num_players):
+    players = make_players(num_players)
+    for player in players:
+        world.registerStrategy(create_strategy, { 'from': player })
+    world.startGame()
+
+    new_world = accounts[0].deploy(World)
+    new_world.migrateWorld(world)
+    tx = new_world.migratePlayers(world, players)
+    check_gas(f"migrate_players.{num_players}", tx.gas_used)
+
+@pytest.mark.parametrize('num_players', [10, 100, 500])
+def test_full_round(check_gas, make_players, world, create_strategy, num_players):
+    players = make_players(num_players)
+    for player in players:
+        world.registerStrategy(create_strategy, { 'from': player })
+    world.startGame()
+
+    gas_used = sum(world.playTurn(player).gas_used for player in players)
+    assert world.currentTurn() == 2
+    check_gas(f"round.{num_players}", gas_used)
+
+# playTurns plays a whole round in batches, compare with `round.N`
+@pytest.mark.parametrize('num_players', [10, 100])
+def test_full_round_batched(check_gas, make_players, world, create_strategy, num_players):
+    players = make_players(num_players)
+    for player in players:
+        world.registerStrategy(create_strategy, { 'from': player })
+    world.startGame()
+
+    gas_used = sum(
+        world.playTurns(players[i:i + 50]).gas_used for i in range(0, num_players, 50)
+    )
+    assert world.currentTurn() == 2
+    check_gas(f"round_batched.{num_players}", gas_used)
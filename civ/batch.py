@@ -0,0 +1,119 @@
+"""
+Vectorized simulator for many concurrent games.
+
+Player state is held as int64 columns of shape `(games, players)`, so one
+call to `BatchWorld.step` plays a full round of every game at once. Only the
+production step and domestic actions are vectorized: they never touch another
+player, so the order players go in within a round does not matter. Use
+`civ.engine` for games with trades or attacks.
+"""
+import numpy as np
+
+from civ.helpers import (
+    FOOD_PER_FARM,
+    INITIAL_LAND,
+    INITIAL_POP,
+    INITIAL_RESOURCES,
+    POP_PER_SCIENCE,
+    TURN_ACTIONS,
+)
+
+COLUMNS = ('land', 'farms', 'science', 'culture', 'soldiers', 'population', 'resources')
+
+NONE = TURN_ACTIONS.index('')
+EXPLORE = TURN_ACTIONS.index('explore')
+RESEARCH = TURN_ACTIONS.index('research')
+PRODUCE = TURN_ACTIONS.index('produce')
+FARM = TURN_ACTIONS.index('farm')
+CREATE = TURN_ACTIONS.index('create')
+TRAIN = TURN_ACTIONS.index('train')
+
+DOMESTIC_ACTIONS = (NONE, EXPLORE, RESEARCH, PRODUCE, FARM, CREATE, TRAIN)
+
+
+class BatchWorld:
+
+    def __init__(self, games, players):
+        shape = (games, players)
+        self.shape = shape
+        self.current_turn = 0
+
+        self.land = np.full(shape, INITIAL_LAND, dtype=np.int64)
+        self.farms = np.zeros(shape, dtype=np.int64)
+        self.science = np.ones(shape, dtype=np.int64)
+        self.culture = np.zeros(shape, dtype=np.int64)
+        self.soldiers = np.zeros(shape, dtype=np.int64)
+        self.population = np.full(shape, INITIAL_POP, dtype=np.int64)
+        self.resources = np.full(shape, INITIAL_RESOURCES, dtype=np.int64)
+
+        self.active = np.ones(shape, dtype=bool)
+
+    def civilian_population(self):
+        return np.where(
+            self.soldiers > self.population, 0, self.population - self.soldiers
+        )
+
+    def unfarmed_land(self):
+        return np.where(self.farms > self.land, 0, self.land - self.farms)
+
+    # Production, see `World._updatePopulation` and `World._updateResources`
+
+    def update_production(self, mask):
+        pop = self.population
+        new_pop = np.where(pop < 10, pop + 1, pop + pop // 10)
+        grow = (
+            mask
+            & (self.farms * FOOD_PER_FARM >= pop)
+            & (new_pop <= self.science * POP_PER_SCIENCE)
+        )
+        np.copyto(self.population, new_pop, where=grow)
+        self.resources += np.where(mask, self.unfarmed_land(), 0)
+
+    def _pay(self, mask, cost):
+        paid = mask & (cost <= self.resources)
+        self.resources -= np.where(paid, cost, 0)
+        return paid
+
+    def step(self, actions, params=None):
+        """
+        Play one round of every game.
+
+        `actions` holds a `TURN_ACTIONS` code per player and `params` the
+        `farm`/`train` argument. Both broadcast against `(games, players)`.
+        Inactive players are skipped.
+        """
+        actions = np.broadcast_to(np.asarray(actions), self.shape)
+        if params is None:
+            params = 0
+        params = np.broadcast_to(np.asarray(params, dtype=np.int64), self.shape)
+        if not np.isin(actions, DOMESTIC_ACTIONS).all():
+            raise ValueError("Only domestic actions can be simulated in batch")
+
+        mask = self.active
+        self.current_turn += 1
+        self.update_production(mask)
+
+        # Each player acts once, so civilians can be shared across actions
+        civilians = self.civilian_population()
+
+        self.land += mask & (actions == EXPLORE)
+
+        researched = self._pay(mask & (actions == RESEARCH), (self.science + 1) * 10)
+        self.science += researched
+
+        self.resources += np.where(mask & (actions == PRODUCE), civilians, 0)
+
+        new_farms = np.minimum(params, self.unfarmed_land())
+        farmed = self._pay(mask & (actions == FARM), new_farms * 10)
+        self.farms += np.where(farmed, new_farms, 0)
+
+        self.culture += np.where(mask & (actions == CREATE), civilians, 0)
+
+        new_soldiers = np.minimum(params, civilians)
+        trained = self._pay(mask & (actions == TRAIN), new_soldiers)
+        self.soldiers += np.where(trained, new_soldiers, 0)
+
+    def run(self, policy, turns):
+        """Step `turns` rounds, asking `policy(world)` for `(actions, params)`."""
+        for _ in range(turns):
+            self.step(*policy(self))
@@ -0,0 +1,206 @@
+"""
+Block-scoped read-through cache for `World` views.
+
+`CachedWorld` wraps a brownie `World` contract and memoizes its view calls by
+`(block, method, args)` in an LRU of `maxsize` entries. Views are called at
+that block, so every cached value is the one the node would return for it.
+The chain head is read at most every `block_interval` seconds, and a new head
+drops everything cached for older blocks. Transactions sent through the
+wrapper go to the contract and refresh the head.
+
+With `events=True`, per-player state views (`PLAYER_VIEWS`) outlive their
+block: on a new head, `TurnSummary`, `TurnAction` and `Resign` logs since the
+last head are fetched and only the players they name, opponents included,
+are invalidated. Registrations, strategy updates and migrations emit no
+events: sent through the wrapper they clear the cache, sent around it call
+`clear` after them.
+
+Heads are tracked by hash: a new head that doesn't descend from the last one
+read, at any height, is a reorg and drops the whole cache.
+
+    world = CachedWorld(World.at(address), events=True)
+    world.currentTurn(), world.getState(player)
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from brownie import web3
+from civ.state import WORD, to_address
+
+DEFAULT_CACHE_SIZE = 65536
+DEFAULT_BLOCK_INTERVAL = 1
+
+# Views of a single player's state, refreshed from events with `events=True`
+PLAYER_VIEWS = ('getState', 'getCivilianPopulation', 'isPlayerActive')
+EVENTS = ('TurnSummary', 'TurnAction', 'Resign')
+# Transactions changing player views without an event
+UNLOGGED_TRANSACTIONS = (
+    'registerStrategy', 'updateStrategy',
+    'migrateWorld', 'migratePlayers', 'migrateRegisteredPlayers',
+)
+
+# Entries kept across blocks with `events=True`
+ANY_BLOCK = None
+
+
+def _key(arg):
+    # Addresses as lowercase strings, whether accounts, contracts or strings
+    if hasattr(arg, 'address'):
+        arg = arg.address
+    if isinstance(arg, str) and arg.startswith('0x') and len(arg) == 42:
+        return arg.lower()
+    if isinstance(arg, (list, tuple)):
+        return tuple(_key(item) for item in arg)
+    return arg
+
+
+def touched_players(logs, topics):
+    """
+    Players named by raw `World` logs of the events in `topics` (by name),
+    `TurnAction` opponents included.
+    """
+    players = set()
+    event_topics = set(topics.values())
+    for log in logs:
+        log_topics = [bytes(topic) for topic in log['topics']]
+        if not log_topics or log_topics[0] not in event_topics:
+            continue
+        players.add(to_address(log_topics[1]).lower())
+        # TurnAction data: action string offset, opponent, param
+        if log_topics[0] == topics['TurnAction']:
+            players.add(to_address(bytes(log['data'])[WORD:2 * WORD]).lower())
+    return players
+
+
+class CachedWorld:
+
+    def __init__(
+        self, world, maxsize=DEFAULT_CACHE_SIZE, block_interval=DEFAULT_BLOCK_INTERVAL,
+        events=False,
+    ):
+        self.world = world
+        self.maxsize = maxsize
+        self.block_interval = block_interval
+        self.events = events
+        self.views = {
+            abi['name'] for abi in world.abi
+            if abi['type'] == 'function' and abi['stateMutability'] in ('view', 'pure')
+        }
+        self.topics = {name: bytes.fromhex(world.topics[name][2:]) for name in EVENTS}
+
+        self.hits = 0
+        self.misses = 0
+        self.block = None
+        self.block_hash = None
+        self._block_time = 0
+        self._cache = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def address(self):
+        return self.world.address
+
+    def __getattr__(self, name):
+        attr = getattr(self.world, name)
+        if name in self.views:
+            return lambda *args: self.call(name, *args)
+        if callable(attr) and hasattr(attr, 'transact'):
+            return self._transaction(name, attr)
+        return attr
+
+    def __repr__(self):
+        return f"<CachedWorld {self.world.address} {len(self._cache)} entries>"
+
+    def __len__(self):
+        return len(self._cache)
+
+    def call(self, method, *args):
+        """Call the view `method`, from the cache when possible."""
+        block = self.head()
+        args_key = _key(args)
+        scope = ANY_BLOCK if self.events and method in PLAYER_VIEWS else block
+        key = (scope, method, args_key)
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+
+        value = getattr(self.world, method)(*args, block_identifier=block)
+        with self._lock:
+            # Don't store results of a block the cache has moved past
+            if block == self.block:
+                self._cache[key] = value
+                if len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+        return value
+
+    def head(self):
+        """Current block, read from the node at most every `block_interval` seconds."""
+        with self._lock:
+            if self.block is None or time.monotonic() - self._block_time >= self.block_interval:
+                self.refresh()
+            return self.block
+
+    def refresh(self):
+        """Read the chain head now, invalidating entries it makes stale."""
+        with self._lock:
+            head = web3.eth.get_block('latest')
+            block, block_hash = head['number'], bytes(head['hash'])
+            self._block_time = time.monotonic()
+            if block_hash == self.block_hash:
+                return block
+
+            if self.block is not None and not self._extends(head):
+                # A reorg replaced blocks read from, whatever the new height
+                self.clear()
+            elif self.events and self.block is not None:
+                logs = web3.eth.get_logs({
+                    'address': self.world.address,
+                    'fromBlock': self.block + 1,
+                    'toBlock': block,
+                })
+                self.invalidate(touched_players(logs, self.topics), ANY_BLOCK)
+            elif self.events:
+                self.invalidate(scope=ANY_BLOCK)
+
+            self.block = block
+            self.block_hash = block_hash
+            for key in [key for key in self._cache if key[0] not in (ANY_BLOCK, block)]:
+                del self._cache[key]
+            return block
+
+    def _extends(self, head):
+        # Whether `head` descends from the last head read
+        if head['number'] <= self.block:
+            return False
+        if head['number'] == self.block + 1:
+            parent = head['parentHash']
+        else:
+            parent = web3.eth.get_block(self.block)['hash']
+        return bytes(parent) == self.block_hash
+
+    def invalidate(self, players=None, scope=ANY_BLOCK):
+        """Drop `scope` entries of `players` (all of them by default)."""
+        with self._lock:
+            players = None if players is None else {_key(player) for player in players}
+            for key in list(self._cache):
+                if key[0] == scope and (players is None or (key[2] and key[2][0] in players)):
+                    del self._cache[key]
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _transaction(self, name, fn):
+        def transact(*args):
+            try:
+                return fn(*args)
+            finally:
+                if name in UNLOGGED_TRANSACTIONS:
+                    self.clear()
+                self.refresh()
+        return transact
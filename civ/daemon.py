@@ -0,0 +1,98 @@
+"""
+Resident game master loop.
+
+`TurnDaemon` keeps the account, world and connection across rounds. On every
+new block it reads the round with one `getSnapshot` call and plays, through a
+`TurnRunner`, exactly the active players whose `currentTurn` is behind the
+world's. The last turn of a round moves the world to the next turn, so the
+next block starts the next round without waiting for a cron run. Without a
+player list, players are read from the world's registry every tick, along
+with players still to pull from a lazy migration source.
+"""
+import logging
+import random
+import time
+
+from brownie import web3
+from civ.migration import get_active_players
+from civ.runner import DEFAULT_WINDOW, TurnRunner
+
+DEFAULT_POLL_INTERVAL = 1
+
+logger = logging.getLogger(__name__)
+
+
+class TurnDaemon:
+
+    def __init__(
+        self, world, account, players,
+        window=DEFAULT_WINDOW, poll_interval=DEFAULT_POLL_INTERVAL, shuffle=True, runner=None,
+    ):
+        self.world = world
+        self.players = list(players) if players is not None else None
+        self.poll_interval = poll_interval
+        self.shuffle = shuffle
+        self.runner = runner or TurnRunner(world, account, window=window)
+
+        self.last_block = None
+        self.turn = None
+        # Players already sent this turn, in case the node lags behind receipts
+        self.played = set()
+        self._running = False
+
+    def tick(self):
+        """Play whoever is due this turn. Returns the round report, or None if idle."""
+        players = self.players if self.players is not None else get_active_players(self.world)
+        report, pending = self.runner.read_round(players)
+        if report.turn != self.turn:
+            self.turn = report.turn
+            self.played = set()
+
+        # Game not started, or ended
+        if report.turn == 0:
+            return None
+
+        pending = [player for player in pending if player not in self.played]
+        if not pending:
+            return None
+
+        # Turn order matters for attacks and trades, don't favour anyone
+        if self.shuffle:
+            random.shuffle(pending)
+        self.runner.play(pending, report)
+        self.played.update(report.played)
+
+        logger.info(
+            "Turn %s: played %s, failed %s", report.turn, len(report.played), len(report.failed)
+        )
+        for player, reason in report.failed.items():
+            logger.warning("Turn %s: %s failed -> %s", report.turn, player, reason)
+        return report
+
+    def wait_for_block(self):
+        while self._running:
+            block = web3.eth.block_number
+            if block != self.last_block:
+                self.last_block = block
+                return block
+            time.sleep(self.poll_interval)
+        return None
+
+    def run(self, max_ticks=None):
+        """Tick on every new block until `stop` is called or `max_ticks` ticks ran."""
+        self._running = True
+        ticks = 0
+        while self._running and (max_ticks is None or ticks < max_ticks):
+            if self.wait_for_block() is None:
+                break
+            try:
+                self.tick()
+            except Exception:
+                # Keep the daemon alive through RPC hiccups, retry next block
+                logger.exception("Tick failed")
+                self.runner.nonces.reset()
+            ticks += 1
+        self._running = False
+
+    def stop(self):
+        self._running = False
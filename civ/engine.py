@@ -0,0 +1,539 @@
+"""
+Pure-Python reference implementation of `World.sol`.
+
+The engine mirrors the contract turn rules one to one so strategies can be
+simulated off-chain without sending `playTurn` transactions. Python strategies
+implement the `IStrategy` callbacks:
+
+- `handle_turn(world, state)` calls at most one action on `world`
+- `handle_trade(requester_state, self_state)` returns whether to approve
+- `handle_attack(attacker_state, self_state, attackers)` returns
+  `(AttackResponse, defenders, fortifications)`
+
+Callbacks receive copies of player state, like the calldata copies strategy
+contracts get. As with the contract's `try ... catch {}`, a failing
+`handle_turn` rolls back whatever it did and the turn goes on. A failing
+`handle_trade` or `handle_attack` declines or retreats, but a response the
+contract couldn't decode reverts the action. Gas limits are not modelled.
+"""
+from enum import IntEnum
+
+from civ.helpers import (
+    DEFENSE_CULTURE_BONUS,
+    FOOD_PER_FARM,
+    MAX_FORTIFICATION,
+    POP_PER_SCIENCE,
+    RESIGN_MESSAGE_LAND,
+    RESIGN_MESSAGE_POP,
+)
+from civ.state import PlayerState
+
+# Revert messages, as in World.sol
+ERROR_GAME_IN_PROGRESS = "Game is in progress"
+ERROR_GAME_NOT_IN_PROGRESS = "Game not in progress"
+ERROR_PLAYER_NOT_ACTIVE = "Player is not active"
+ERROR_PLAYER_ALREADY_PLAYED = "Player already played this turn"
+ERROR_ONLY_PLAYER_NOT_ACTED = "Player already acted this turn"
+ERROR_ONLY_ACTIVE_STRATEGY = "Can only be called by active strategy"
+# The contract reverts without a reason when calling an address with no code
+ERROR_NO_STRATEGY = "Player has no strategy"
+# Without a reason either when a callback's return data doesn't decode
+ERROR_UNDECODABLE_RESPONSE = "Undecodable callback response"
+
+UINT_LIMIT = 2 ** 256
+
+RESIGN_MESSAGE_RESIGNED = "Player resigned"
+
+
+class Revert(Exception):
+    """Raised wherever `World.sol` would revert."""
+
+
+class AttackResponse(IntEnum):
+    RETREAT = 0
+    FIGHT = 1
+    FORTIFY = 2
+
+
+# Production
+
+def get_civilian_population(state):
+    # Should never happen, but guarding here anyway
+    if state.soldiers > state.population:
+        return 0
+    return state.population - state.soldiers
+
+def get_unfarmed_land(state):
+    # Should never happen, but guarding here anyway
+    if state.farms > state.land:
+        return 0
+    return state.land - state.farms
+
+# Grow by 10%, with minimum of 1
+def compute_new_population(population):
+    if population < 10:
+        return population + 1
+    return population + population // 10
+
+def compute_next_science_cost(state):
+    return (state.science + 1) * 10
+
+# Grow while there's at least as much food as population, capped by science
+def update_population(state):
+    if state.farms * FOOD_PER_FARM >= state.population:
+        new_pop = compute_new_population(state.population)
+        if new_pop <= state.science * POP_PER_SCIENCE:
+            state.population = new_pop
+
+# Each unfarmed land produces 1 resource per turn
+def update_resources(state):
+    state.resources += get_unfarmed_land(state)
+
+def update_production(state):
+    update_population(state)
+    update_resources(state)
+
+def pay_resources(state, cost):
+    if cost <= state.resources:
+        state.resources -= cost
+        return True
+    return False
+
+# Validation
+
+def validate_farms(state, farms):
+    return min(farms, get_unfarmed_land(state))
+
+def validate_train(state, soldiers):
+    return min(soldiers, get_civilian_population(state))
+
+def validate_attack_response(state, resp, defenders, fortifications):
+    return (
+        resp,
+        min(defenders, state.soldiers),
+        min(fortifications, MAX_FORTIFICATION),
+    )
+
+# Domestic actions
+
+def explore(state):
+    state.land += 1
+
+def research(state):
+    if pay_resources(state, compute_next_science_cost(state)):
+        state.science += 1
+
+def produce(state):
+    state.resources += get_civilian_population(state)
+
+def farm(state, farms):
+    new_farms = validate_farms(state, farms)
+    if pay_resources(state, new_farms * 10):
+        state.farms += new_farms
+
+def create(state):
+    state.culture += get_civilian_population(state)
+
+def train(state, soldiers):
+    new_soldiers = validate_train(state, soldiers)
+    if pay_resources(state, new_soldiers):
+        state.soldiers += new_soldiers
+
+# External actions
+
+def resolve_trade(proposer_state, receiver_state, approve):
+    if approve:
+        proposer_civilians = get_civilian_population(proposer_state)
+        receiver_civilians = get_civilian_population(receiver_state)
+
+        proposer_state.resources += receiver_civilians
+        proposer_state.culture += receiver_civilians
+
+        receiver_state.resources += proposer_civilians
+        receiver_state.culture += proposer_civilians
+
+def compute_loot(state):
+    if state.resources == 0:
+        return 0
+    if state.resources < state.land:
+        return 1
+    return state.resources // state.land
+
+def take_loot(attacker_state, defender_state):
+    loot = compute_loot(defender_state)
+    if loot > defender_state.resources:
+        defender_state.resources = 0
+    else:
+        attacker_state.resources += loot
+        defender_state.resources -= loot
+
+def take_land(attacker_state, defender_state):
+    if defender_state.land > 0:
+        attacker_state.land += 1
+        if defender_state.land == defender_state.farms:
+            defender_state.farms -= 1
+        defender_state.land -= 1
+
+def take_casualties(state, soldiers):
+    # Remove from soldiers
+    if soldiers >= state.soldiers:
+        state.soldiers = 0
+    else:
+        state.soldiers -= soldiers
+
+    # Remove from general population
+    if soldiers >= state.population:
+        state.population = 0
+    else:
+        state.population -= soldiers
+
+def resolve_attack(attacker_state, defender_state, soldiers, resp, defenders, fortification):
+    """Apply an already validated attack response, as `World.attack` does."""
+    success = False
+    has_battle = False
+
+    if resp == AttackResponse.RETREAT:
+        success = True
+    elif resp == AttackResponse.FIGHT:
+        has_battle = True
+        success = soldiers > defenders
+    elif resp == AttackResponse.FORTIFY:
+        has_battle = True
+        if pay_resources(defender_state, fortification):
+            success = soldiers > defenders + fortification
+        else:
+            success = soldiers > defenders
+
+    # Handle win/loss rewards
+    if success:
+        take_loot(attacker_state, defender_state)
+        take_land(attacker_state, defender_state)
+    elif has_battle:
+        defender_state.culture += DEFENSE_CULTURE_BONUS
+
+    # Take casualties
+    if has_battle:
+        take_casualties(attacker_state, soldiers)
+        take_casualties(defender_state, defenders)
+
+
+def _is_uint(value):
+    return isinstance(value, int) and not isinstance(value, bool) and 0 <= value < UINT_LIMIT
+
+def _call_handle_attack(strategy, attacker_state, defender_state, soldiers):
+    # A failing callback is caught and leaves the defaults, a retreat. Return
+    # data that doesn't decode isn't: it reverts the attack itself.
+    try:
+        response = strategy.handle_attack(
+            attacker_state.copy(), defender_state.copy(), soldiers
+        )
+    except Exception:
+        return AttackResponse.RETREAT, 0, 0
+    try:
+        resp, defenders, fortifications = response
+        resp = AttackResponse(resp)
+    except (TypeError, ValueError):
+        raise Revert(ERROR_UNDECODABLE_RESPONSE) from None
+    if not (_is_uint(defenders) and _is_uint(fortifications)):
+        raise Revert(ERROR_UNDECODABLE_RESPONSE)
+    return resp, defenders, fortifications
+
+def _call_handle_trade(strategy, proposer_state, receiver_state):
+    # As for attacks, a failing callback declines and a non-bool reverts the trade
+    try:
+        approve = strategy.handle_trade(proposer_state.copy(), receiver_state.copy())
+    except Exception:
+        return False
+    if not isinstance(approve, int) or approve not in (0, 1):
+        raise Revert(ERROR_UNDECODABLE_RESPONSE)
+    return bool(approve)
+
+class World:
+    """
+    In-process `World`. Players are any hashable ids, strategies any object
+    implementing the `IStrategy` callbacks. Game master checks are not modelled.
+
+    With `record_events`, emitted events are appended to `events` as
+    `(name, args)` tuples whose args use the contract's event field names.
+    """
+
+    def __init__(self, record_events=False):
+        self.game_number = 0
+        self.game_started = False
+        self.game_ended = False
+
+        self.num_active_players = 0
+        self.current_turn = 0
+        self.current_turn_completed = 0
+
+        self.record_events = record_events
+        self.events = []
+
+        self._active_players = set()
+        self._player_strategy = {}
+        self._player_states = {}
+
+        self._active_player = None
+        self._has_player_acted = False
+        self._journal = None
+
+    # Game admin
+
+    def is_game_in_progress(self):
+        return self.game_started and not self.game_ended
+
+    def start_game(self):
+        self._require_game_not_in_progress()
+        self.game_started = True
+        self.game_number += 1
+        self.current_turn = 1
+
+    def end_game(self):
+        if not self.is_game_in_progress():
+            raise Revert(ERROR_GAME_NOT_IN_PROGRESS)
+        self.current_turn = 0
+        self.game_ended = True
+
+    # Player admin
+
+    def register_strategy(self, player, strategy):
+        self._require_game_not_in_progress()
+        self._player_strategy[player] = strategy
+        self._player_states[player] = PlayerState.initial(player)
+
+        if player not in self._active_players:
+            self._active_players.add(player)
+            self.num_active_players += 1
+
+    def update_strategy(self, player, strategy):
+        self._require_player_active(player)
+        self._player_strategy[player] = strategy
+
+    def resign(self, player):
+        self._resign(player, RESIGN_MESSAGE_RESIGNED)
+
+    # Getters
+
+    @property
+    def players(self):
+        return list(self._player_states)
+
+    def is_player_active(self, player):
+        return player in self._active_players
+
+    def get_strategy(self, player):
+        return self._player_strategy.get(player)
+
+    def get_state(self, player):
+        state = self._player_states.get(player)
+        return state.copy() if state is not None else PlayerState()
+
+    def get_civilian_population(self, player):
+        return get_civilian_population(self.get_state(player))
+
+    def get_next_science_cost(self, state):
+        return compute_next_science_cost(state)
+
+    # Game mechanics
+
+    def play_turn(self, player):
+        self._require_player_active(player)
+        state = self._player_states[player]
+        if state.current_turn >= self.current_turn:
+            raise Revert(ERROR_PLAYER_ALREADY_PLAYED)
+        strategy = self._player_strategy.get(player)
+        if strategy is None:
+            raise Revert(ERROR_NO_STRATEGY)
+
+        # Init turn
+        state.current_turn += 1
+        self._active_player = player
+        update_production(state)
+
+        try:
+            strategy.handle_turn(self, state.copy())
+        except Exception:
+            self._rollback()
+
+        # Finish turn
+        self._active_player = None
+        self._has_player_acted = False
+        self._journal = None
+
+        if self.record_events:
+            self._emit('TurnSummary', {
+                'player': player,
+                'game': self.game_number,
+                'turn': self.current_turn,
+                'land': state.land,
+                'farms': state.farms,
+                'science': state.science,
+                'culture': state.culture,
+                'soldiers': state.soldiers,
+                'population': state.population,
+                'resources': state.resources,
+            })
+
+        # Progress turn
+        self.current_turn_completed += 1
+        if self.current_turn_completed == self.num_active_players:
+            self.current_turn += 1
+            self.current_turn_completed = 0
+
+    def play_turns(self, players):
+        """
+        Like `World.playTurns`, skip inactive players and players who already
+        played this turn. Returns how many turns were played. Unlike the
+        contract, turns played before a revert are kept.
+        """
+        played = 0
+        for player in players:
+            if player not in self._active_players:
+                continue
+            if self._player_states[player].current_turn >= self.current_turn:
+                continue
+            self.play_turn(player)
+            played += 1
+        return played
+
+    # Domestic actions
+
+    def explore(self):
+        explore(self._begin_action())
+        self._finish_action('explore')
+
+    def research(self):
+        research(self._begin_action())
+        self._finish_action('research')
+
+    def produce(self):
+        produce(self._begin_action())
+        self._finish_action('produce')
+
+    def farm(self, farms):
+        farm(self._begin_action(), farms)
+        self._finish_action('farm', param=farms)
+
+    def create(self):
+        create(self._begin_action())
+        self._finish_action('create')
+
+    def train(self, soldiers):
+        train(self._begin_action(), soldiers)
+        self._finish_action('train', param=soldiers)
+
+    # External actions
+
+    def trade(self, partner):
+        proposer_state = self._begin_action(partner)
+        receiver_state = self._player_states[partner]
+
+        approve = _call_handle_trade(
+            self._player_strategy[partner], proposer_state, receiver_state
+        )
+        resolve_trade(proposer_state, receiver_state, approve)
+        self._finish_action('trade', opponent=partner)
+
+    def attack(self, target, soldiers):
+        attacker_state = self._begin_action(target)
+        defender_state = self._player_states[target]
+
+        resp, defenders, fortification = _call_handle_attack(
+            self._player_strategy[target], attacker_state, defender_state, soldiers
+        )
+        resp, defenders, fortification = validate_attack_response(
+            defender_state, resp, defenders, fortification
+        )
+        resolve_attack(
+            attacker_state, defender_state, soldiers, resp, defenders, fortification
+        )
+
+        # Clean up, check for defeat
+        self._process_defeat_conditions(attacker_state)
+        self._process_defeat_conditions(defender_state)
+        self._finish_action('attack', opponent=target, param=soldiers)
+
+    # Internal
+
+    def _require_game_not_in_progress(self):
+        if self.is_game_in_progress():
+            raise Revert(ERROR_GAME_IN_PROGRESS)
+
+    def _require_player_active(self, player):
+        if player not in self._active_players:
+            raise Revert(ERROR_PLAYER_NOT_ACTIVE)
+
+    def _begin_action(self, opponent=None):
+        if self._active_player is None:
+            raise Revert(ERROR_ONLY_ACTIVE_STRATEGY)
+        if self._has_player_acted:
+            raise Revert(ERROR_ONLY_PLAYER_NOT_ACTED)
+
+        players = [self._active_player]
+        if opponent is not None:
+            if self._player_strategy.get(opponent) is None:
+                raise Revert(ERROR_NO_STRATEGY)
+            players.append(opponent)
+
+        # Snapshot everything the action can touch so a failing
+        # `handle_turn` can be rolled back, like a reverted call
+        if self._journal is None:
+            self._journal = (
+                [
+                    (player, self._player_states[player].copy(), player in self._active_players)
+                    for player in players
+                ],
+                self.num_active_players,
+                len(self.events),
+            )
+        return self._player_states[self._active_player]
+
+    def _finish_action(self, action, opponent=None, param=0):
+        self._has_player_acted = True
+        if self.record_events:
+            self._emit('TurnAction', {
+                'player': self._active_player,
+                'game': self.game_number,
+                'turn': self.current_turn,
+                'action': action,
+                'opponent': opponent,
+                'param': param,
+            })
+
+    def _rollback(self):
+        if self._journal is None:
+            return
+        snapshots, num_active_players, num_events = self._journal
+        for player, snapshot, is_active in snapshots:
+            state = self._player_states[player]
+            for key in PlayerState.__slots__:
+                setattr(state, key, getattr(snapshot, key))
+            if is_active:
+                self._active_players.add(player)
+            else:
+                self._active_players.discard(player)
+        self.num_active_players = num_active_players
+        del self.events[num_events:]
+        self._has_player_acted = False
+        self._journal = None
+
+    def _process_defeat_conditions(self, state):
+        if state.population == 0:
+            self._resign(state.player, RESIGN_MESSAGE_POP)
+        elif state.land == 0:
+            self._resign(state.player, RESIGN_MESSAGE_LAND)
+
+    def _resign(self, player, reason):
+        if player in self._active_players:
+            self._active_players.discard(player)
+            self.num_active_players -= 1
+            if self.record_events:
+                self._emit('Resign', {
+                    'player': player,
+                    'game': self.game_number,
+                    'turn': self.current_turn,
+                    'reason': reason,
+                })
+
+    def _emit(self, name, args):
+        self.events.append((name, args))
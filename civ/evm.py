@@ -0,0 +1,714 @@
+"""
+In-process EVM backend for the test suite.
+
+Runs the contracts built by `brownie compile` (`build/contracts`) on
+eth-tester's py-evm backend inside the test process. Calls and transactions
+go straight to `EthereumTester`, with no node and no JSON-RPC in between, and
+tests snapshot and revert the chain instead of growing one chain for the
+whole run.
+
+The objects here mirror the parts of brownie's API the tests and `civ` use:
+`accounts[0].deploy(World)`, `World.at(address)`, views, and transactions
+with a `{'from': account}` dict (the deployer by default). Receipts have
+`events`, `logs`, `return_value`, `gas_used` and `status`. There are also
+`reverts(message)`, `chain` and `given`. `connect` points `brownie.web3` at
+the same chain, so `civ.indexer`, `civ.cache` and `civ.state` work unchanged.
+
+Transactions are mined one per block as they're sent, and nonces are assigned
+in the order they're sent. Traces aren't available, and neither are
+brownie's `Contract` objects, which `civ.migration.get_source` needs.
+
+    containers = connect()
+    world = accounts[0].deploy(containers['World'])
+    with isolation():
+        world.startGame()
+"""
+import ast
+import functools
+import inspect
+import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from brownie.network.transaction import Status
+from eth_abi import decode, encode
+from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector, to_checksum_address
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+
+BUILD_PATH = Path(__file__).resolve().parent.parent / 'build' / 'contracts'
+ZERO_ADDRESS = '0x' + '0' * 40
+REVERT_SELECTOR = bytes.fromhex('08c379a0')
+
+_tester = None
+_lock = threading.RLock()
+_contracts = {}
+_generation = 0
+
+
+class VirtualMachineError(Exception):
+    """A reverted call or transaction, as brownie's `VirtualMachineError`."""
+
+    def __init__(self, revert_msg=None, tx=None):
+        super().__init__(f"revert: {revert_msg}" if revert_msg else "revert")
+        self.revert_msg = revert_msg
+        self.tx = tx
+
+
+def connect(build_path=BUILD_PATH):
+    """
+    Start the chain and point `brownie.web3` at it. Returns a
+    `ContractContainer` per contract in `build_path`.
+    """
+    global _tester
+    try:
+        from eth_tester import EthereumTester, PyEVMBackend
+        from web3.providers.eth_tester import EthereumTesterProvider
+    except ImportError as exc:
+        raise ImportError(
+            "The in-process EVM needs eth-tester: pip install 'eth-tester[py-evm]'"
+        ) from exc
+    from brownie import web3
+
+    with _lock:
+        if _tester is None:
+            _tester = EthereumTester(PyEVMBackend())
+            web3.provider = EthereumTesterProvider(_tester)
+            accounts._load(_tester.get_accounts())
+    return load_containers(build_path)
+
+def load_containers(build_path=BUILD_PATH):
+    """`ContractContainer`s of the deployable contracts in `build_path`."""
+    paths = sorted(Path(build_path).glob('*.json'))
+    if not paths:
+        raise FileNotFoundError(f"No contracts in {build_path}, run `brownie compile` first")
+    containers = {}
+    for path in paths:
+        build = json.loads(path.read_text())
+        if build.get('type', 'contract') == 'contract' and build.get('bytecode'):
+            containers[build['contractName']] = ContractContainer(
+                build['contractName'], build['abi'], build['bytecode'],
+            )
+    return containers
+
+def _get_tester():
+    if _tester is None:
+        raise ConnectionError("Not connected, call civ.evm.connect() first")
+    return _tester
+
+
+@contextmanager
+def isolation():
+    """Revert the chain to where it was on entry when leaving."""
+    global _generation
+    with _lock:
+        tester = _get_tester()
+        snapshot = tester.take_snapshot()
+        _generation += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            tester.revert_to_snapshot(snapshot)
+
+def given(*args, **kwargs):
+    """
+    `hypothesis.given` for tests on the chain: every example starts from the
+    state the test's fixtures left, like `brownie.test.given`. Tests that
+    set their own `settings` should use the `civ-evm` profile as parent.
+    """
+    from hypothesis import HealthCheck, settings
+    from hypothesis import given as hypothesis_given
+    from hypothesis.errors import InvalidArgument
+
+    def decorator(test):
+        snapshot = {}
+
+        @functools.wraps(test)
+        def isolated(*test_args, **test_kwargs):
+            with _lock:
+                tester = _get_tester()
+                if snapshot.get('generation') == _generation:
+                    tester.revert_to_snapshot(snapshot['id'])
+                else:
+                    snapshot.update(generation=_generation, id=tester.take_snapshot())
+            return test(*test_args, **test_kwargs)
+
+        # Given the test's own arguments, fixtures and strategies
+        isolated.__signature__ = inspect.signature(test)
+
+        # Fixtures are set up once per test, the chain is reverted per
+        # example. Tests with their own `settings` must suppress this too.
+        try:
+            isolated = settings(suppress_health_check=[
+                *settings.default.suppress_health_check,
+                HealthCheck.function_scoped_fixture,
+            ])(isolated)
+        except InvalidArgument:
+            pass
+        return hypothesis_given(*args, **kwargs)(isolated)
+    return decorator
+
+@contextmanager
+def reverts(revert_msg=None):
+    """Expect a revert, with `revert_msg` if given."""
+    try:
+        yield
+    except VirtualMachineError as exc:
+        if revert_msg is not None and exc.revert_msg != revert_msg:
+            raise AssertionError(
+                f"Unexpected revert string '{exc.revert_msg}', expected '{revert_msg}'"
+            ) from exc
+    else:
+        raise AssertionError("Transaction did not revert")
+
+
+# Values
+
+def _address_key(value):
+    return str(getattr(value, 'address', value)).lower()
+
+
+class Address(str):
+    """Checksummed address equal to any account, contract or string of it."""
+
+    def __new__(cls, value):
+        return super().__new__(cls, to_checksum_address(value))
+
+    def __eq__(self, other):
+        if isinstance(other, str) or hasattr(other, 'address'):
+            return _address_key(self) == _address_key(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = str.__hash__
+
+
+class ReturnValue(tuple):
+    """Decoded tuple, equal to lists and tuples of equal items, with field names if any."""
+
+    def __new__(cls, values, names=None):
+        self = super().__new__(cls, values)
+        self._names = names if names and all(names) else None
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = tuple.__hash__
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return super().__getitem__(self._names.index(key))
+        return super().__getitem__(key)
+
+    def dict(self):
+        if self._names is None:
+            raise TypeError("Values have no names")
+        return dict(zip(self._names, self))
+
+
+def _abi_type(abi):
+    # eth_abi's type string, tuples spelled out
+    type_ = abi['type']
+    if type_.startswith('tuple'):
+        return f"({','.join(_abi_type(item) for item in abi['components'])}){type_[5:]}"
+    return type_
+
+def _array_item(abi):
+    return dict(abi, type=abi['type'][:abi['type'].rindex('[')])
+
+def _format_input(abi, value):
+    type_ = abi['type']
+    if type_.endswith(']'):
+        return [_format_input(_array_item(abi), item) for item in value]
+    if type_ == 'tuple':
+        if isinstance(value, dict):
+            value = [value[item['name']] for item in abi['components']]
+        return tuple(_format_input(item, v) for item, v in zip(abi['components'], value))
+    if type_ == 'address':
+        return to_checksum_address(str(getattr(value, 'address', value)))
+    if type_.startswith('bytes') and isinstance(value, str):
+        return HexBytes(value)
+    return value
+
+def _format_output(abi, value):
+    type_ = abi['type']
+    if type_.endswith(']'):
+        return ReturnValue(_format_output(_array_item(abi), item) for item in value)
+    if type_ == 'tuple':
+        components = abi['components']
+        return ReturnValue(
+            (_format_output(item, v) for item, v in zip(components, value)),
+            [item['name'] for item in components],
+        )
+    if type_ == 'address':
+        return Address(value)
+    if type_.startswith('bytes'):
+        return HexBytes(value)
+    return value
+
+def encode_args(abis, args):
+    if len(args) != len(abis):
+        raise TypeError(f"Expected {len(abis)} arguments, got {len(args)}")
+    values = [_format_input(abi, arg) for abi, arg in zip(abis, args)]
+    return encode([_abi_type(abi) for abi in abis], values)
+
+def decode_outputs(abis, data):
+    values = decode([_abi_type(abi) for abi in abis], bytes(data))
+    values = [_format_output(abi, value) for abi, value in zip(abis, values)]
+    if not abis:
+        return None
+    if len(abis) == 1:
+        return values[0]
+    return ReturnValue(values, [abi['name'] for abi in abis])
+
+def _revert_message(error):
+    message = error.args[0] if error.args else None
+    if isinstance(message, str) and message[:2] in ("b'", 'b"'):
+        # eth-tester passes undecodable revert data as its repr
+        message = ast.literal_eval(message)
+    if isinstance(message, bytes):
+        if message[:4] == REVERT_SELECTOR:
+            return decode(['string'], message[4:])[0]
+        return None
+    return message or None
+
+
+# Events
+
+class Event(dict):
+    """One decoded event, its args by name."""
+
+    def __init__(self, name, args, address, pos):
+        super().__init__(args)
+        self.name = name
+        self.address = address
+        self.pos = pos
+
+    def __repr__(self):
+        return f"{self.name} {dict(self)}"
+
+
+class EventDict:
+    """A receipt's decoded events, in log order and by name."""
+
+    def __init__(self, events):
+        self._events = list(events)
+
+    def __contains__(self, name):
+        return any(event.name == name for event in self._events)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            events = [event for event in self._events if event.name == key]
+            if not events:
+                raise KeyError(f"Event '{key}' did not fire")
+            return events
+        return self._events[key]
+
+    def __iter__(self):
+        return iter(self._events)
+
+    def __len__(self):
+        return len(self._events)
+
+    def __repr__(self):
+        return f"<EventDict {self.keys()}>"
+
+    def count(self, name):
+        return sum(event.name == name for event in self._events)
+
+    def keys(self):
+        return list(dict.fromkeys(event.name for event in self._events))
+
+
+def _decode_log(log):
+    contract = _contracts.get(_address_key(log['address']))
+    topics = [HexBytes(topic) for topic in log['topics']]
+    if contract is None or not topics or topics[0] not in contract._event_abis:
+        return None
+    abi = contract._event_abis[topics[0]]
+    data = [item for item in abi['inputs'] if not item['indexed']]
+    values = decode([_abi_type(item) for item in data], bytes(HexBytes(log['data'])))
+    args = {item['name']: _format_output(item, value) for item, value in zip(data, values)}
+    indexed = [item for item in abi['inputs'] if item['indexed']]
+    for item, topic in zip(indexed, topics[1:]):
+        type_ = item['type']
+        if type_ in ('string', 'bytes') or type_.startswith('tuple') or type_.endswith(']'):
+            # Dynamic values are only indexed by their hash
+            args[item['name']] = topic
+        else:
+            args[item['name']] = _format_output(item, decode([item['type']], topic)[0])
+    return abi['name'], {item['name']: args[item['name']] for item in abi['inputs']}
+
+def _log(log):
+    return AttributeDict({
+        'address': to_checksum_address(log['address']),
+        'topics': [HexBytes(topic) for topic in log['topics']],
+        'data': HexBytes(log['data']),
+        'blockNumber': log['block_number'],
+        'logIndex': log['log_index'],
+        'transactionHash': HexBytes(log['transaction_hash']),
+    })
+
+
+class ContractEvents:
+    """A contract's past events, as brownie's `contract.events`."""
+
+    def __init__(self, contract):
+        self._contract = contract
+
+    def get_sequence(self, from_block, to_block=None, event_type=None):
+        """
+        Events between two blocks (inclusive), web3-style with `event`,
+        `args`, `blockNumber`, `logIndex` and `transactionHash`. A list of
+        `event_type`, or by default a dict of lists by event name.
+        """
+        contract = self._contract
+        topics = None
+        if event_type is not None:
+            topics = [contract.topics[event_type]]
+        with _lock:
+            logs = _get_tester().get_logs(
+                from_block=from_block, to_block=to_block,
+                address=contract.address, topics=topics,
+            )
+        sequence = {name: [] for name in contract.topics}
+        for log in logs:
+            decoded = _decode_log(log)
+            if decoded is not None:
+                name, args = decoded
+                sequence[name].append(AttributeDict(dict(
+                    _log(log), event=name, args=AttributeDict(args),
+                )))
+        return sequence if event_type is None else sequence[event_type]
+
+
+# Transactions
+
+class TransactionReceipt:
+
+    def __init__(self, txid, sender, receiver, data, fn=None):
+        with _lock:
+            receipt = _get_tester().get_transaction_receipt(txid)
+        self.txid = txid
+        self.sender = sender
+        self.receiver = receiver
+        self.input = data
+        self.fn = fn
+        self.block_number = receipt['block_number']
+        self.gas_used = receipt['gas_used']
+        self.status = Status.Confirmed if receipt['status'] else Status.Reverted
+        self.contract_address = (
+            Address(receipt['contract_address']) if receipt['contract_address'] else None
+        )
+        self.logs = [_log(log) for log in receipt['logs']]
+        decoded = [(log, _decode_log(log)) for log in receipt['logs']]
+        self.events = EventDict(
+            Event(name, args, Address(log['address']), pos)
+            for pos, (log, (name, args)) in enumerate(item for item in decoded if item[1])
+        )
+        self.revert_msg = None
+        if self.status == Status.Reverted:
+            try:
+                self._replay()
+            except VirtualMachineError as exc:
+                self.revert_msg = exc.revert_msg
+
+    def __repr__(self):
+        return f"<Transaction '{self.txid}'>"
+
+    def _replay(self):
+        # The same transaction as a call, on the state before its block
+        transaction = {'from': str(self.sender), 'data': self.input}
+        if self.receiver is not None:
+            transaction['to'] = str(self.receiver)
+        return _call(transaction, self.block_number - 1)
+
+    @property
+    def return_value(self):
+        if self.fn is None or self.status != Status.Confirmed:
+            return None
+        return decode_outputs(self.fn.abi['outputs'], self._replay())
+
+
+def _call(transaction, block_identifier='latest'):
+    from eth_tester.exceptions import TransactionFailed
+
+    try:
+        with _lock:
+            return HexBytes(_get_tester().call(transaction, block_identifier))
+    except TransactionFailed as exc:
+        raise VirtualMachineError(_revert_message(exc)) from None
+
+def _call_sender():
+    # The zero address is the coinbase, its fee income can't pay a call's gas
+    return accounts[0] if accounts else ZERO_ADDRESS
+
+def _split_tx(args, abis):
+    if len(args) == len(abis) + 1 and isinstance(args[-1], dict):
+        return args[:-1], args[-1]
+    return args, {}
+
+def _transact(tx, data, to=None, fn=None, default_sender=None):
+    sender = tx.get('from', default_sender)
+    if sender is None:
+        raise ValueError("No sender, pass {'from': account}")
+    transaction = {
+        'from': str(getattr(sender, 'address', sender)),
+        'data': data,
+        'value': tx.get('value', tx.get('amount', 0)),
+    }
+    if to is not None:
+        transaction['to'] = str(to)
+    with _lock:
+        tester = _get_tester()
+        # Up to the whole block, each transaction is mined in its own
+        gas = tx.get('gas_limit') or tx.get('gas')
+        if not gas:
+            gas = tester.get_block_by_number('pending')['gas_limit']
+        txid = tester.send_transaction(dict(transaction, gas=gas))
+        receipt = TransactionReceipt(txid, sender, to, data, fn)
+    if receipt.status == Status.Reverted and tx.get('required_confs', 1) != 0:
+        raise VirtualMachineError(receipt.revert_msg, receipt)
+    return receipt
+
+
+# Accounts and contracts
+
+class Account:
+
+    def __init__(self, address):
+        self.address = Address(address)
+
+    def __str__(self):
+        return self.address
+
+    def __repr__(self):
+        return f"<Account '{self.address}'>"
+
+    def __eq__(self, other):
+        if isinstance(other, str) or hasattr(other, 'address'):
+            return _address_key(self) == _address_key(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.address)
+
+    @property
+    def nonce(self):
+        with _lock:
+            return _get_tester().get_nonce(self.address)
+
+    def balance(self):
+        with _lock:
+            return _get_tester().get_balance(self.address)
+
+    def deploy(self, container, *args, **tx):
+        return container.deploy(*args, dict(tx, **{'from': self}))
+
+    def transfer(self, to, amount):
+        return _transact({'from': self, 'value': amount}, '0x', to)
+
+
+class Accounts(list):
+    """eth-tester's funded accounts, filled in by `connect`."""
+
+    def _load(self, addresses):
+        self[:] = [Account(address) for address in addresses]
+
+    def at(self, address):
+        for account in self:
+            if account == address:
+                return account
+        raise ValueError(f"No unlocked account {address}")
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return list(super().__getitem__(key))
+        return super().__getitem__(key)
+
+
+class ContractContainer(list):
+    """A compiled contract and its deployments, as brownie's containers."""
+
+    def __init__(self, name, abi, bytecode):
+        super().__init__()
+        self._name = name
+        self.abi = abi
+        self.bytecode = bytecode
+        self.topics = {
+            item['name']: '0x' + event_abi_to_log_topic(item).hex()
+            for item in abi if item['type'] == 'event'
+        }
+
+    def __repr__(self):
+        return f"<ContractContainer '{self._name}'>"
+
+    def deploy(self, *args):
+        constructor = next((item for item in self.abi if item['type'] == 'constructor'), None)
+        abis = constructor['inputs'] if constructor else []
+        args, tx = _split_tx(args, abis)
+        data = '0x' + self.bytecode.removeprefix('0x') + encode_args(abis, args).hex()
+        receipt = _transact(tx, data)
+        contract = self.at(receipt.contract_address, owner=tx.get('from'))
+        contract.tx = receipt
+        return contract
+
+    def at(self, address, owner=None):
+        contract = Contract(self, address, owner)
+        _contracts[_address_key(address)] = contract
+        if contract not in self:
+            self.append(contract)
+        return contract
+
+
+class ContractCall:
+
+    def __init__(self, contract, abi):
+        self._contract = contract
+        self._name = f"{contract._name}.{abi['name']}"
+        self.abi = abi
+        self.signature = '0x' + function_abi_to_4byte_selector(abi).hex()
+
+    def __repr__(self):
+        return f"<{type(self).__name__} '{self._name}'>"
+
+    def encode_input(self, *args):
+        return self.signature + encode_args(self.abi['inputs'], args).hex()
+
+    def decode_output(self, data):
+        return decode_outputs(self.abi['outputs'], data)
+
+    def call(self, *args, block_identifier='latest'):
+        args, tx = _split_tx(args, self.abi['inputs'])
+        sender = tx.get('from', self._contract._owner) or _call_sender()
+        data = _call({
+            'from': str(getattr(sender, 'address', sender)),
+            'to': self._contract.address,
+            'data': self.encode_input(*args),
+        }, block_identifier or 'latest')
+        return self.decode_output(data)
+
+    def transact(self, *args):
+        args, tx = _split_tx(args, self.abi['inputs'])
+        return _transact(
+            tx, self.encode_input(*args), self._contract.address, self, self._contract._owner,
+        )
+
+    def estimate_gas(self, *args):
+        args, tx = _split_tx(args, self.abi['inputs'])
+        sender = tx.get('from', self._contract._owner) or _call_sender()
+        with _lock:
+            return _get_tester().estimate_gas({
+                'from': str(getattr(sender, 'address', sender)),
+                'to': self._contract.address,
+                'data': self.encode_input(*args),
+            })
+
+    def __call__(self, *args, block_identifier='latest'):
+        return self.call(*args, block_identifier=block_identifier)
+
+
+class ContractTx(ContractCall):
+
+    def __call__(self, *args):
+        return self.transact(*args)
+
+
+class Contract:
+
+    def __init__(self, container, address, owner=None):
+        self._name = container._name
+        self.abi = container.abi
+        self.topics = container.topics
+        self.address = Address(address)
+        self.events = ContractEvents(self)
+        self.tx = None
+        self._owner = owner
+        self._event_abis = {
+            HexBytes(topic): next(
+                item for item in self.abi if item['type'] == 'event' and item['name'] == name
+            )
+            for name, topic in self.topics.items()
+        }
+        for abi in self.abi:
+            if abi['type'] == 'function':
+                method = ContractCall if abi['stateMutability'] in ('view', 'pure') else ContractTx
+                setattr(self, abi['name'], method(self, abi))
+
+    def __str__(self):
+        return self.address
+
+    def __repr__(self):
+        return f"<{self._name} Contract '{self.address}'>"
+
+    def __eq__(self, other):
+        if isinstance(other, str) or hasattr(other, 'address'):
+            return _address_key(self) == _address_key(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.address)
+
+    def balance(self):
+        with _lock:
+            return _get_tester().get_balance(self.address)
+
+
+class Chain:
+    """The in-process chain, as brownie's `chain`."""
+
+    def __init__(self):
+        self._snapshot = None
+
+    @property
+    def height(self):
+        with _lock:
+            return _get_tester().get_block_by_number('latest')['number']
+
+    def __len__(self):
+        return self.height + 1
+
+    def __getitem__(self, number):
+        with _lock:
+            return AttributeDict(_get_tester().get_block_by_number(number))
+
+    def time(self):
+        return self['latest']['timestamp']
+
+    def sleep(self, seconds):
+        with _lock:
+            tester = _get_tester()
+            tester.time_travel(self.time() + seconds)
+
+    def mine(self, blocks=1):
+        with _lock:
+            _get_tester().mine_blocks(blocks)
+        return self.height
+
+    def snapshot(self):
+        with _lock:
+            self._snapshot = _get_tester().take_snapshot()
+
+    def revert(self):
+        if self._snapshot is None:
+            raise ValueError("No snapshot to revert to")
+        with _lock:
+            _get_tester().revert_to_snapshot(self._snapshot)
+        return self.height
+
+
+accounts = Accounts()
+chain = Chain()
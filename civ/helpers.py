@@ -9,6 +9,29 @@ INITIAL_LAND = 5
 INITIAL_RESOURCES = 50
 INITIAL_POP = 10
 INITIAL_LOOT = INITIAL_RESOURCES / INITIAL_LAND # attack loot for first battle
+INITIAL_STATE = {
+    'current_turn': 0,
+    'land': INITIAL_LAND, 'farms': 0, 'science': 1, 'culture': 0, 'soldiers': 0,
+    'population': INITIAL_POP, 'resources': INITIAL_RESOURCES,
+}
+
+# Constants.sol
+DEFENSE_CULTURE_BONUS = 5
+MAX_FORTIFICATION = 10
+FOOD_PER_FARM = 5
+POP_PER_SCIENCE = 10
+HANDLE_TURN_GAS_LIMIT = 5000000
+HANDLE_ATTACK_GAS_LIMIT = 1000000
+HANDLE_TRADE_GAS_LIMIT = 1000000
+
+# TurnAction actions, indexed by action code (0 when the strategy did nothing)
+TURN_ACTIONS = [
+    '', 'explore', 'research', 'produce', 'farm', 'create', 'train',
+    'trade', 'attack',
+]
+
+# Players per `getPlayers`/`getRegisteredPlayers` call
+PLAYER_PAGE_SIZE = 500
 
 # Resign messages
 RESIGN_MESSAGE_POP = "Population has gone to 0"
@@ -19,6 +42,75 @@ RESIGN_MESSAGE_LAND = "Land has gone to 0"
 def parse_player_state(player_state):
     return dict(zip(PLAYER_STATE_KEYS, player_state))
 
+def get_states(world, players, page_size=None):
+    """
+    Fetch parsed states, active flags and strategies for `players` with
+    `World.getStates`, one call per `page_size` players (all at once by default).
+    """
+    players = list(players)
+    page_size = page_size or max(len(players), 1)
+    states, active, strategies = [], [], []
+
+    for i in range(0, len(players), page_size):
+        _states, _active, _strategies = world.getStates(players[i:i + page_size])
+        states += [parse_player_state(state) for state in _states]
+        active += list(_active)
+        strategies += list(_strategies)
+    return states, active, strategies
+
+def get_snapshot(world, players):
+    """Fetch turn progress and every player's state in a single call."""
+    players = list(players)
+    turn, turn_completed, states, active, strategies = world.getSnapshot(players)
+    return {
+        'current_turn': turn,
+        'current_turn_completed': turn_completed,
+        'states': dict(zip(players, map(parse_player_state, states))),
+        'active': dict(zip(players, active)),
+        'strategies': dict(zip(players, strategies)),
+    }
+
+def _get_pages(get_page, total, page_size):
+    players = []
+    for offset in range(0, total, page_size):
+        players += list(get_page(offset, page_size))
+    return players
+
+def get_players(world, page_size=PLAYER_PAGE_SIZE):
+    """Active players from the on-chain registry, in registry order."""
+    return _get_pages(world.getPlayers, world.numActivePlayers(), page_size)
+
+def get_registered_players(world, page_size=PLAYER_PAGE_SIZE):
+    """Every player who registered, active or not."""
+    return _get_pages(world.getRegisteredPlayers, world.numRegisteredPlayers(), page_size)
+
+def get_pending_players(world, turn=None):
+    """Active players who haven't played `turn` (the current turn by default)."""
+    turn = world.currentTurn() if turn is None else turn
+    return list(world.getPendingPlayers(turn))
+
+def seed_state(world, player, strategy=None, **fields):
+    """
+    Write `player`'s state straight into a `WorldHarness`, changing only
+    `fields` (snake case keys). Unregistered players start from the initial
+    state and are registered with `strategy`.
+    """
+    states, _, strategies = get_states(world, [player])
+    state = states[0]
+    if state['player'] != player:
+        state = dict(INITIAL_STATE, player=player)
+
+    unknown = set(fields) - set(PLAYER_STATE_KEYS[1:])
+    if unknown:
+        raise KeyError(f"Unknown player state fields: {sorted(unknown)}")
+    state.update(fields)
+
+    strategy = strategy if strategy is not None else strategies[0]
+    return world.seedState(strategy, [state[key] for key in PLAYER_STATE_KEYS])
+
+def seed_turn(world, turn, turn_completed=0):
+    return world.seedTurn(turn, turn_completed)
+
 def assert_player_state(world, player, key, val):
     state = parse_player_state(world.getState(player))
     print(state)
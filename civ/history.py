@@ -0,0 +1,230 @@
+"""
+Columnar game history, memory-mapped with NumPy.
+
+A history is a directory with one `.npy` file per column and `meta.json`.
+Each row is one `TurnSummary`, the player's state after their turn, with that
+turn's `TurnAction`: a code from `TURN_ACTIONS` (0 when the strategy did
+nothing), the opponent and the param. Players are stored as indexes into
+`meta.json`'s `players`, opponents too, with -1 for none. Rows are sorted by
+game, turn then play order, so a turn is a contiguous slice.
+
+Columns open with `mmap_mode='r'`: nothing is read until it's used.
+
+    python -m civ.history export index.db history/
+    python -m civ.history replay history/ --game 1
+"""
+import argparse
+import json
+import os
+import sqlite3
+
+import numpy as np
+
+from civ.helpers import PLAYER_STATE_KEYS, TURN_ACTIONS
+
+SUMMARY_KEYS = PLAYER_STATE_KEYS[2:]
+
+COLUMNS = {
+    'game': np.uint32,
+    'turn': np.uint32,
+    'player': np.uint32,
+    **{key: np.uint64 for key in SUMMARY_KEYS},
+    'action': np.uint8,
+    'opponent': np.int32,
+    'param': np.uint64,
+}
+
+META_FILE = 'meta.json'
+NO_PLAYER = -1
+ZERO_ADDRESS = '0x' + '0' * 40
+
+
+def write_history(path, rows):
+    """
+    Write `rows`, dicts with `game`, `turn`, `player`, the summary fields and
+    optionally `action`, `opponent` and `param`, in play order.
+    """
+    os.makedirs(path, exist_ok=True)
+    players = {}
+
+    def player_index(player):
+        if player is None or player == ZERO_ADDRESS:
+            return NO_PLAYER
+        return players.setdefault(str(player), len(players))
+
+    columns = {name: [] for name in COLUMNS}
+    for row in rows:
+        columns['game'].append(row['game'])
+        columns['turn'].append(row['turn'])
+        columns['player'].append(player_index(row['player']))
+        for key in SUMMARY_KEYS:
+            columns[key].append(row[key])
+        columns['action'].append(TURN_ACTIONS.index(row.get('action') or ''))
+        columns['opponent'].append(player_index(row.get('opponent')))
+        columns['param'].append(row.get('param') or 0)
+
+    arrays = {name: np.array(values, dtype=COLUMNS[name]) for name, values in columns.items()}
+    order = np.lexsort((arrays['turn'], arrays['game']))
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), array[order])
+
+    with open(os.path.join(path, META_FILE), 'w') as f:
+        json.dump({
+            'rows': len(order),
+            'players': list(players),
+            'columns': {name: np.dtype(dtype).name for name, dtype in COLUMNS.items()},
+        }, f, indent=2)
+    return History(path)
+
+
+def rows_from_events(events, game=None):
+    """History rows from `civ.engine` events (`World(record_events=True)`)."""
+    actions = {}
+    for name, args in events:
+        key = (args['game'], args['turn'], args['player'])
+        if name == 'TurnAction':
+            actions[key] = args
+        elif name == 'TurnSummary' and (game is None or args['game'] == game):
+            action = actions.pop(key, {})
+            yield {
+                **args,
+                'action': action.get('action'),
+                'opponent': action.get('opponent'),
+                'param': action.get('param'),
+            }
+
+
+def rows_from_index(db_path, game=None):
+    """History rows from a `civ.indexer.Indexer` database."""
+    db = sqlite3.connect(db_path)
+    db.row_factory = sqlite3.Row
+    query = """
+        SELECT s.*, a.action, a.opponent, a.param
+        FROM turn_summaries s
+        LEFT JOIN turn_actions a
+            ON a.tx = s.tx AND a.game = s.game AND a.turn = s.turn AND a.player = s.player
+    """
+    args = ()
+    if game is not None:
+        query += " WHERE s.game = ?"
+        args = (game,)
+    query += " ORDER BY s.block, s.log_index"
+    try:
+        for row in db.execute(query, args):
+            yield dict(row)
+    finally:
+        db.close()
+
+
+class History:
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.players = self.meta['players']
+        self._player_index = {player: i for i, player in enumerate(self.players)}
+        self.columns = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+            for name in self.meta['columns']
+        }
+        self._turn_keys = None
+
+    def __len__(self):
+        return self.meta['rows']
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def player_index(self, player):
+        return self._player_index[str(player)]
+
+    def games(self):
+        return np.unique(self['game']).tolist()
+
+    def turn_slice(self, game, turn):
+        """Rows of one turn, as a slice usable on every column."""
+        if self._turn_keys is None:
+            self._turn_keys = self['game'].astype(np.uint64) << np.uint64(32) | self['turn']
+        keys = self._turn_keys
+        key = np.uint64(game) << np.uint64(32) | np.uint64(turn)
+        return slice(
+            int(np.searchsorted(keys, key, 'left')),
+            int(np.searchsorted(keys, key, 'right')),
+        )
+
+    def player_rows(self, player, game=None):
+        mask = self['player'] == self.player_index(player)
+        if game is not None:
+            mask &= self['game'] == game
+        return np.flatnonzero(mask)
+
+    def column_by_turn(self, name, player, game):
+        """`(turns, values)` of one column for one player."""
+        rows = self.player_rows(player, game)
+        return self['turn'][rows], self[name][rows]
+
+    def replay(self, game=None):
+        """
+        Walk the history turn by turn, yielding `(game, turn, rows)` where
+        `rows` maps each column to its (memory-mapped) values for the turn.
+        """
+        games = self['game']
+        turns = self['turn']
+        boundaries = np.flatnonzero((np.diff(games) != 0) | (np.diff(turns) != 0)) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(self)]))
+
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            if start == end or (game is not None and games[start] != game):
+                continue
+            rows = {name: column[start:end] for name, column in self.columns.items()}
+            yield int(games[start]), int(turns[start]), rows
+
+    def describe_row(self, rows, i):
+        player = self.players[rows['player'][i]]
+        action = TURN_ACTIONS[rows['action'][i]] or '-'
+        opponent = rows['opponent'][i]
+        if opponent != NO_PLAYER:
+            action += f" {self.players[opponent]}"
+        if rows['param'][i]:
+            action += f" ({rows['param'][i]})"
+        state = " ".join(f"{key}={rows[key][i]}" for key in SUMMARY_KEYS)
+        return f"{player} {action}: {state}"
+
+
+def replay(path, game=None, player=None):
+    """Print a history turn by turn, optionally for one player only."""
+    history = History(path)
+    player = history.player_index(player) if player is not None else None
+    for _game, turn, rows in history.replay(game):
+        print(f"Game {_game}, turn {turn}")
+        for i in range(len(rows['player'])):
+            if player is None or rows['player'][i] == player:
+                print("  " + history.describe_row(rows, i))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help="Export an indexer database")
+    export.add_argument('db')
+    export.add_argument('path')
+    export.add_argument('--game', type=int)
+
+    _replay = commands.add_parser('replay', help="Walk a history turn by turn")
+    _replay.add_argument('path')
+    _replay.add_argument('--game', type=int)
+    _replay.add_argument('--player')
+
+    args = parser.parse_args(argv)
+    if args.command == 'export':
+        history = write_history(args.path, rows_from_index(args.db, args.game))
+        print(f"Exported {len(history)} turns to {args.path}")
+    else:
+        replay(args.path, args.game, args.player)
+
+
+if __name__ == '__main__':
+    main()
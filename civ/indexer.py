@@ -0,0 +1,254 @@
+"""
+Incremental SQLite indexer for `World` events.
+
+`Indexer.sync` streams `TurnAction`, `TurnSummary` and `Resign` logs into a
+local database, fetching block ranges in parallel and persisting a block
+cursor so later syncs only fetch new blocks. The hashes of the last
+`reorg_depth` blocks are kept, and anything indexed from a block that has
+since been reorged out is dropped and fetched again. One database indexes one
+world.
+"""
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from brownie import web3
+from web3.exceptions import BlockNotFound
+from civ.helpers import PLAYER_STATE_KEYS
+
+DEFAULT_CHUNK_SIZE = 2000
+DEFAULT_WORKERS = 8
+DEFAULT_REORG_DEPTH = 12
+
+EVENTS = ('TurnAction', 'TurnSummary', 'Resign')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    number INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS turn_actions (
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    tx TEXT NOT NULL,
+    player TEXT NOT NULL,
+    game INTEGER NOT NULL,
+    turn INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    param INTEGER NOT NULL,
+    PRIMARY KEY (block, log_index)
+);
+CREATE TABLE IF NOT EXISTS turn_summaries (
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    tx TEXT NOT NULL,
+    player TEXT NOT NULL,
+    game INTEGER NOT NULL,
+    turn INTEGER NOT NULL,
+    land INTEGER NOT NULL,
+    farms INTEGER NOT NULL,
+    science INTEGER NOT NULL,
+    culture INTEGER NOT NULL,
+    soldiers INTEGER NOT NULL,
+    population INTEGER NOT NULL,
+    resources INTEGER NOT NULL,
+    PRIMARY KEY (block, log_index)
+);
+CREATE TABLE IF NOT EXISTS resigns (
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    tx TEXT NOT NULL,
+    player TEXT NOT NULL,
+    game INTEGER NOT NULL,
+    turn INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    PRIMARY KEY (block, log_index)
+);
+CREATE INDEX IF NOT EXISTS turn_actions_turn ON turn_actions (game, turn, player);
+CREATE INDEX IF NOT EXISTS turn_actions_opponent ON turn_actions (game, opponent, action);
+CREATE INDEX IF NOT EXISTS turn_summaries_turn ON turn_summaries (game, turn, player);
+CREATE INDEX IF NOT EXISTS turn_summaries_player ON turn_summaries (game, player, turn);
+CREATE INDEX IF NOT EXISTS resigns_turn ON resigns (game, turn, player);
+"""
+
+SUMMARY_KEYS = PLAYER_STATE_KEYS[2:]
+
+TABLES = {
+    'TurnAction': ('turn_actions', ('action', 'opponent', 'param')),
+    'TurnSummary': ('turn_summaries', tuple(SUMMARY_KEYS)),
+    'Resign': ('resigns', ('reason',)),
+}
+
+
+class Indexer:
+
+    def __init__(
+        self, world, path, start_block=0,
+        chunk_size=DEFAULT_CHUNK_SIZE, workers=DEFAULT_WORKERS,
+        reorg_depth=DEFAULT_REORG_DEPTH,
+    ):
+        self.world = world
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.reorg_depth = reorg_depth
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+        indexed_world = self._get_meta('world')
+        if indexed_world is None:
+            self._set_meta('world', world.address)
+            self._set_meta('block', start_block - 1)
+            self.db.commit()
+        elif indexed_world != world.address:
+            raise ValueError(f"Database indexes another world: {indexed_world}")
+
+    @property
+    def block(self):
+        """Last block indexed."""
+        return int(self._get_meta('block'))
+
+    def sync(self, to_block=None):
+        """Index everything up to `to_block` (the chain head by default)."""
+        head = web3.eth.block_number
+        to_block = head if to_block is None else min(to_block, head)
+        self._handle_reorg()
+
+        from_block = self.block + 1
+        if from_block > to_block:
+            return 0
+
+        ranges = [
+            (start, min(start + self.chunk_size - 1, to_block), event)
+            for start in range(from_block, to_block + 1, self.chunk_size)
+            for event in EVENTS
+        ]
+        with ThreadPoolExecutor(self.workers) as pool:
+            results = list(pool.map(lambda args: self._fetch(*args), ranges))
+
+        logs = sorted(
+            (log for result in results for log in result),
+            key=lambda log: (log.blockNumber, log.logIndex),
+        )
+        with self.db:
+            for log in logs:
+                self._insert(log)
+            self._record_blocks(max(from_block, to_block - self.reorg_depth + 1), to_block)
+            self._set_meta('block', to_block)
+        return len(logs)
+
+    # Queries
+
+    def get_state_at(self, player, game, turn):
+        """Player state from their latest `TurnSummary` at or before `turn`."""
+        row = self.db.execute(
+            """
+            SELECT * FROM turn_summaries
+            WHERE game = ? AND player = ? AND turn <= ?
+            ORDER BY turn DESC, block DESC, log_index DESC
+            LIMIT 1
+            """,
+            (game, str(player), turn),
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(PLAYER_STATE_KEYS, (
+            row['player'], row['turn'], *(row[key] for key in SUMMARY_KEYS)
+        )))
+
+    def get_actions(self, game, turn=None, player=None):
+        query = "SELECT * FROM turn_actions WHERE game = ?"
+        args = [game]
+        if turn is not None:
+            query += " AND turn = ?"
+            args.append(turn)
+        if player is not None:
+            query += " AND player = ?"
+            args.append(str(player))
+        query += " ORDER BY block, log_index"
+        return [dict(row) for row in self.db.execute(query, args)]
+
+    def get_attacks_on(self, player, game):
+        return [dict(row) for row in self.db.execute(
+            """
+            SELECT * FROM turn_actions
+            WHERE game = ? AND opponent = ? AND action = 'attack'
+            ORDER BY block, log_index
+            """,
+            (game, str(player)),
+        )]
+
+    def get_resigns(self, game):
+        return [dict(row) for row in self.db.execute(
+            "SELECT * FROM resigns WHERE game = ? ORDER BY block, log_index", (game,)
+        )]
+
+    # Internal
+
+    def _get_meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    def _fetch(self, from_block, to_block, event):
+        return self.world.events.get_sequence(from_block, to_block, event)
+
+    def _insert(self, log):
+        table, keys = TABLES[log.event]
+        args = log.args
+        row = (
+            log.blockNumber, log.logIndex, log.transactionHash.hex(),
+            args['player'], args['game'], args['turn'],
+            *(args[key] for key in keys),
+        )
+        columns = ('block', 'log_index', 'tx', 'player', 'game', 'turn') + keys
+        self.db.execute(
+            f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})",
+            row,
+        )
+
+    def _get_block_hash(self, number):
+        try:
+            return web3.eth.get_block(number)['hash'].hex()
+        except BlockNotFound:
+            return None
+
+    def _record_blocks(self, from_block, to_block):
+        for number in range(from_block, to_block + 1):
+            block_hash = self._get_block_hash(number)
+            self.db.execute(
+                "INSERT OR REPLACE INTO blocks (number, hash) VALUES (?, ?)",
+                (number, block_hash),
+            )
+        self.db.execute(
+            "DELETE FROM blocks WHERE number <= ?", (to_block - self.reorg_depth,)
+        )
+
+    def _handle_reorg(self):
+        # Find the earliest recorded block that is no longer on the chain
+        forked = None
+        for number, block_hash in self.db.execute(
+            "SELECT number, hash FROM blocks ORDER BY number DESC"
+        ).fetchall():
+            if self._get_block_hash(number) != block_hash:
+                forked = number
+            else:
+                break
+
+        if forked is None:
+            return
+        with self.db:
+            for table, _ in TABLES.values():
+                self.db.execute(f"DELETE FROM {table} WHERE block >= ?", (forked,))
+            self.db.execute("DELETE FROM blocks WHERE number >= ?", (forked,))
+            self._set_meta('block', forked - 1)
@@ -0,0 +1,217 @@
+"""
+Incrementally maintained rankings.
+
+`Leaderboard` ranks players by culture, land, population and resources from
+`TurnSummary` and `Resign` events, so a scoreboard doesn't need a `getState`
+per player on every refresh. Each metric keeps a list of `(-value, player)`
+sorted with `bisect`: a summary moves one player in O(log n) search plus a
+list shift, top-K is a slice and a player's rank a binary search. Resigned
+players leave the rankings.
+
+Attacks and trades change the defender's or receiver's state without a
+summary of their own, so standings reflect each player's last turn.
+
+When a summary of a later turn arrives, the turn before it is closed and
+every player's ranks are recorded, as `(turn, rank)` change points for "rank
+over time" charts. Events of a newer game start the rankings over.
+
+    board = Leaderboard()
+    board.apply_events(engine.events)    # civ.engine events
+    board.apply_tx(tx)                   # a brownie receipt
+    board.sync_index(indexer.db)         # new rows of a civ.indexer database
+    board.top('culture', 10)
+"""
+from bisect import bisect_left, bisect_right, insort
+
+from civ.helpers import PLAYER_STATE_KEYS
+
+METRICS = ('culture', 'land', 'population', 'resources')
+DEFAULT_TOP = 10
+
+SUMMARY_KEYS = PLAYER_STATE_KEYS[2:]
+
+# Summaries and resigns of a `civ.indexer` database in log order, resigns
+# padded with zeros to the same columns
+INDEX_QUERY = f"""
+    SELECT 'TurnSummary', block, log_index, player, game, turn, {', '.join(SUMMARY_KEYS)}
+    FROM turn_summaries WHERE block > ? OR (block = ? AND log_index > ?)
+    UNION ALL
+    SELECT 'Resign', block, log_index, player, game, turn, {', '.join('0' * len(SUMMARY_KEYS))}
+    FROM resigns WHERE block > ? OR (block = ? AND log_index > ?)
+    ORDER BY block, log_index
+"""
+INDEX_COLUMNS = ('player', 'game', 'turn', *SUMMARY_KEYS)
+BLOCK_HASH_QUERY = "SELECT hash FROM blocks WHERE number = ?"
+INDEXED_BLOCK_QUERY = "SELECT value FROM meta WHERE key = 'block'"
+
+
+class Leaderboard:
+
+    def __init__(self, metrics=METRICS, game=None):
+        self.metrics = tuple(metrics)
+        self.game = self._first_game = game
+        self.turn = 0
+        # Last block and log index read by `sync_index`, and the block's hash
+        self.cursor = (-1, -1)
+        self._cursor_hash = None
+        self._reset()
+
+    def _reset(self):
+        self.turn = 0
+        self.values = {}
+        self._sorted = {metric: [] for metric in self.metrics}
+        self._history = {metric: {} for metric in self.metrics}
+
+    def __len__(self):
+        return len(self.values)
+
+    def __contains__(self, player):
+        return player in self.values
+
+    # Updates
+
+    def apply(self, name, args):
+        """Apply one event, by name with its args. Other events are ignored."""
+        if name not in ('TurnSummary', 'Resign') or not self._check_game(args['game']):
+            return False
+        if name == 'Resign':
+            self._remove(args['player'])
+            return True
+
+        if args['turn'] > self.turn:
+            self.close_turn()
+            self.turn = args['turn']
+        self._remove(args['player'])
+        values = {metric: args[metric] for metric in self.metrics}
+        for metric, value in values.items():
+            insort(self._sorted[metric], (-value, args['player']))
+        self.values[args['player']] = values
+        return True
+
+    def apply_events(self, events):
+        """Apply `(name, args)` pairs, as in `civ.engine.World.events`."""
+        return sum(self.apply(name, args) for name, args in events)
+
+    def apply_tx(self, tx):
+        """Apply the events of a brownie `TransactionReceipt`, in log order."""
+        return sum(self.apply(event.name, dict(event)) for event in tx.events)
+
+    def sync_index(self, db):
+        """
+        Apply the `TurnSummary` and `Resign` rows of a `civ.indexer.Indexer`
+        database (its `db` connection) added since the last sync. If the
+        indexer replaced the last block read after a reorg, the rankings are
+        rebuilt from the database: dropped rows may have moved or removed
+        players that the replacement rows never mention.
+        """
+        if self._cursor_forked(db):
+            self._reset()
+            self.game = self._first_game
+            self.cursor = (-1, -1)
+
+        block, log_index = self.cursor
+        rows = db.execute(INDEX_QUERY, (block, block, log_index) * 2).fetchall()
+
+        applied = 0
+        for name, block, log_index, *values in map(tuple, rows):
+            args = dict(zip(INDEX_COLUMNS, values))
+            applied += self.apply(name, args)
+        if rows:
+            self.cursor = (block, log_index)
+            row = db.execute(BLOCK_HASH_QUERY, (block,)).fetchone()
+            self._cursor_hash = row and row[0]
+        return applied
+
+    def _cursor_forked(self, db):
+        if self._cursor_hash is None:
+            return False
+        block = self.cursor[0]
+        row = db.execute(BLOCK_HASH_QUERY, (block,)).fetchone()
+        if row is not None:
+            return row[0] != self._cursor_hash
+        # Pruned as too old to reorg, or dropped by a reorg not indexed again yet
+        row = db.execute(INDEXED_BLOCK_QUERY).fetchone()
+        return row is not None and int(row[0]) < block
+
+    def close_turn(self):
+        """Record every ranked player's ranks for the current turn."""
+        if not self.turn:
+            return
+        for metric in self.metrics:
+            history = self._history[metric]
+            for player, rank in self._ranks(metric):
+                points = history.setdefault(player, [])
+                if points and points[-1][0] == self.turn:
+                    points.pop()
+                if not points or points[-1][1] != rank:
+                    points.append((self.turn, rank))
+
+    def _check_game(self, game):
+        if self.game is None or game > self.game:
+            self.game = game
+            self._reset()
+        return game == self.game
+
+    def _remove(self, player):
+        values = self.values.pop(player, None)
+        if values is None:
+            return
+        for metric, value in values.items():
+            ranking = self._sorted[metric]
+            del ranking[bisect_left(ranking, (-value, player))]
+
+    def _ranks(self, metric):
+        # Ties share the best rank
+        rank = 0
+        previous = None
+        for i, (value, player) in enumerate(self._sorted[metric]):
+            if value != previous:
+                rank = i + 1
+                previous = value
+            yield player, rank
+
+    # Queries
+
+    def top(self, metric, k=DEFAULT_TOP, offset=0):
+        """`(player, value)` of the `k` best players after `offset`."""
+        return [
+            (player, -value)
+            for value, player in self._sorted[metric][offset:offset + k]
+        ]
+
+    def rank(self, player, metric):
+        """1-based rank of `player`, ties sharing the best rank, or None."""
+        values = self.values.get(player)
+        if values is None:
+            return None
+        return bisect_left(self._sorted[metric], (-values[metric],)) + 1
+
+    def rank_history(self, player, metric):
+        """
+        `(turn, rank)` points of closed turns where the player's rank changed.
+        Includes the current turn, ranks as they stand.
+        """
+        points = list(self._history[metric].get(player, []))
+        rank = self.rank(player, metric)
+        if rank is None:
+            return points
+        if points and points[-1][0] == self.turn:
+            points.pop()
+        if not points or points[-1][1] != rank:
+            points.append((self.turn, rank))
+        return points
+
+    def rank_at(self, player, metric, turn):
+        """Rank of `player` as of the end of `turn`, None before they were ranked."""
+        points = self.rank_history(player, metric)
+        i = bisect_right(points, (turn, float('inf')))
+        return points[i - 1][1] if i else None
+
+    def standings(self, k=DEFAULT_TOP):
+        """Top `k` of every metric, for serving as JSON."""
+        return {
+            'game': self.game,
+            'turn': self.turn,
+            'players': len(self),
+            **{metric: self.top(metric, k) for metric in self.metrics},
+        }
@@ -0,0 +1,121 @@
+"""
+Per-turn metrics for `TurnRunner`.
+
+For every `playTurn` the runner collects, `TurnMetrics` records the RPC
+latency of the submission, the time until the receipt was seen (at the
+runner's polling granularity), gas used, and whether the turn emitted a
+`TurnSummary` without a `TurnAction`. That means the strategy did nothing,
+usually because it reverted or ran out of gas inside `World`'s
+`try ... catch {}`. With `trace=True` the receipt is also traced to measure
+the gas used inside the strategy call and tell failures from idle turns, at
+the cost of a `debug_traceTransaction` per turn.
+
+Metrics are written as JSON lines (one record per turn) and in the Prometheus
+text format, for node_exporter's textfile collector.
+"""
+import json
+import os
+import time
+from collections import defaultdict
+
+from brownie.network.transaction import Status
+from civ.profiler import find_frame, frame_failed, frame_gas
+
+STATUS_NAMES = {
+    Status.Dropped: 'dropped',
+    Status.Pending: 'pending',
+    Status.Reverted: 'reverted',
+    Status.Confirmed: 'confirmed',
+}
+
+
+class TurnMetrics:
+
+    def __init__(self, trace=False):
+        self.trace = trace
+        self.records = []
+
+    def record(self, turn, player, tx, rpc_latency, confirmation_time, strategy=None):
+        events = tx.events if tx.status == Status.Confirmed else {}
+        record = {
+            'time': time.time(),
+            'turn': turn,
+            'player': str(player),
+            'tx': tx.txid,
+            'status': STATUS_NAMES.get(tx.status, str(tx.status)),
+            'rpc_latency': rpc_latency,
+            'confirmation_time': confirmation_time,
+            'gas_used': tx.gas_used,
+            'no_action': 'TurnSummary' in events and 'TurnAction' not in events,
+            'strategy_gas': None,
+            'strategy_failed': None,
+        }
+
+        if self.trace and strategy and tx.status == Status.Confirmed:
+            frame = find_frame(tx.trace, strategy)
+            if frame is not None:
+                record['strategy_gas'] = frame_gas(tx.trace, *frame)
+                record['strategy_failed'] = frame_failed(tx.trace, *frame)
+
+        self.records.append(record)
+        return record
+
+    def write_jsonl(self, path):
+        """Append every record to `path`, one JSON object per line."""
+        with open(path, 'a') as f:
+            for record in self.records:
+                f.write(json.dumps(record) + "\n")
+
+    def write_prometheus(self, path):
+        """Write totals and last per-player values, replacing `path` atomically."""
+        lines = []
+
+        def metric(name, kind, help, samples):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label = ",".join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label}}} {value}" if label else f"{name} {value}")
+
+        statuses = defaultdict(int)
+        for record in self.records:
+            statuses[record['status']] += 1
+        metric(
+            'civ_turns_total', 'counter', "playTurn transactions collected, by status",
+            [({'status': status}, count) for status, count in sorted(statuses.items())],
+        )
+        metric(
+            'civ_turns_no_action_total', 'counter',
+            "Turns with a TurnSummary but no TurnAction",
+            [({}, sum(record['no_action'] for record in self.records))],
+        )
+
+        for key, name, help in (
+            ('rpc_latency', 'civ_turn_rpc_latency_seconds', "playTurn submission latency"),
+            ('confirmation_time', 'civ_turn_confirmation_seconds', "Time from submission to receipt"),
+            ('gas_used', 'civ_turn_gas_used', "playTurn gas used"),
+            ('strategy_gas', 'civ_strategy_gas_used', "Gas used inside the strategy call"),
+        ):
+            values = [record[key] for record in self.records if record[key] is not None]
+            metric(name, 'summary', help, [])
+            lines.append(f"{name}_sum {sum(values)}")
+            lines.append(f"{name}_count {len(values)}")
+
+        # Last turn of each player
+        latest = {record['player']: record for record in self.records}
+        for key, name, help in (
+            ('gas_used', 'civ_player_gas_used', "Gas used by the player's last turn"),
+            ('strategy_gas', 'civ_player_strategy_gas_used', "Strategy gas in the player's last turn"),
+            ('confirmation_time', 'civ_player_confirmation_seconds', "Confirmation time of the player's last turn"),
+            ('no_action', 'civ_player_no_action', "Whether the player's last turn had no TurnAction"),
+        ):
+            metric(name, 'gauge', help, [
+                ({'player': player}, int(record[key]) if isinstance(record[key], bool) else record[key])
+                for player, record in sorted(latest.items())
+                if record[key] is not None
+            ])
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
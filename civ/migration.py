@@ -0,0 +1,190 @@
+"""
+World migrations, and bulk checks that they're complete.
+
+`World.migrateWorldLazily` only records the source world: players are pulled
+on first use, and until then the new world's views read through to the
+source. Pulled players are in the new world's registry, so comparing
+registries tells who is still pending without a call per player. The source
+may keep changing, the new world recounts its unpulled active players on
+every pull.
+
+`verify_migration` compares every source player with the new world, a
+`getStates` call per page of players on each side. Players who have played
+in the new world since are reported as advanced rather than compared.
+
+Worlds deployed before the player registry, the ones most worth migrating
+from, have no `getPlayers`, `getRegisteredPlayers` or `getStates`. Their
+players must be passed explicitly, and their states are read a player at a
+time; `has_view` tells which views a source has.
+
+    verify_migration(new_world, old_world).print()
+"""
+from brownie import ZERO_ADDRESS, Contract
+from brownie.exceptions import VirtualMachineError
+from civ.helpers import (
+    PLAYER_PAGE_SIZE,
+    PLAYER_STATE_KEYS,
+    get_players,
+    get_registered_players,
+    get_states,
+    parse_player_state,
+)
+
+MIGRATION_BATCH_SIZE = 100
+
+# Copied by `migrateWorld`, as checked by `World.validateMigration`
+COUNTERS = (
+    'gameStartBlock', 'gameNumber', 'currentTurn', 'currentTurnCompleted', 'numActivePlayers',
+)
+
+
+def validate_migrated_state(state):
+    """`World._validateMigratedState` of a `parse_player_state` dict."""
+    return dict(
+        state,
+        farms=min(state['farms'], state['land']),
+        soldiers=min(state['soldiers'], state['population']),
+    )
+
+def get_source(world):
+    """The world `world` is lazily migrating from, or None."""
+    address = world.migrationSource()
+    if address == ZERO_ADDRESS:
+        return None
+    return Contract.from_abi(world._name, address, world.abi)
+
+def has_view(world, name, *args):
+    """Whether `world` has the view `name`, which reverts on worlds without it."""
+    try:
+        getattr(world, name)(*args)
+    except VirtualMachineError:
+        return False
+    return True
+
+def _source_players(source, players, page_size):
+    if players is not None:
+        return list(players)
+    if not has_view(source, 'numRegisteredPlayers'):
+        raise ValueError(f"{source.address} has no player registry, pass its players")
+    return get_registered_players(source, page_size)
+
+def get_source_states(source, players, page_size=PLAYER_PAGE_SIZE):
+    """`get_states` of `source`, a call per player if it has no `getStates`."""
+    players = list(players)
+    if has_view(source, 'getStates', []):
+        return get_states(source, players, page_size)
+    return (
+        [parse_player_state(source.getState(player)) for player in players],
+        [source.isPlayerActive(player) for player in players],
+        [source.getStrategy(player) for player in players],
+    )
+
+def get_unpulled_players(world, source=None, players=None, page_size=PLAYER_PAGE_SIZE):
+    """
+    `players` (the source's registry by default, required for sources without
+    one) not pulled into `world` yet, in source order.
+    """
+    source = source or get_source(world)
+    if source is None:
+        return []
+    players = _source_players(source, players, page_size)
+    pulled = set(map(str, get_registered_players(world, page_size)))
+    return [player for player in players if str(player) not in pulled]
+
+def get_active_players(world, page_size=PLAYER_PAGE_SIZE, source_players=None):
+    """
+    Active players of `world`, including those still to pull from a lazy
+    migration source: `getPlayers` only lists pulled players. A source
+    without a registry is asked about each of `source_players`.
+    """
+    players = get_players(world, page_size)
+    source = get_source(world)
+    if source is None:
+        return players
+    if source_players is None and has_view(source, 'numRegisteredPlayers'):
+        unpulled = get_unpulled_players(world, source, get_players(source, page_size), page_size)
+    else:
+        candidates = get_unpulled_players(world, source, source_players, page_size)
+        unpulled = [
+            player for player, active in zip(candidates, get_source_states(source, candidates)[1])
+            if active
+        ]
+    return players + unpulled
+
+def pull_players(world, players, account, batch_size=MIGRATION_BATCH_SIZE):
+    """Pull `players` with `pullPlayers`, `batch_size` per transaction."""
+    return [
+        world.pullPlayers(players[i:i + batch_size], {'from': account})
+        for i in range(0, len(players), batch_size)
+    ]
+
+
+class MigrationReport:
+
+    def __init__(self, source, world):
+        self.source = source
+        self.world = world
+        self.counters = {}
+        # Players not in the new world's registry, still to pull if lazy
+        self.missing = []
+        # Pulled players whose state, strategy or active flag differ
+        self.mismatched = {}
+        # Pulled players who have played a turn since
+        self.advanced = []
+        self.verified = 0
+
+    @property
+    def complete(self):
+        return (
+            not self.missing and not self.mismatched
+            and all(old == new for old, new in self.counters.values())
+        )
+
+    def print(self):
+        print(f"Migration {self.source} -> {self.world}")
+        for name, (old, new) in self.counters.items():
+            print(f"  {name:<24}{old:>12}{new:>12}{'' if old == new else '  MISMATCH'}")
+        print(f"  verified    {self.verified}")
+        print(f"  advanced    {len(self.advanced)}")
+        print(f"  missing     {len(self.missing)}")
+        print(f"  mismatched  {len(self.mismatched)}")
+        for player, fields in self.mismatched.items():
+            print(f"    {player}: {', '.join(fields)}")
+        print("Complete" if self.complete else "Incomplete")
+
+
+def verify_migration(world, source, players=None, page_size=PLAYER_PAGE_SIZE):
+    """
+    Check that every one of `players` (the source's registry by default,
+    required for sources without one) made it from `source` to `world`, with their validated state, strategy and
+    active flag. Counters are compared too, which only holds until the next
+    turn is played, and players attacked or traded with since show up as
+    mismatched.
+    """
+    report = MigrationReport(source.address, world.address)
+    for name in COUNTERS:
+        report.counters[name] = (getattr(source, name)(), getattr(world, name)())
+
+    players = _source_players(source, players, page_size)
+    registered = set(map(str, get_registered_players(world, page_size)))
+    report.missing = [player for player in players if str(player) not in registered]
+    pulled = [player for player in players if str(player) in registered]
+
+    old = zip(*get_source_states(source, pulled, page_size))
+    new = zip(*get_states(world, pulled, page_size))
+    for player, (old_state, old_active, old_strategy), (state, active, strategy) in zip(pulled, old, new):
+        if state['current_turn'] > old_state['current_turn']:
+            report.advanced.append(player)
+            continue
+
+        old_state = validate_migrated_state(old_state)
+        fields = [key for key in PLAYER_STATE_KEYS if state[key] != old_state[key]]
+        if active != old_active:
+            fields.append('active')
+        if strategy != old_strategy:
+            fields.append('strategy')
+        if fields:
+            report.mismatched[player] = fields
+        else:
+            report.verified += 1
+    return report
@@ -0,0 +1,179 @@
+"""
+Run game master commands across many worlds at once.
+
+Worlds come from a JSON config rather than `civ.metadata`:
+
+    {
+        "rpc_workers": 16,
+        "worlds": [
+            {"name": "live", "address": "0x...", "players": ["0x...", ...]},
+            {"name": "staging", "address": "0x...", "players": [...], "concurrency": 2, "window": 8}
+        ]
+    }
+
+RPC calls are blocking, so they run on one thread pool shared by every world,
+which bounds the number of open connections. Each world has a semaphore
+limiting how many of its commands run at once, and every command has a
+timeout, so a slow world only holds up its own commands. All worlds share
+one `NonceManager` since they're driven from the same game master account.
+"""
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from civ.helpers import get_snapshot
+from civ.runner import DEFAULT_WINDOW, NonceManager, TurnRunner
+
+DEFAULT_RPC_WORKERS = 16
+DEFAULT_CONCURRENCY = 1
+DEFAULT_COMMAND_TIMEOUT = 600
+
+COMMANDS = ('status', 'play_round', 'start_game', 'end_game')
+
+
+def load_config(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+class WorldHandle:
+
+    def __init__(self, name, world, players, runner, concurrency=DEFAULT_CONCURRENCY):
+        self.name = name
+        self.world = world
+        self.players = list(players)
+        self.runner = runner
+        self.concurrency = concurrency
+        self._semaphore = None
+        self._loop = None
+
+    # Semaphores belong to one event loop, start over in a new one
+    @property
+    def semaphore(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    def __repr__(self):
+        return f"<WorldHandle {self.name} {self.world.address}>"
+
+
+class Orchestrator:
+
+    def __init__(
+        self, account, rpc_workers=DEFAULT_RPC_WORKERS, timeout=DEFAULT_COMMAND_TIMEOUT,
+    ):
+        self.account = account
+        self.timeout = timeout
+        self.nonces = NonceManager(account)
+        self.pool = ThreadPoolExecutor(rpc_workers)
+        self.worlds = {}
+
+    @classmethod
+    def from_config(cls, config, account, container):
+        """Build from a config dict, loading worlds with `container.at`."""
+        orchestrator = cls(account, config.get('rpc_workers', DEFAULT_RPC_WORKERS))
+        for world in config['worlds']:
+            orchestrator.add_world(
+                world['name'], container.at(world['address']), world.get('players', []),
+                concurrency=world.get('concurrency', DEFAULT_CONCURRENCY),
+                window=world.get('window', DEFAULT_WINDOW),
+            )
+        return orchestrator
+
+    def add_world(
+        self, name, world, players,
+        concurrency=DEFAULT_CONCURRENCY, window=DEFAULT_WINDOW,
+    ):
+        runner = TurnRunner(world, self.account, window=window, nonces=self.nonces)
+        self.worlds[name] = WorldHandle(name, world, players, runner, concurrency)
+        return self.worlds[name]
+
+    def close(self):
+        self.pool.shutdown(wait=False)
+
+    # Commands, each run for a single world
+
+    def status(self, handle):
+        snapshot = get_snapshot(handle.world, handle.players)
+        return {
+            'game': handle.world.gameNumber(),
+            'in_progress': handle.world.isGameInProgress(),
+            'turn': snapshot['current_turn'],
+            'turn_completed': snapshot['current_turn_completed'],
+            'active': sum(snapshot['active'].values()),
+            'pending': sum(
+                1 for player in handle.players
+                if snapshot['active'][player]
+                and snapshot['states'][player]['current_turn'] < snapshot['current_turn']
+            ),
+        }
+
+    def play_round(self, handle):
+        return handle.runner.play_round(handle.players)
+
+    def start_game(self, handle):
+        return self._transact(handle.world.startGame)
+
+    def end_game(self, handle):
+        return self._transact(handle.world.endGame)
+
+    def _transact(self, fn, *args):
+        # Estimate before taking a nonce, so a call that would revert doesn't
+        # leave a gap other worlds' transactions get stuck behind
+        gas_limit = fn.estimate_gas(*args, {'from': self.account})
+        nonce = self.nonces.next()
+        try:
+            return fn(*args, {'from': self.account, 'nonce': nonce, 'gas_limit': gas_limit})
+        except Exception:
+            self.nonces.release(nonce)
+            raise
+
+    # Async
+
+    async def run_command(self, command, handle):
+        if command not in COMMANDS:
+            raise ValueError(f"Unknown command: {command}")
+        loop = asyncio.get_running_loop()
+        semaphore = handle.semaphore
+        await semaphore.acquire()
+        try:
+            call = loop.run_in_executor(self.pool, partial(getattr(self, command), handle))
+        except BaseException:
+            semaphore.release()
+            raise
+
+        # A timeout doesn't stop the thread, so the slot is held until the
+        # call itself is done rather than until the wait gives up
+        def done(future):
+            semaphore.release()
+            if not future.cancelled():
+                future.exception()
+        call.add_done_callback(done)
+        return await asyncio.wait_for(asyncio.shield(call), self.timeout)
+
+    async def run(self, command, names=None):
+        """
+        Run `command` on the worlds named in `names` (all by default) at once.
+        Returns results by world name, exceptions included rather than raised.
+        """
+        handles = [self.worlds[name] for name in (names or self.worlds)]
+        results = await asyncio.gather(
+            *(self.run_command(command, handle) for handle in handles),
+            return_exceptions=True,
+        )
+        return {handle.name: result for handle, result in zip(handles, results)}
+
+    async def play(self, rounds, names=None):
+        """Play `rounds` rounds in each world, worlds progressing independently."""
+        async def play_world(handle):
+            return [await self.run_command('play_round', handle) for _ in range(rounds)]
+
+        handles = [self.worlds[name] for name in (names or self.worlds)]
+        results = await asyncio.gather(
+            *(play_world(handle) for handle in handles), return_exceptions=True,
+        )
+        return {handle.name: result for handle, result in zip(handles, results)}
@@ -0,0 +1,149 @@
+"""
+Search for the best domestic opening with beam search.
+
+Every turn expands each kept state with `explore`, `research`, `produce`,
+`farm(n)`, `create` and `train(n)`, then keeps the `beam` states with the best
+estimate of the objective at the horizon, estimated by projecting each state
+forward with the best fixed policy (`civ.projection`). A transposition table
+keyed on the state fields drops any state already reached at the same or an
+earlier turn, since more turns left is never worse.
+
+    python -m civ.planner --horizon 50 --objective culture
+
+prints the schedule run-length encoded, an opening book to hardcode in a
+strategy contract (like `TestFarmStrategy`).
+"""
+import argparse
+
+from civ import engine
+from civ.engine import PlayerState
+from civ.projection import POLICIES, project
+
+DEFAULT_HORIZON = 50
+DEFAULT_BEAM = 1000
+DEFAULT_FARM_OPTIONS = (1, 2, 3, 4, 5)
+DEFAULT_TRAIN_OPTIONS = ()
+
+OBJECTIVES = {
+    'culture': lambda state: state.culture,
+    'resources': lambda state: state.resources,
+    'population': lambda state: state.population,
+    'land': lambda state: state.land,
+    'score': lambda state: state.culture + state.resources + state.land * 10,
+}
+
+ACTIONS = {
+    'explore': lambda state, n: engine.explore(state),
+    'research': lambda state, n: engine.research(state),
+    'produce': lambda state, n: engine.produce(state),
+    'farm': engine.farm,
+    'create': lambda state, n: engine.create(state),
+    'train': engine.train,
+}
+
+
+def _key(state):
+    return (
+        state.land, state.farms, state.science, state.culture, state.soldiers,
+        state.population, state.resources,
+    )
+
+
+def get_actions(farm_options=DEFAULT_FARM_OPTIONS, train_options=DEFAULT_TRAIN_OPTIONS):
+    actions = [('explore', 0), ('research', 0), ('produce', 0), ('create', 0)]
+    actions += [('farm', n) for n in farm_options]
+    actions += [('train', n) for n in train_options]
+    return actions
+
+
+def play_action(state, action):
+    """Play one turn of `action`, a `(name, n)` tuple, on a copy of `state`."""
+    name, n = action
+    state = state.copy()
+    state.current_turn += 1
+    engine.update_production(state)
+    ACTIONS[name](state, n)
+    return state
+
+
+class Plan:
+
+    def __init__(self, actions, state, value):
+        self.actions = actions
+        self.state = state
+        self.value = value
+
+    def book(self):
+        """Run-length encoded schedule as `(first_turn, last_turn, action)` tuples."""
+        book = []
+        for turn, action in enumerate(self.actions, 1):
+            if book and book[-1][2] == action:
+                book[-1] = (book[-1][0], turn, action)
+            else:
+                book.append((turn, turn, action))
+        return book
+
+    def print(self):
+        for first, last, (name, n) in self.book():
+            turns = f"turn {first}" if first == last else f"turns {first}-{last}"
+            action = f"{name}({n})" if name in ('farm', 'train') else name
+            print(f"  {turns:<14}{action}")
+        print(f"\nFinal state: {self.state.as_dict()}")
+        print(f"Objective: {self.value}")
+
+
+def search(
+    state=None, horizon=DEFAULT_HORIZON, objective='culture', beam=DEFAULT_BEAM,
+    farm_options=DEFAULT_FARM_OPTIONS, train_options=DEFAULT_TRAIN_OPTIONS,
+):
+    """
+    Beam search the action sequence maximizing `objective` (a name from
+    `OBJECTIVES` or a function of `PlayerState`) after `horizon` turns.
+    """
+    objective = OBJECTIVES[objective] if isinstance(objective, str) else objective
+    state = state.copy() if state is not None else PlayerState.initial('player')
+    actions = get_actions(farm_options, train_options)
+
+    def estimate(state, turns_left):
+        return max(objective(project(state, turns_left, policy)) for policy in POLICIES)
+
+    # Earliest turn each state was reached, and how
+    seen = {_key(state): 0}
+    frontier = [(state, ())]
+    for turn in range(1, horizon + 1):
+        children = []
+        for parent, path in frontier:
+            for action in actions:
+                child = play_action(parent, action)
+                key = _key(child)
+                if seen.get(key, turn + 1) <= turn:
+                    continue
+                seen[key] = turn
+                children.append((estimate(child, horizon - turn), child, path + (action,)))
+
+        children.sort(key=lambda child: child[0], reverse=True)
+        frontier = [(child, path) for _, child, path in children[:beam]]
+
+    best, path = max(frontier, key=lambda node: objective(node[0]))
+    return Plan(list(path), best, objective(best))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--horizon', type=int, default=DEFAULT_HORIZON)
+    parser.add_argument('--objective', choices=sorted(OBJECTIVES), default='culture')
+    parser.add_argument('--beam', type=int, default=DEFAULT_BEAM)
+    parser.add_argument('--farms', type=int, nargs='*', default=list(DEFAULT_FARM_OPTIONS))
+    parser.add_argument('--train', type=int, nargs='*', default=list(DEFAULT_TRAIN_OPTIONS))
+    args = parser.parse_args(argv)
+
+    plan = search(
+        horizon=args.horizon, objective=args.objective, beam=args.beam,
+        farm_options=args.farms, train_options=args.train,
+    )
+    print(f"Best {args.objective} opening over {args.horizon} turns")
+    plan.print()
+
+
+if __name__ == '__main__':
+    main()
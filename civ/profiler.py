@@ -0,0 +1,164 @@
+"""
+Gas profiling for strategy callbacks.
+
+`World` calls `handleTurn`, `handleTrade` and `handleAttack` with fixed gas
+limits inside `try ... catch {}`, so a strategy running out of gas silently
+does nothing that turn. `Profile` collects the gas each callback used across
+many traced calls, and reports the worst case against its limit with the
+opcodes and functions where the gas went.
+
+Traces are lists of steps as in brownie's `TransactionReceipt.trace`, each
+with `op`, `gas` (gas left before the step), `gasCost`, `depth`, `fn` and
+`address`. See `scripts/profile_strategy.py` to run it on a strategy.
+"""
+import random
+from collections import Counter, defaultdict
+
+from civ.helpers import (
+    HANDLE_ATTACK_GAS_LIMIT,
+    HANDLE_TRADE_GAS_LIMIT,
+    HANDLE_TURN_GAS_LIMIT,
+    INITIAL_STATE,
+)
+
+GAS_LIMITS = {
+    'handleTurn': HANDLE_TURN_GAS_LIMIT,
+    'handleTrade': HANDLE_TRADE_GAS_LIMIT,
+    'handleAttack': HANDLE_ATTACK_GAS_LIMIT,
+}
+FAILED_OPS = ('REVERT', 'INVALID')
+TOP = 10
+
+
+def sample_states(count, seed=0, max_turn=200):
+    """
+    Random but consistent player states (farms within land, soldiers within
+    population), starting with the initial state.
+    """
+    rng = random.Random(seed)
+    states = [dict(INITIAL_STATE)]
+    for _ in range(count - 1):
+        land = rng.randint(1, 100)
+        population = rng.randint(1, 1000)
+        states.append({
+            'current_turn': rng.randint(0, max_turn),
+            'land': land,
+            'farms': rng.randint(0, land),
+            'science': rng.randint(1, 100),
+            'culture': rng.randint(0, 100000),
+            'soldiers': rng.randint(0, population),
+            'population': population,
+            'resources': rng.randint(0, 100000),
+        })
+    return states
+
+
+def find_frame(trace, address):
+    """`(start, end)` step indexes of the first call frame executing `address`."""
+    address = str(address).lower()
+    for start, step in enumerate(trace):
+        if str(step['address']).lower() == address:
+            break
+    else:
+        return None
+
+    depth = trace[start]['depth']
+    end = start + 1
+    while end < len(trace) and trace[end]['depth'] >= depth:
+        end += 1
+    return start, end
+
+
+def frame_gas(trace, start, end):
+    """Gas used by the steps `trace[start:end]`, nested calls included."""
+    last = trace[end - 1]
+    return trace[start]['gas'] - last['gas'] + last['gasCost']
+
+
+def frame_failed(trace, start, end):
+    last = trace[end - 1]
+    return bool(last.get('error')) or last['op'] in FAILED_OPS
+
+
+def step_costs(trace, start=0, end=None):
+    """
+    Exclusive gas of each step in `trace[start:end]`. Call steps are charged
+    their overhead but not the callee's steps, which are charged separately,
+    so the costs add up to the frame's gas.
+    """
+    end = len(trace) if end is None else end
+    costs = [0] * (end - start)
+
+    # Index where each call returns to the caller's depth
+    returns = {}
+    stack = []
+    for i in range(start, end):
+        depth = trace[i]['depth']
+        while stack and depth <= trace[stack[-1]]['depth']:
+            returns[stack.pop()] = i
+        if i + 1 < end and trace[i + 1]['depth'] > depth:
+            stack.append(i)
+
+    for i in range(start, end):
+        step = trace[i]
+        next_step = trace[i + 1] if i + 1 < end else None
+        if next_step is None or next_step['depth'] < step['depth']:
+            cost = step['gasCost']
+        elif next_step['depth'] == step['depth']:
+            cost = step['gas'] - next_step['gas']
+        elif i in returns:
+            callee = frame_gas(trace, i + 1, returns[i])
+            cost = step['gas'] - trace[returns[i]]['gas'] - callee
+        else:
+            cost = step['gasCost']
+        costs[i - start] = cost
+    return costs
+
+
+class Profile:
+
+    def __init__(self, limits=GAS_LIMITS):
+        self.limits = limits
+        self.gas = defaultdict(list)
+        self.failures = defaultdict(int)
+        self.worst_input = {}
+        self.opcodes = defaultdict(Counter)
+        self.functions = defaultdict(Counter)
+
+    def add(self, callback, trace, address, sample=None):
+        """Record the gas `address` used in `trace` for `callback`."""
+        frame = find_frame(trace, address)
+        if frame is None:
+            return None
+        start, end = frame
+        gas = frame_gas(trace, start, end)
+
+        if not self.gas[callback] or gas > max(self.gas[callback]):
+            self.worst_input[callback] = sample
+        self.gas[callback].append(gas)
+        if frame_failed(trace, start, end):
+            self.failures[callback] += 1
+
+        for step, cost in zip(trace[start:end], step_costs(trace, start, end)):
+            self.opcodes[callback][step['op']] += cost
+            self.functions[callback][step.get('fn') or '?'] += cost
+        return gas
+
+    def headroom(self, callback):
+        return self.limits[callback] - max(self.gas[callback])
+
+    def print(self, top=TOP):
+        for callback, samples in self.gas.items():
+            limit = self.limits[callback]
+            worst = max(samples)
+            print(f"{callback}: {len(samples)} calls, {self.failures[callback]} failed")
+            print(f"  gas used    min {min(samples)}  avg {sum(samples) // len(samples)}  max {worst}")
+            print(f"  headroom    {limit - worst} of {limit} ({(limit - worst) / limit:.1%})")
+            print(f"  worst input {self.worst_input[callback]}")
+
+            total = sum(self.opcodes[callback].values()) or 1
+            for title, counter in (('opcodes', self.opcodes), ('functions', self.functions)):
+                print(f"  hottest {title}")
+                for name, gas in counter[callback].most_common(top):
+                    print(f"    {name:<48}{gas:>12}  {gas / total:>6.1%}")
+            print()
@@ -0,0 +1,139 @@
+"""
+Closed-form fast-forward of a player's state under a fixed policy.
+
+With farms and science fixed, population follows one growth chain: it grows
+every turn while there's enough food and the science cap allows, and once
+either check fails it never grows again. Resources and culture are then sums
+over that chain, and land (for `explore`) is an arithmetic series, so
+projecting any number of turns costs the length of the growth chain, which is
+cached, instead of one step per turn.
+
+Projections match `civ.engine` playing the same policy with no other
+players interfering (no trades or attacks).
+"""
+from functools import lru_cache
+
+from civ.engine import (
+    PlayerState,
+    compute_loot,
+    compute_new_population,
+)
+from civ.helpers import FOOD_PER_FARM, POP_PER_SCIENCE
+
+# Policies, each playing the same action every turn
+IDLE = 'idle'
+PRODUCE = 'produce'
+CREATE = 'create'
+EXPLORE = 'explore'
+POLICIES = (IDLE, PRODUCE, CREATE, EXPLORE)
+
+CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def growth_chain(population, food, cap):
+    """
+    Population after each turn, starting from `population`, until growth
+    stops. The last population repeats forever after.
+    """
+    chain = [population]
+    while food >= population:
+        new_pop = compute_new_population(population)
+        if new_pop > cap:
+            break
+        population = new_pop
+        chain.append(population)
+    return tuple(chain)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _civilian_sums(population, food, cap, soldiers):
+    # Total civilians over the first i turns of the chain
+    sums = [0]
+    for pop in growth_chain(population, food, cap)[1:]:
+        sums.append(sums[-1] + max(pop - soldiers, 0))
+    return tuple(sums)
+
+
+def _chain(state):
+    return growth_chain(
+        state.population, state.farms * FOOD_PER_FARM, state.science * POP_PER_SCIENCE
+    )
+
+
+def _total_civilians(state, turns):
+    chain = _chain(state)
+    sums = _civilian_sums(
+        state.population, state.farms * FOOD_PER_FARM,
+        state.science * POP_PER_SCIENCE, state.soldiers,
+    )
+    grown = min(turns, len(chain) - 1)
+    return sums[grown] + (turns - grown) * max(chain[-1] - state.soldiers, 0)
+
+
+# Sum of max(start + k, 0) for k in range(turns)
+def _sum_positive_series(start, turns):
+    skip = max(-start, 0)
+    if turns <= skip:
+        return 0
+    start += skip
+    turns -= skip
+    return turns * start + turns * (turns - 1) // 2
+
+
+def _as_state(state):
+    if isinstance(state, PlayerState):
+        return state.copy()
+    return PlayerState(**state)
+
+
+def project(state, turns, policy=IDLE):
+    """
+    Return a new `PlayerState` after `turns` turns of `policy`. `state` is a
+    `PlayerState` or a dict as returned by `parse_player_state`.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy: {policy}")
+    if turns < 0:
+        raise ValueError("Can't project a negative number of turns")
+    state = _as_state(state)
+    chain = _chain(state)
+    civilians = _total_civilians(state, turns)
+
+    unfarmed = state.land - state.farms
+    if policy == EXPLORE:
+        state.resources += _sum_positive_series(unfarmed, turns)
+        state.land += turns
+    else:
+        state.resources += turns * max(unfarmed, 0)
+
+    if policy == PRODUCE:
+        state.resources += civilians
+    elif policy == CREATE:
+        state.culture += civilians
+
+    state.population = chain[min(turns, len(chain) - 1)]
+    state.current_turn += turns
+    return state
+
+
+def turns_until_pop_cap(state):
+    """Turns until population stops growing, whichever of food or science caps it."""
+    return len(_chain(_as_state(state))) - 1
+
+
+def population_at(state, turn):
+    state = _as_state(state)
+    return project(state, turn - state.current_turn).population
+
+
+def resources_at(state, turn, policy=IDLE):
+    """Resources once the player has played `turn` (not before their current turn)."""
+    state = _as_state(state)
+    return project(state, turn - state.current_turn, policy).resources
+
+
+def loot_at(state, turn, policy=IDLE):
+    """Loot an attacker would take from the player once they've played `turn`."""
+    state = _as_state(state)
+    return compute_loot(project(state, turn - state.current_turn, policy))
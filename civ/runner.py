@@ -0,0 +1,201 @@
+"""
+Pipelined `playTurn` submission for game masters.
+
+`TurnRunner` reads every player's state up front, signs `playTurn` calls with
+locally tracked nonces and keeps up to `window` transactions in flight,
+collecting receipts as the window fills. Dropped transactions are resubmitted,
+stuck ones rebroadcast at a higher gas price. Pass a `civ.metrics.TurnMetrics`
+to record every collected turn. With `batch_size` above 1, each transaction
+plays that many players through `playTurns`.
+"""
+import heapq
+import threading
+import time
+from collections import deque
+
+from brownie.network.transaction import Status
+from civ.helpers import get_snapshot
+
+DEFAULT_WINDOW = 16
+DEFAULT_RETRIES = 2
+DEFAULT_TIMEOUT = 120
+GAS_PRICE_BUMP = 1.125
+POLL_INTERVAL = 0.5
+
+
+class NonceManager:
+    """Hands out sequential nonces for one account, safe to share across threads."""
+
+    def __init__(self, account):
+        self.account = account
+        self._lock = threading.Lock()
+        self._next = None
+        self._released = []
+
+    def next(self):
+        with self._lock:
+            if self._released:
+                return heapq.heappop(self._released)
+            if self._next is None:
+                self._next = self.account.nonce
+            nonce = self._next
+            self._next += 1
+            return nonce
+
+    # Give back a nonce that was never broadcast so there is no gap
+    def release(self, nonce):
+        with self._lock:
+            if nonce == self._next - 1:
+                self._next = nonce
+            else:
+                heapq.heappush(self._released, nonce)
+
+    def reset(self):
+        with self._lock:
+            self._next = None
+            self._released = []
+
+
+class RoundReport:
+
+    def __init__(self, turn):
+        self.turn = turn
+        self.played = []
+        self.skipped = []
+        self.inactive = []
+        self.failed = {}
+
+    def __repr__(self):
+        return (
+            f"<RoundReport turn={self.turn} played={len(self.played)} "
+            f"skipped={len(self.skipped)} inactive={len(self.inactive)} "
+            f"failed={len(self.failed)}>"
+        )
+
+
+class TurnRunner:
+
+    def __init__(
+        self, world, account,
+        window=DEFAULT_WINDOW, retries=DEFAULT_RETRIES, timeout=DEFAULT_TIMEOUT,
+        gas_limit=None, nonces=None, metrics=None, batch_size=1,
+    ):
+        self.world = world
+        self.account = account
+        self.window = window
+        self.retries = retries
+        self.timeout = timeout
+        self.gas_limit = gas_limit
+        self.nonces = nonces or NonceManager(account)
+        self.metrics = metrics
+        self.batch_size = batch_size
+        self._strategies = {}
+
+    def read_round(self, players):
+        """Read the round in one call, returning a report and the players still to play."""
+        snapshot = get_snapshot(self.world, players)
+        self._strategies.update(snapshot['strategies'])
+        turn = snapshot['current_turn']
+        report = RoundReport(turn)
+        pending = []
+
+        for player in players:
+            if not snapshot['active'][player]:
+                report.inactive.append(player)
+            elif snapshot['states'][player]['current_turn'] < turn:
+                pending.append(player)
+            else:
+                report.skipped.append(player)
+        return report, pending
+
+    def play_round(self, players):
+        report, pending = self.read_round(players)
+        self.play(pending, report)
+        return report
+
+    def play(self, players, report=None):
+        report = report or RoundReport(self.world.currentTurn())
+        in_flight = deque()
+
+        for i in range(0, len(players), self.batch_size):
+            while len(in_flight) >= self.window:
+                self._collect(in_flight, report)
+            job = self._submit(players[i:i + self.batch_size], report)
+            if job:
+                in_flight.append(job)
+
+        while in_flight:
+            self._collect(in_flight, report)
+        return report
+
+    def _tx_params(self, nonce):
+        params = {'from': self.account, 'nonce': nonce, 'required_confs': 0}
+        if self.gas_limit:
+            params['gas_limit'] = self.gas_limit
+        return params
+
+    def _send(self, players, nonce):
+        if self.batch_size == 1:
+            return self.world.playTurn(players[0], self._tx_params(nonce))
+        return self.world.playTurns(players, self._tx_params(nonce))
+
+    def _fail(self, players, report, reason):
+        for player in players:
+            report.failed[player] = reason
+
+    def _submit(self, players, report, attempt=0):
+        nonce = self.nonces.next()
+        sent_at = time.time()
+        try:
+            tx = self._send(players, nonce)
+        except Exception as exc:
+            self.nonces.release(nonce)
+            self._fail(players, report, f"submit failed: {exc}")
+            return None
+        return [players, tx, attempt, sent_at, time.time() - sent_at]
+
+    def _collect(self, in_flight, report):
+        job = in_flight.popleft()
+        players, tx, attempt, sent_at, rpc_latency = job
+
+        while tx.status == Status.Pending and time.time() - sent_at < self.timeout:
+            time.sleep(POLL_INTERVAL)
+
+        # Metrics are per turn, batches don't break gas down by player
+        if (
+            self.metrics is not None and self.batch_size == 1
+            and tx.status in (Status.Confirmed, Status.Reverted)
+        ):
+            self.metrics.record(
+                report.turn, players[0], tx, rpc_latency, time.time() - sent_at,
+                strategy=self._strategies.get(players[0]),
+            )
+
+        if tx.status == Status.Confirmed:
+            if self.batch_size == 1:
+                report.played += players
+            else:
+                # Batches skip players instead of reverting, see who played
+                summaries = tx.events['TurnSummary'] if 'TurnSummary' in tx.events else []
+                played = {str(event['player']) for event in summaries}
+                for player in players:
+                    (report.played if str(player) in played else report.skipped).append(player)
+        elif tx.status == Status.Reverted:
+            self._fail(players, report, "reverted")
+        elif attempt >= self.retries:
+            self._fail(players, report, "dropped" if tx.status == Status.Dropped else "timed out")
+
+        # Nonce was taken by another transaction, resubmit with a new one
+        elif tx.status == Status.Dropped:
+            retry = self._submit(players, report, attempt + 1)
+            if retry:
+                in_flight.append(retry)
+
+        # Still pending, rebroadcast the same nonce at a higher gas price
+        else:
+            try:
+                replaced_at = time.time()
+                tx = tx.replace(GAS_PRICE_BUMP)
+                in_flight.append([players, tx, attempt + 1, replaced_at, time.time() - replaced_at])
+            except Exception as exc:
+                self._fail(players, report, f"replace failed: {exc}")
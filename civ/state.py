@@ -0,0 +1,218 @@
+"""
+Player state, and fast decoding of it from raw ABI bytes.
+
+`PlayerState` is the slotted mirror of the `PlayerState` struct used by
+`civ.engine`. The decoders here skip brownie's generic ABI decoding and
+`parse_player_state`'s dicts: a state is 9 fixed 32-byte words, read straight
+from the return data of `getState`, `getStates` and `getSnapshot`, or from
+`TurnSummary` logs.
+
+`decode_states_array` and `get_states_array` decode many states into a NumPy
+structured array (`STATE_DTYPE`) without creating a Python object per field.
+Values are stored as `uint64`, as in `civ.history`, and anything larger
+raises `OverflowError`. Players are kept as raw 20-byte addresses (`V20`,
+which unlike `S20` keeps trailing zero bytes), `to_address` turns one into a
+checksummed string.
+
+    data = call_raw(world, 'getStates', players)
+    states, active, strategies = decode_states_array(data)
+    states['culture'].argmax()
+"""
+from functools import lru_cache
+
+import numpy as np
+from eth_utils import to_checksum_address
+
+from civ.helpers import (
+    INITIAL_LAND,
+    INITIAL_POP,
+    INITIAL_RESOURCES,
+    PLAYER_STATE_KEYS,
+)
+
+WORD = 32
+STATE_WORDS = len(PLAYER_STATE_KEYS)
+STATE_SIZE = STATE_WORDS * WORD
+ADDRESS_SIZE = 20
+
+STATE_DTYPE = np.dtype([
+    ('player', f'V{ADDRESS_SIZE}'),
+    *((key, np.uint64) for key in PLAYER_STATE_KEYS[1:]),
+])
+
+# TurnSummary's data, the state after `player`, `game` and `turn` topics
+SUMMARY_KEYS = PLAYER_STATE_KEYS[2:]
+
+
+class PlayerState:
+    """Mutable mirror of the `PlayerState` struct, in `PLAYER_STATE_KEYS` order."""
+
+    __slots__ = tuple(PLAYER_STATE_KEYS)
+
+    def __init__(
+        self, player=None, current_turn=0,
+        land=0, farms=0, science=0, culture=0, soldiers=0,
+        population=0, resources=0,
+    ):
+        self.player = player
+        self.current_turn = current_turn
+        self.land = land
+        self.farms = farms
+        self.science = science
+        self.culture = culture
+        self.soldiers = soldiers
+        self.population = population
+        self.resources = resources
+
+    @classmethod
+    def initial(cls, player):
+        return cls(
+            player, 0,
+            INITIAL_LAND, 0, 1, 0, 0,
+            INITIAL_POP, INITIAL_RESOURCES,
+        )
+
+    def __iter__(self):
+        return iter((
+            self.player, self.current_turn,
+            self.land, self.farms, self.science, self.culture, self.soldiers,
+            self.population, self.resources,
+        ))
+
+    def __eq__(self, other):
+        if isinstance(other, PlayerState):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{key}={getattr(self, key)!r}" for key in self.__slots__)
+        return f"PlayerState({fields})"
+
+    def copy(self):
+        return PlayerState(
+            self.player, self.current_turn,
+            self.land, self.farms, self.science, self.culture, self.soldiers,
+            self.population, self.resources,
+        )
+
+    def as_dict(self):
+        return dict(zip(PLAYER_STATE_KEYS, self))
+
+
+# Single states
+
+def to_address(raw):
+    """Checksummed address from its 20 raw bytes (or a 32-byte word)."""
+    return _checksum(bytes(raw)[-ADDRESS_SIZE:])
+
+@lru_cache(maxsize=4096)
+def _checksum(raw):
+    return to_checksum_address(raw)
+
+def _words(data, offset, count):
+    return [
+        int.from_bytes(data[i:i + WORD], 'big')
+        for i in range(offset, offset + count * WORD, WORD)
+    ]
+
+def decode_state(data, offset=0):
+    """`PlayerState` from the 9 words at `offset`, e.g. `getState`'s return data."""
+    data = bytes(data)
+    player = to_address(data[offset + WORD - ADDRESS_SIZE:offset + WORD])
+    return PlayerState(player, *_words(data, offset + WORD, STATE_WORDS - 1))
+
+def decode_summary(log):
+    """
+    `PlayerState` from a raw `TurnSummary` log (a web3 log with `topics` and
+    `data`), `current_turn` being the summary's turn. Returns `(game, state)`.
+    """
+    _, player, game, turn = (bytes(topic) for topic in log['topics'])
+    values = _words(bytes(log['data']), 0, len(SUMMARY_KEYS))
+    state = PlayerState(to_address(player), int.from_bytes(turn, 'big'), *values)
+    return int.from_bytes(game, 'big'), state
+
+def _array_at(data, head):
+    # A dynamic array's (start, length) from its offset in the head
+    start = int.from_bytes(data[head:head + WORD], 'big')
+    return start + WORD, int.from_bytes(data[start:start + WORD], 'big')
+
+def decode_states(data, head=0):
+    """`getStates` return data as `(states, active, strategies)` lists."""
+    data = bytes(data)
+    start, count = _array_at(data, head)
+    states = [decode_state(data, start + i * STATE_SIZE) for i in range(count)]
+    start, count = _array_at(data, head + WORD)
+    active = [bool(word) for word in _words(data, start, count)]
+    start, count = _array_at(data, head + 2 * WORD)
+    strategies = [to_address(data[i:i + WORD]) for i in range(start, start + count * WORD, WORD)]
+    return states, active, strategies
+
+
+# Bulk
+
+def _word_matrix(data, start, count, words):
+    return np.frombuffer(data, np.uint8, count * words * WORD, start).reshape(count, words, WORD)
+
+def _uint64(words):
+    if words[..., :WORD - 8].any():
+        raise OverflowError("Value does not fit in uint64")
+    return words[..., WORD - 8:].copy().view('>u8')[..., 0]
+
+def decode_states_array(data, head=0):
+    """
+    `getStates` return data as `(states, active, strategies)` arrays: a
+    `STATE_DTYPE` record per player, bools and raw 20-byte strategy addresses.
+    """
+    data = bytes(data)
+    start, count = _array_at(data, head)
+    words = _word_matrix(data, start, count, STATE_WORDS)
+    states = np.empty(count, STATE_DTYPE)
+    states['player'] = words[:, 0, WORD - ADDRESS_SIZE:].copy().view(f'V{ADDRESS_SIZE}')[:, 0]
+    for i, key in enumerate(PLAYER_STATE_KEYS[1:], 1):
+        states[key] = _uint64(words[:, i])
+
+    start, count = _array_at(data, head + WORD)
+    active = _word_matrix(data, start, count, 1)[:, 0].any(axis=1)
+    start, count = _array_at(data, head + 2 * WORD)
+    strategies = _word_matrix(data, start, count, 1)[:, 0, WORD - ADDRESS_SIZE:].copy()
+    return states, active, strategies.view(f'V{ADDRESS_SIZE}')[:, 0]
+
+def decode_snapshot_array(data):
+    """
+    `getSnapshot` return data as `(turn, turn_completed, states, active,
+    strategies)`, arrays as in `decode_states_array`.
+    """
+    data = bytes(data)
+    turn, turn_completed = _words(data, 0, 2)
+    # The arrays' offsets are relative to the start of the return data
+    return (turn, turn_completed, *decode_states_array(data, 2 * WORD))
+
+
+# RPC
+
+def call_raw(contract, method, *args, block_identifier='latest'):
+    """`eth_call` a brownie contract's view, returning the undecoded bytes."""
+    from brownie import web3
+
+    fn = getattr(contract, method)
+    return bytes(web3.eth.call(
+        {'to': contract.address, 'data': fn.encode_input(*args)}, block_identifier,
+    ))
+
+def get_state_raw(world, player):
+    return decode_state(call_raw(world, 'getState', player))
+
+def get_states_array(world, players, page_size=None):
+    """
+    `getStates` of `players` decoded with `decode_states_array`, one call per
+    `page_size` players (all at once by default).
+    """
+    players = list(players)
+    page_size = page_size or max(len(players), 1)
+    pages = [
+        decode_states_array(call_raw(world, 'getStates', players[i:i + page_size]))
+        for i in range(0, len(players), page_size)
+    ] or [decode_states_array(call_raw(world, 'getStates', []))]
+    return tuple(np.concatenate(arrays) for arrays in zip(*pages))
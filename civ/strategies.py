@@ -0,0 +1,185 @@
+"""
+Python ports of the strategies in `contracts/examples`, for use with
+`civ.engine`. Contract strategies key their settings by player; the ports
+keep them on the instance, so use one instance per player.
+"""
+from collections import namedtuple
+
+from civ.engine import AttackResponse
+
+
+# BasicStrategy.sol
+class BasicStrategy:
+
+    # Do nothing
+    def handle_turn(self, world, state):
+        pass
+
+    # Always trade
+    def handle_trade(self, requester_state, self_state):
+        return True
+
+    # We won't have soldiers, so retreat as default
+    # and take the risk on being destroyed
+    def handle_attack(self, attacker_state, self_state, attackers):
+        return AttackResponse.RETREAT, 0, 0
+
+
+# TestCreateStrategy.sol
+class CreateStrategy(BasicStrategy):
+
+    def handle_turn(self, world, state):
+        world.create()
+
+
+# TestExploreStrategy.sol
+class ExploreStrategy(BasicStrategy):
+
+    def handle_turn(self, world, state):
+        world.explore()
+
+
+# TestProduceStrategy.sol
+class ProduceStrategy(BasicStrategy):
+
+    def handle_turn(self, world, state):
+        world.produce()
+
+
+# TestResearchStrategy.sol
+class ResearchStrategy(BasicStrategy):
+
+    def handle_turn(self, world, state):
+        world.research()
+
+
+# TestMultiActionStrategy.sol
+class MultiActionStrategy(BasicStrategy):
+
+    def handle_turn(self, world, state):
+        world.create()
+        world.produce()
+
+
+# TestFarmStrategy.sol
+class FarmStrategy(BasicStrategy):
+
+    def __init__(self, farm_target=4):
+        self.farm_target = farm_target
+
+    def handle_turn(self, world, state):
+        # Use most land and resources to build farms first turn
+        if state.current_turn == 1:
+            world.farm(self.farm_target)
+
+        # Produce second turn to get resources
+        elif state.current_turn == 2:
+            world.produce()
+
+        # Research third turn to start growing
+        elif state.current_turn == 3:
+            world.research()
+
+        # After that either research or produce to research
+        elif world.get_next_science_cost(state) <= state.resources:
+            world.research()
+        else:
+            world.produce()
+
+
+# TestTradeStrategy.sol
+class TradeStrategy(BasicStrategy):
+
+    def __init__(self, trade_partner=None):
+        self.trade_partner = trade_partner
+
+    def handle_turn(self, world, state):
+        if self.trade_partner is not None:
+            world.trade(self.trade_partner)
+
+    # Only accept trades from trade partner
+    def handle_trade(self, requester_state, self_state):
+        return requester_state.player == self.trade_partner
+
+
+# TestAttackStrategy.sol
+class AttackStrategy(BasicStrategy):
+
+    def __init__(
+        self, target=None, train_target=0,
+        attack_response=AttackResponse.RETREAT, defenders=0, fortifications=0,
+    ):
+        self.target = target
+        self.train_target = train_target
+        self.attack_response = attack_response
+        self.defenders = defenders
+        self.fortifications = fortifications
+
+    def set_attack_response(self, response, defenders, fortifications):
+        self.attack_response = response
+        self.defenders = defenders
+        self.fortifications = fortifications
+
+    def handle_turn(self, world, state):
+        # Attack with all soldiers if there's a target
+        if self.target is not None:
+            world.attack(self.target, state.soldiers)
+
+        # Train if there's a training goal
+        elif self.train_target > 0:
+            world.train(self.train_target)
+
+    def handle_attack(self, attacker_state, self_state, attackers):
+        return self.attack_response, self.defenders, self.fortifications
+
+
+# TestScriptedStrategy.sol
+Script = namedtuple('Script', [
+    'action', 'target', 'param', 'response', 'defenders', 'fortifications',
+    'approve_trades',
+])
+NO_SCRIPT = Script(0, None, 0, AttackResponse.RETREAT, 0, 0, False)
+
+
+class ScriptedStrategy(BasicStrategy):
+
+    def __init__(self, script=NO_SCRIPT):
+        self.script = script
+
+    def handle_turn(self, world, state):
+        action, target, param = self.script[:3]
+        if action == 1:
+            world.explore()
+        elif action == 2:
+            world.research()
+        elif action == 3:
+            world.produce()
+        elif action == 4:
+            world.farm(param)
+        elif action == 5:
+            world.create()
+        elif action == 6:
+            world.train(param)
+        elif action == 7:
+            world.trade(target)
+        elif action == 8:
+            world.attack(target, param)
+
+    def handle_trade(self, requester_state, self_state):
+        return self.script.approve_trades
+
+    def handle_attack(self, attacker_state, self_state, attackers):
+        return self.script.response, self.script.defenders, self.script.fortifications
+
+
+# Factories by name, called with the list of opponents in the game
+STRATEGIES = {
+    'basic': lambda opponents: BasicStrategy(),
+    'create': lambda opponents: CreateStrategy(),
+    'explore': lambda opponents: ExploreStrategy(),
+    'produce': lambda opponents: ProduceStrategy(),
+    'research': lambda opponents: ResearchStrategy(),
+    'farm': lambda opponents: FarmStrategy(),
+    'trade': lambda opponents: TradeStrategy(opponents[0]),
+    'attack': lambda opponents: AttackStrategy(target=opponents[0]),
+}
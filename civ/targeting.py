@@ -0,0 +1,193 @@
+"""
+All-pairs attack and trade evaluation with NumPy.
+
+`Targeting` takes every player's state at once and computes, for each
+attacker (rows) and defender (columns), the outcome of an attack under each
+`AttackResponse`, following `World.attack`:
+
+- `success`: a defender who retreats always loses, a fight is won with more
+  soldiers than defenders, and fortifications add up to `MAX_FORTIFICATION`
+  to the defenders if the defender can pay for them
+- `loot`: `_computeLoot` of the defender, after paying for fortifications
+- `land`: one land on success
+- `attacker_casualties` and `defender_casualties`: population lost in a battle
+- `defense_culture`: the defender's bonus for a battle won
+
+Attackers send all their soldiers and defenders defend with all of theirs
+unless told otherwise. The defender picks the response, so targets rank by
+the worst case over responses by default: the least of the attacker's gains,
+the most of their costs and of the defender's gains (`WORST_CASE`).
+
+Trades give the proposer the receiver's civilian population in resources and
+culture, and the receiver the proposer's: `trade[i, j]` is what player `i`
+gets from trading with `j`, and `mutual_trade` the lesser of both sides' gains.
+
+Players can't target themselves or inactive players, those pairs are zero and
+never ranked.
+
+    targeting = Targeting.from_snapshot(get_snapshot(world, players))
+    targeting.targets(player, top=5)
+    targeting.partners(player, top=5)
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from civ.engine import AttackResponse
+from civ.helpers import DEFENSE_CULTURE_BONUS, MAX_FORTIFICATION, PLAYER_STATE_KEYS
+
+COLUMNS = PLAYER_STATE_KEYS[1:]
+RESPONSES = tuple(AttackResponse)
+
+AttackOutcome = namedtuple('AttackOutcome', [
+    'success', 'loot', 'land',
+    'attacker_casualties', 'defender_casualties', 'defense_culture',
+])
+
+# Reduction over responses giving the worst case for the attacker, per key
+WORST_CASE = {
+    'success': np.min,
+    'loot': np.min,
+    'land': np.min,
+    'attacker_casualties': np.max,
+    'defender_casualties': np.min,
+    'defense_culture': np.max,
+}
+
+
+def compute_loot(resources, land):
+    """`_computeLoot` of every defender."""
+    return np.where(
+        resources == 0, 0,
+        np.where(resources < land, 1, resources // np.maximum(land, 1)),
+    )
+
+
+def _per_player(values, size):
+    return np.broadcast_to(np.asarray(values, dtype=np.int64), size)
+
+
+class Targeting:
+
+    def __init__(
+        self, players, states, active=None,
+        soldiers=None, defenders=None, fortifications=MAX_FORTIFICATION,
+    ):
+        """
+        `states` holds a `PLAYER_STATE_KEYS` column per key (`current_turn`
+        onwards), one value per player in `players`. `soldiers` (sent by each
+        attacker), `defenders` and `fortifications` (per defender) broadcast
+        against the players and are capped as `World` caps them.
+        """
+        self.players = list(players)
+        self._index = {player: i for i, player in enumerate(self.players)}
+        size = len(self.players)
+        self.columns = {key: np.asarray(states[key], dtype=np.int64) for key in COLUMNS}
+
+        active = np.ones(size, bool) if active is None else np.asarray(active, bool)
+        self.valid = active[:, None] & active[None, :] & ~np.eye(size, dtype=bool)
+
+        self.civilians = np.maximum(self.columns['population'] - self.columns['soldiers'], 0)
+        own_soldiers = self.columns['soldiers']
+        self.soldiers = _per_player(own_soldiers if soldiers is None else soldiers, size)
+        self.defenders = np.minimum(
+            _per_player(own_soldiers if defenders is None else defenders, size), own_soldiers,
+        )
+        self.fortifications = np.minimum(_per_player(fortifications, size), MAX_FORTIFICATION)
+
+        self.attacks = {response: self._attack(response) for response in RESPONSES}
+        self.trade = np.where(self.valid, self.civilians[None, :], 0)
+        self.mutual_trade = np.minimum(self.trade, self.trade.T)
+
+    @classmethod
+    def from_states(cls, states, active=None, **kwargs):
+        """
+        From `PlayerState`s or `parse_player_state` dicts, or a `STATE_DTYPE`
+        array (`civ.state`) whose players are then the raw addresses.
+        """
+        if isinstance(states, np.ndarray):
+            return cls(states['player'].tolist(), states, active, **kwargs)
+        states = [
+            state if isinstance(state, dict) else state.as_dict() for state in states
+        ]
+        columns = {key: [state[key] for state in states] for key in COLUMNS}
+        return cls([state['player'] for state in states], columns, active, **kwargs)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, **kwargs):
+        """From `civ.helpers.get_snapshot`, inactive players left out of every pair."""
+        players = list(snapshot['states'])
+        states = [dict(snapshot['states'][player], player=player) for player in players]
+        active = [snapshot['active'][player] for player in players]
+        return cls.from_states(states, active, **kwargs)
+
+    def _attack(self, response):
+        land = self.columns['land'][None, :]
+        resources = self.columns['resources'][None, :]
+        population = self.columns['population']
+        sent = self.soldiers[:, None]
+        defenders = self.defenders[None, :]
+
+        if response == AttackResponse.RETREAT:
+            battle = False
+            success = np.ones(self.valid.shape, bool)
+        elif response == AttackResponse.FIGHT:
+            battle = True
+            success = sent > defenders
+        else:
+            battle = True
+            fortifications = self.fortifications[None, :]
+            paid = fortifications <= resources
+            resources = resources - np.where(paid, fortifications, 0)
+            success = sent > defenders + np.where(paid, fortifications, 0)
+
+        success = success & self.valid
+        battle = np.broadcast_to(battle, self.valid.shape) & self.valid
+        return AttackOutcome(
+            success=success,
+            loot=np.where(success, compute_loot(resources, land), 0),
+            land=(success & (land > 0)).astype(np.int64),
+            attacker_casualties=np.where(battle, np.minimum(sent, population[:, None]), 0),
+            defender_casualties=np.where(battle, np.minimum(defenders, population[None, :]), 0),
+            defense_culture=np.where(battle & ~success, DEFENSE_CULTURE_BONUS, 0),
+        )
+
+    def index(self, player):
+        return self._index[player]
+
+    def attack_values(self, key='loot', response=None):
+        """
+        N×N `key` of `AttackOutcome`, for one response or, by default, the
+        worst case for the attacker over all of them.
+        """
+        if key not in WORST_CASE:
+            raise ValueError(f"Unknown attack outcome {key!r}")
+        if response is not None:
+            return getattr(self.attacks[AttackResponse(response)], key)
+        return WORST_CASE[key]([getattr(outcome, key) for outcome in self.attacks.values()], axis=0)
+
+    def _ranked(self, values, valid, top):
+        # Best first, ties in player order
+        order = np.lexsort((np.arange(len(values)), -values))
+        order = order[valid[order]]
+        return [(self.players[j], int(values[j])) for j in order[:top]]
+
+    def targets(self, attacker, key='loot', response=None, top=None):
+        """`(defender, value)` for `attacker`, best `key` first."""
+        i = self.index(attacker)
+        return self._ranked(self.attack_values(key, response)[i], self.valid[i], top)
+
+    def best_targets(self, key='loot', response=None):
+        """Each attacker's best defender and its `key`, `(None, 0)` without any."""
+        values = np.where(self.valid, self.attack_values(key, response), -1)
+        best = values.argmax(axis=1)
+        return {
+            player: (self.players[j], int(values[i, j])) if values[i, j] >= 0 else (None, 0)
+            for i, (player, j) in enumerate(zip(self.players, best))
+        }
+
+    def partners(self, player, mutual=False, top=None):
+        """`(partner, value)` for `player`, by their own or the mutual trade gain."""
+        i = self.index(player)
+        values = self.mutual_trade if mutual else self.trade
+        return self._ranked(values[i], self.valid[i], top)
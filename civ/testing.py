@@ -0,0 +1,55 @@
+"""
+Test backend, shared by `tests` and `benchmarks`.
+
+The backend is brownie's (a ganache process) by default or, with
+`CIV_TEST_BACKEND=evm`, the in-process EVM of `civ.evm`. Tests import
+accounts, contracts and helpers from here rather than from brownie, the
+contract fixtures are in the project's root `conftest.py`.
+
+    from civ.testing import World, accounts, reverts
+"""
+import os
+
+CONTRACTS = (
+    'BasicStrategy', 'LegacyWorld', 'PackedWorld',
+    'TestAttackStrategy', 'TestCreateStrategy', 'TestExploreStrategy', 'TestFarmStrategy',
+    'TestMultiActionStrategy', 'TestProduceStrategy', 'TestResearchStrategy',
+    'TestScriptedStrategy', 'TestTradeStrategy',
+    'World', 'WorldHarness',
+)
+
+__all__ = [
+    'BACKEND', 'ZERO_ADDRESS', 'accounts', 'chain', 'given', 'isolation', 'reverts', *CONTRACTS,
+]
+
+BACKEND = os.environ.get('CIV_TEST_BACKEND', 'brownie')
+
+if BACKEND == 'evm':
+    from civ import evm
+    from civ.evm import ZERO_ADDRESS, accounts, chain, given, reverts
+
+    globals().update(evm.connect())
+    isolation = evm.isolation
+else:
+    from brownie import (  # noqa: F401 (contracts, listed in __all__)
+        ZERO_ADDRESS,
+        BasicStrategy,
+        LegacyWorld,
+        PackedWorld,
+        TestAttackStrategy,
+        TestCreateStrategy,
+        TestExploreStrategy,
+        TestFarmStrategy,
+        TestMultiActionStrategy,
+        TestProduceStrategy,
+        TestResearchStrategy,
+        TestScriptedStrategy,
+        TestTradeStrategy,
+        World,
+        WorldHarness,
+        accounts,
+        chain,
+        reverts,
+    )
+    from brownie.test import given
+    isolation = None
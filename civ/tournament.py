@@ -0,0 +1,190 @@
+"""
+Strategy tournaments on the off-chain engine.
+
+Plays every pair of strategies head to head (round-robin) and all of them in
+one game (free-for-all) for a number of turns, spreading games across a
+process pool. The winner of a game is the active player with the most
+culture, ties share the win.
+
+    python -m civ.tournament create farm produce trade --turns 100 --games 20
+
+Strategies are names from `civ.strategies.STRATEGIES` or `module:attr` paths
+to a factory called with the list of opponents, returning an object that
+implements the `IStrategy` callbacks.
+"""
+import argparse
+import importlib
+import itertools
+import os
+import random
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from civ.engine import Revert, World
+from civ.strategies import STRATEGIES
+
+DEFAULT_TURNS = 100
+DEFAULT_GAMES = 10
+CURVE_POINTS = 10
+
+
+def load_strategy(spec):
+    if spec in STRATEGIES:
+        return STRATEGIES[spec]
+    module, _, attr = spec.partition(':')
+    if not attr:
+        raise ValueError(f"Unknown strategy: {spec}")
+    return getattr(importlib.import_module(module), attr)
+
+
+def play_game(specs, turns, seed):
+    """
+    Play one game between `specs` and return, per player slot, the final
+    result and the culture and land after every turn.
+    """
+    rng = random.Random(seed)
+    players = [f"{spec}#{slot}" for slot, spec in enumerate(specs)]
+    world = World()
+    for player, spec in zip(players, specs):
+        opponents = [opponent for opponent in players if opponent != player]
+        rng.shuffle(opponents)
+        world.register_strategy(player, load_strategy(spec)(opponents))
+    world.start_game()
+
+    culture = {player: [] for player in players}
+    land = {player: [] for player in players}
+    order = list(players)
+    for _ in range(turns):
+        rng.shuffle(order)
+        for player in order:
+            if world.is_player_active(player):
+                # Turns stall like on-chain if a resign leaves the round count off
+                try:
+                    world.play_turn(player)
+                except Revert:
+                    pass
+        for player in players:
+            state = world.get_state(player)
+            culture[player].append(state.culture)
+            land[player].append(state.land)
+
+    alive = [player for player in players if world.is_player_active(player)]
+    best = max((world.get_state(player).culture for player in alive), default=None)
+    winners = [player for player in alive if world.get_state(player).culture == best]
+
+    return [
+        {
+            'spec': spec,
+            'win': 1 / len(winners) if player in winners else 0,
+            'alive': player in alive,
+            'culture': culture[player],
+            'land': land[player],
+        }
+        for spec, player in zip(specs, players)
+    ]
+
+
+def _play_game(job):
+    mode, specs, turns, seed = job
+    return mode, play_game(specs, turns, seed)
+
+
+class Results:
+
+    def __init__(self, specs, turns):
+        self.specs = specs
+        self.turns = turns
+        self.games = defaultdict(int)
+        self.wins = defaultdict(float)
+        self.culture = defaultdict(lambda: [0] * turns)
+        self.land = defaultdict(lambda: [0] * turns)
+        self.head_to_head = defaultdict(float)
+        self.pair_games = defaultdict(int)
+
+    def add(self, mode, results):
+        for result in results:
+            spec = result['spec']
+            self.games[spec] += 1
+            self.wins[spec] += result['win']
+            self.culture[spec] = [a + b for a, b in zip(self.culture[spec], result['culture'])]
+            self.land[spec] = [a + b for a, b in zip(self.land[spec], result['land'])]
+
+        if mode == 'round-robin':
+            a, b = results
+            self.head_to_head[a['spec'], b['spec']] += a['win']
+            self.head_to_head[b['spec'], a['spec']] += b['win']
+            self.pair_games[a['spec'], b['spec']] += 1
+            self.pair_games[b['spec'], a['spec']] += 1
+
+    def win_rate(self, spec):
+        return self.wins[spec] / self.games[spec] if self.games[spec] else 0
+
+    def curve(self, key, spec):
+        totals = getattr(self, key)[spec]
+        return [total / self.games[spec] for total in totals] if self.games[spec] else totals
+
+    def print(self):
+        width = max(len(spec) for spec in self.specs) + 2
+        step = max(self.turns // CURVE_POINTS, 1)
+        checkpoints = list(range(step - 1, self.turns, step))
+
+        print("Win rates")
+        for spec in sorted(self.specs, key=self.win_rate, reverse=True):
+            print(f"  {spec:<{width}}{self.win_rate(spec):>7.1%}  ({self.games[spec]} games)")
+
+        for key in ('culture', 'land'):
+            print(f"\nAverage {key} by turn")
+            print(" " * (width + 2) + "".join(f"{turn + 1:>9}" for turn in checkpoints))
+            for spec in self.specs:
+                curve = self.curve(key, spec)
+                print(f"  {spec:<{width}}" + "".join(f"{curve[turn]:>9.1f}" for turn in checkpoints))
+
+        print("\nHead to head (row win rate against column)")
+        print(" " * (width + 2) + "".join(f"{spec:>{width}}" for spec in self.specs))
+        for a in self.specs:
+            row = ""
+            for b in self.specs:
+                games = self.pair_games[a, b]
+                row += f"{self.head_to_head[a, b] / games:>{width}.0%}" if games else f"{'-':>{width}}"
+            print(f"  {a:<{width}}" + row)
+
+
+def run_tournament(specs, turns=DEFAULT_TURNS, games=DEFAULT_GAMES, workers=None, seed=0):
+    specs = list(dict.fromkeys(specs))
+    rng = random.Random(seed)
+    jobs = []
+    for a, b in itertools.combinations(specs, 2):
+        jobs += [('round-robin', (a, b), turns, rng.getrandbits(64)) for _ in range(games)]
+    if len(specs) > 2:
+        jobs += [('free-for-all', tuple(specs), turns, rng.getrandbits(64)) for _ in range(games)]
+
+    # Load every strategy up front so typos fail before the pool starts
+    for spec in specs:
+        load_strategy(spec)
+
+    results = Results(specs, turns)
+    with ProcessPoolExecutor(workers) as pool:
+        chunksize = max(len(jobs) // (4 * (workers or os.cpu_count() or 1)), 1)
+        for mode, game_results in pool.map(_play_game, jobs, chunksize=chunksize):
+            results.add(mode, game_results)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('strategies', nargs='+')
+    parser.add_argument('--turns', type=int, default=DEFAULT_TURNS)
+    parser.add_argument('--games', type=int, default=DEFAULT_GAMES)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = run_tournament(
+        args.strategies, turns=args.turns, games=args.games,
+        workers=args.workers, seed=args.seed,
+    )
+    results.print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Contract fixtures shared by `tests` and `benchmarks`, on the backend chosen
+by `civ.testing`.
+"""
+import pytest
+from hypothesis import HealthCheck, settings
+from civ.testing import (
+    BasicStrategy,
+    PackedWorld,
+    TestAttackStrategy,
+    TestCreateStrategy,
+    TestExploreStrategy,
+    TestFarmStrategy,
+    TestMultiActionStrategy,
+    TestProduceStrategy,
+    TestResearchStrategy,
+    TestScriptedStrategy,
+    TestTradeStrategy,
+    World,
+    WorldHarness,
+    accounts,
+    isolation,
+)
+
+
+# Fixtures are set up once per test, `given` reverts the chain per example.
+# Registered for tests with their own `settings`, not loaded.
+settings.register_profile('civ-evm', suppress_health_check=[HealthCheck.function_scoped_fixture])
+
+
+if isolation is not None:
+    # Every test starts from the same chain
+    @pytest.fixture(autouse=True)
+    def chain_isolation():
+        with isolation():
+            yield
+
+
+@pytest.fixture
+def world():
+    return accounts[0].deploy(World)
+
+@pytest.fixture
+def packed_world():
+    return accounts[0].deploy(PackedWorld)
+
+@pytest.fixture
+def world_harness():
+    return accounts[0].deploy(WorldHarness)
+
+@pytest.fixture
+def basic_strategy():
+    return accounts[0].deploy(BasicStrategy)
+
+@pytest.fixture
+def create_strategy():
+    return accounts[0].deploy(TestCreateStrategy)
+
+@pytest.fixture
+def explore_strategy():
+    return accounts[0].deploy(TestExploreStrategy)
+
+@pytest.fixture
+def produce_strategy():
+    return accounts[0].deploy(TestProduceStrategy)
+
+@pytest.fixture
+def research_strategy():
+    return accounts[0].deploy(TestResearchStrategy)
+
+@pytest.fixture
+def farm_strategy():
+    return accounts[0].deploy(TestFarmStrategy)
+
+@pytest.fixture
+def trade_strategy():
+    return accounts[0].deploy(TestTradeStrategy)
+
+@pytest.fixture
+def attack_strategy():
+    return accounts[0].deploy(TestAttackStrategy)
+
+@pytest.fixture
+def multi_action_strategy():
+    return accounts[0].deploy(TestMultiActionStrategy)
+
+@pytest.fixture
+def scripted_strategy():
+    return accounts[0].deploy(TestScriptedStrategy)
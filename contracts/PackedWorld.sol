@@ -0,0 +1,70 @@
+// SPDX-License-Identifier: MIT OR Apache-2.0
+
+pragma solidity ^0.8.0;
+
+import "./World.sol";
+import "./mixins/Constants.sol";
+
+
+/**
+ * World storing each player's state in two slots instead of nine.
+ *
+ * The external `PlayerState` ABI is unchanged. Values that don't fit their
+ * packed field revert instead of being truncated, including on migration.
+ */
+contract PackedWorld is World {
+
+    struct PackedPlayerState {
+        // Slot 0
+        address player;
+        uint32 currentTurn;
+        uint32 land;
+        uint32 farms;
+
+        // Slot 1
+        uint32 science;
+        uint64 culture;
+        uint32 soldiers;
+        uint32 population;
+        uint64 resources;
+    }
+
+    mapping(address => PackedPlayerState) private _packedStates;
+
+    function _loadState(address player) internal view override returns (PlayerState memory state) {
+        PackedPlayerState memory packed = _packedStates[player];
+        state.player = packed.player;
+        state.currentTurn = packed.currentTurn;
+        state.land = packed.land;
+        state.farms = packed.farms;
+        state.science = packed.science;
+        state.culture = packed.culture;
+        state.soldiers = packed.soldiers;
+        state.population = packed.population;
+        state.resources = packed.resources;
+    }
+
+    function _storeState(address player, PlayerState memory state) internal override {
+        _packedStates[player] = PackedPlayerState(
+            state.player,
+            _toUint32(state.currentTurn),
+            _toUint32(state.land),
+            _toUint32(state.farms),
+            _toUint32(state.science),
+            _toUint64(state.culture),
+            _toUint32(state.soldiers),
+            _toUint32(state.population),
+            _toUint64(state.resources)
+        );
+    }
+
+    function _toUint32(uint value) private pure returns (uint32) {
+        require(value <= type(uint32).max, "Value overflows packed state");
+        return uint32(value);
+    }
+
+    function _toUint64(uint value) private pure returns (uint64) {
+        require(value <= type(uint64).max, "Value overflows packed state");
+        return uint64(value);
+    }
+}
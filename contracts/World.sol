@@ -16,8 +16,7 @@ contract World is IWorld {
     uint public gameStartBlock;
     uint public gameEndBlock;
 
-    uint public numActivePlayers;
-    mapping(address => bool) public isPlayerActive;
+    mapping(address => bool) private _isPlayerActive;
 
     // Turn vars
 
@@ -28,11 +27,26 @@ contract World is IWorld {
     address public _activeStrategy;
     bool public _hasPlayerActed;
 
+    // Lazy migration, packed with the active strategy that every turn reads
+    bool private _migrating;
+    uint64 private _unpulledActivePlayers;
+
     // Player vars
 
-    mapping(address => address) private _playerStrategy;
+    mapping(address => address) internal _playerStrategy;
     mapping(address => PlayerState) private _playerStates;
 
+    // Enumerable registry, indexes are 1-based so 0 means absent
+    address[] private _players;
+    mapping(address => uint) private _playerIndex;
+    address[] private _activePlayers;
+    mapping(address => uint) private _activePlayerIndex;
+
+    // World players are pulled from on first use, see `migrateWorldLazily`
+    World public migrationSource;
+    // Its players pulled here while active there, see `_recountUnpulled`
+    uint64 private _pulledActivePlayers;
+
     // Events
 
     event TurnAction(
@@ -83,7 +97,12 @@ contract World is IWorld {
     }
 
     modifier onlyPlayerActive(address player) {
-        require(isPlayerActive[player], "Player is not active");
+        require(_isPlayerActive[player], "Player is not active");
+        _;
+    }
+
+    modifier pullsPlayer(address player) {
+        _pull(player);
         _;
     }
 
@@ -127,8 +146,51 @@ contract World is IWorld {
     // Game import for bug fixes
 
     function migrateWorld(address _world) external onlyGameMaster onlyGameNotInProgress {
+        _migrateWorld(World(_world));
+    }
+
+    /**
+     * Migrate the game without copying players. `_world` is recorded as the
+     * source and each player is pulled from it on first use here: their turn,
+     * an action targeting them, their own registration, strategy update or
+     * resignation, or `pullPlayers`. Until then views read through to the
+     * source, and `numActivePlayers` counts the source's unpulled active
+     * players. `getPlayers`, `getRegisteredPlayers` and `getPendingPlayers`
+     * only list pulled players.
+     *
+     * The source may keep changing: the unpulled count is its active players
+     * less those pulled while active, recounted on every pull, by
+     * `pullPlayers` (with no players for a recount only) and by
+     * `completeMigration`. Pulled players resigning on the source lower it
+     * too, check `civ.migration.get_unpulled_players` before completing.
+     */
+    function migrateWorldLazily(address _world) external onlyGameMaster onlyGameNotInProgress {
+        require(_players.length == 0, "World already has players");
         World world = World(_world);
 
+        _migrateWorld(world);
+        migrationSource = world;
+        _migrating = true;
+        _unpulledActivePlayers = uint64(world.numActivePlayers());
+    }
+
+    function pullPlayers(address[] calldata players) external onlyGameMaster {
+        for (uint i = 0; i < players.length; i++) {
+            _pull(players[i]);
+        }
+        if (_migrating) _recountUnpulled();
+    }
+
+    // Stop reading through to the source once every active player is pulled
+    function completeMigration() external onlyGameMaster {
+        if (_migrating) _recountUnpulled();
+        require(_unpulledActivePlayers == 0, "Active players left to pull");
+        _migrating = false;
+        migrationSource = World(address(0));
+        _pulledActivePlayers = 0;
+    }
+
+    function _migrateWorld(World world) private {
         gameStartBlock = world.gameStartBlock();
         gameNumber = world.gameNumber();
         currentTurn = world.currentTurn();
@@ -136,22 +198,70 @@ contract World is IWorld {
     }
 
     function migratePlayers(address _world, address[] calldata _players) external onlyGameMaster {
+        _migratePlayers(World(_world), _players);
+    }
+
+    // Migrate a page of the old world's registry, see `getRegisteredPlayers`
+    function migrateRegisteredPlayers(address _world, uint offset, uint limit) external onlyGameMaster {
         World world = World(_world);
+        _migratePlayers(world, world.getRegisteredPlayers(offset, limit));
+    }
 
+    function _migratePlayers(World world, address[] memory _players) private {
         for (uint i = 0; i < _players.length; i++) {
-            address _player = _players[i];
-            _playerStates[_player] = _validateMigratedState(
-                world.getState(_player)
-            );
-            _playerStrategy[_player] = world.getStrategy(_player);
-
-            if (!isPlayerActive[_player] && world.isPlayerActive(_player)) {
-                isPlayerActive[_player] = true;
-                numActivePlayers += 1;
-            }
+            _migratePlayer(world, _players[i], world.getStrategy(_players[i]));
+        }
+    }
+
+    function _migratePlayer(World world, address player, address strategy) private {
+        bool pending = _isPendingPull(player) && address(world) == address(migrationSource);
+
+        _storeState(player, _validateMigratedState(world.getState(player)));
+        _playerStrategy[player] = strategy;
+        _addPlayer(player);
+
+        bool active = world.isPlayerActive(player);
+        if (active) {
+            _activatePlayer(player);
+        }
+        if (pending) {
+            if (active) _pulledActivePlayers += 1;
+            _recountUnpulled();
         }
     }
 
+    // Resigns and registrations on the source since the last pull included
+    function _recountUnpulled() private {
+        uint sourceActive = migrationSource.numActivePlayers();
+        _unpulledActivePlayers = sourceActive > _pulledActivePlayers
+            ? uint64(sourceActive - _pulledActivePlayers)
+            : 0;
+    }
+
+    // Copy `player` from the lazy migration source if it's their first use
+    function _pull(address player) private {
+        if (!_isPendingPull(player)) return;
+
+        World world = migrationSource;
+        address strategy = world.getStrategy(player);
+        // Not a player there either
+        if (strategy == address(0)) return;
+
+        _migratePlayer(world, player, strategy);
+    }
+
+    function _isPendingPull(address player) private view returns (bool) {
+        return _migrating && _playerIndex[player] == 0;
+    }
+
+    // State as it will be once pulled, for views
+    function _viewState(address player) private view returns (PlayerState memory) {
+        if (_isPendingPull(player)) {
+            return _validateMigratedState(migrationSource.getState(player));
+        }
+        return _loadState(player);
+    }
+
     function _validateMigratedState(PlayerState memory state)
         private
         pure
@@ -176,27 +286,24 @@ contract World is IWorld {
         if (gameNumber != world.gameNumber()) return false;
         if (currentTurn != world.currentTurn()) return false;
         if (currentTurnCompleted != world.currentTurnCompleted()) return false;
-        if (numActivePlayers != world.numActivePlayers()) return false;
+        if (numActivePlayers() != world.numActivePlayers()) return false;
         return true;
     }
 
     // Player admin
 
-    function registerStrategy(address strategy) external onlyGameNotInProgress {
+    function registerStrategy(address strategy) external onlyGameNotInProgress pullsPlayer(msg.sender) {
         _playerStrategy[msg.sender] = strategy;
         _initPlayerState(msg.sender);
-
-        if (!isPlayerActive[msg.sender]) {
-            isPlayerActive[msg.sender] = true;
-            numActivePlayers += 1;
-        }
+        _addPlayer(msg.sender);
+        _activatePlayer(msg.sender);
     }
 
-    function updateStrategy(address strategy) onlyPlayerActive(msg.sender) external {
+    function updateStrategy(address strategy) pullsPlayer(msg.sender) onlyPlayerActive(msg.sender) external {
         _playerStrategy[msg.sender] = strategy;
     }
 
-    function resign() external {
+    function resign() external pullsPlayer(msg.sender) {
         _resign(msg.sender, "Player resigned");
     }
 
@@ -206,16 +313,92 @@ contract World is IWorld {
         return gameStartBlock > 0 && gameEndBlock == 0;
     }
 
-    function getStrategy(address player) external view returns(address) {
+    function isPlayerActive(address player) public view returns (bool) {
+        if (_isPendingPull(player)) return migrationSource.isPlayerActive(player);
+        return _isPlayerActive[player];
+    }
+
+    function numActivePlayers() public view returns (uint) {
+        return _activePlayers.length + _unpulledActivePlayers;
+    }
+
+    function numRegisteredPlayers() external view returns (uint) {
+        return _players.length;
+    }
+
+    // Active players, reordered whenever a player resigns
+    function getPlayers(uint offset, uint limit) external view returns (address[] memory) {
+        return _page(_activePlayers, offset, limit);
+    }
+
+    // Every player who ever registered, in registration order
+    function getRegisteredPlayers(uint offset, uint limit) external view returns (address[] memory) {
+        return _page(_players, offset, limit);
+    }
+
+    // Active players who haven't played `turn` yet
+    function getPendingPlayers(uint turn) external view returns (address[] memory pending) {
+        address[] memory candidates = new address[](_activePlayers.length);
+        uint count;
+
+        for (uint i = 0; i < _activePlayers.length; i++) {
+            address player = _activePlayers[i];
+            if (_loadState(player).currentTurn < turn) {
+                candidates[count] = player;
+                count++;
+            }
+        }
+
+        pending = new address[](count);
+        for (uint i = 0; i < count; i++) {
+            pending[i] = candidates[i];
+        }
+    }
+
+    function getStrategy(address player) public view returns(address) {
+        if (_isPendingPull(player)) return migrationSource.getStrategy(player);
         return _playerStrategy[player];
     }
 
     function getState(address player) public view returns(PlayerState memory) {
-        return _playerStates[player];
+        return _viewState(player);
+    }
+
+    function getStates(address[] calldata players)
+        public
+        view
+        returns (PlayerState[] memory states, bool[] memory active, address[] memory strategies)
+    {
+        states = new PlayerState[](players.length);
+        active = new bool[](players.length);
+        strategies = new address[](players.length);
+
+        for (uint i = 0; i < players.length; i++) {
+            address player = players[i];
+            states[i] = _viewState(player);
+            active[i] = isPlayerActive(player);
+            strategies[i] = getStrategy(player);
+        }
+    }
+
+    // Turn progress and player states in a single call
+    function getSnapshot(address[] calldata players)
+        external
+        view
+        returns (
+            uint turn,
+            uint turnCompleted,
+            PlayerState[] memory states,
+            bool[] memory active,
+            address[] memory strategies
+        )
+    {
+        (states, active, strategies) = getStates(players);
+        return (currentTurn, currentTurnCompleted, states, active, strategies);
     }
 
     function getCivilianPopulation(address player) external view returns(uint) {
-        return _getCivilianPopulation(_playerStates[player]);
+        return _getCivilianPopulation(_viewState(player));
     }
 
     function getNextScienceCost(PlayerState memory state) external returns(uint) {
@@ -224,24 +407,76 @@ contract World is IWorld {
 
     // Game mechanics
 
-    function playTurn(address player) external onlyGameMaster onlyPlayerActive(player) {
-        PlayerState storage state = _playerStates[player];
+    function playTurn(address player)
+        external
+        onlyGameMaster
+        pullsPlayer(player)
+        onlyPlayerActive(player)
+    {
+        PlayerState memory state = _loadState(player);
         require(state.currentTurn < currentTurn, "Player already played this turn");
 
+        _playTurn(player, state);
+        _finishPlayerTurn();
+
+        // Progress turn
+        _progressTurn();
+    }
+
+    /**
+     * Play many turns in one transaction, skipping inactive players and
+     * players who already played this turn. Returns how many turns were played.
+     *
+     * The turn counters are kept in memory and `currentTurnCompleted` is only
+     * written at the end, so strategies read a stale value mid-batch;
+     * `currentTurn` is written as soon as a round completes. The active
+     * player context stays in storage because strategies call back into the
+     * world in their own call frames.
+     */
+    function playTurns(address[] calldata players) external onlyGameMaster returns (uint played) {
+        uint turn = currentTurn;
+        uint turnCompleted = currentTurnCompleted;
+
+        for (uint i = 0; i < players.length; i++) {
+            address player = players[i];
+            _pull(player);
+            if (!_isPlayerActive[player]) continue;
+
+            PlayerState memory state = _loadState(player);
+            if (state.currentTurn >= turn) continue;
+
+            // Context is overwritten by the next player, only the flag needs a reset
+            _hasPlayerActed = false;
+            _playTurn(player, state);
+            played++;
+
+            // Attacks can remove players mid-batch, compare with the live count
+            turnCompleted += 1;
+            if (turnCompleted == numActivePlayers()) {
+                turn += 1;
+                turnCompleted = 0;
+                currentTurn = turn;
+            }
+        }
+
+        _finishPlayerTurn();
+        currentTurnCompleted = turnCompleted;
+    }
+
+    function _playTurn(address player, PlayerState memory state) private {
         _initPlayerTurn(player, state);
         try IStrategy(_playerStrategy[player]).handleTurn{
             gas: HANDLE_TURN_GAS_LIMIT
         }(state) {} catch {}
-        _finishPlayerTurn();
+
+        // Reload, the strategy's action has changed state
+        state = _loadState(player);
 
         emit TurnSummary(
             player, gameNumber, currentTurn,
             state.land, state.farms, state.science, state.culture, state.soldiers,
             state.population, state.resources
         );
-
-        // Progress turn
-        _progressTurn();
     }
 
 
@@ -249,27 +484,31 @@ contract World is IWorld {
 
     // Increment territory by 1
     function explore() external onlyActiveStrategy onlyPlayerNotActed {
-        _playerStates[_activePlayer].land += 1;
+        PlayerState memory state = _loadState(_activePlayer);
+        state.land += 1;
+        _storeState(_activePlayer, state);
         _markPlayerActed();
         emit TurnAction(_activePlayer, gameNumber, currentTurn, "explore", address(0), 0);
     }
 
     // Increment science level by x, where resource cost is 1 x level
     function research() onlyActiveStrategy onlyPlayerNotActed external {
-        PlayerState storage state = _playerStates[_activePlayer];
+        PlayerState memory state = _loadState(_activePlayer);
         uint cost = _computeNextScienceCost(state);
 
         if (_payResources(state, cost)) {
             state.science += 1;
         }
+        _storeState(_activePlayer, state);
         _markPlayerActed();
         emit TurnAction(_activePlayer, gameNumber, currentTurn, "research", address(0), 0);
     }
 
     // Produce additional resources for the turn using population
     function produce() external onlyActiveStrategy onlyPlayerNotActed {
-        PlayerState storage state = _playerStates[_activePlayer];
+        PlayerState memory state = _loadState(_activePlayer);
         state.resources += _getCivilianPopulation(state);
+        _storeState(_activePlayer, state);
         _markPlayerActed();
         emit TurnAction(_activePlayer, gameNumber, currentTurn, "produce", address(0), 0);
     }
@@ -277,32 +516,35 @@ contract World is IWorld {
     // Convert land into farms for food production
     // Cost is 10 resource per farm
     function farm(uint farms) external onlyActiveStrategy onlyPlayerNotActed {
-        PlayerState storage state = _playerStates[_activePlayer];
+        PlayerState memory state = _loadState(_activePlayer);
         uint newFarms = _validateFarms(state, farms);
 
         if (_payResources(state, newFarms * 10)) {
             state.farms += newFarms;
         }
+        _storeState(_activePlayer, state);
         _markPlayerActed();
         emit TurnAction(_activePlayer, gameNumber, currentTurn, "farm", address(0), farms);
     }
 
     // +1 to culture for each civilian population
     function create() external onlyActiveStrategy onlyPlayerNotActed {
-        PlayerState storage state = _playerStates[_activePlayer];
+        PlayerState memory state = _loadState(_activePlayer);
         state.culture += _getCivilianPopulation(state);
+        _storeState(_activePlayer, state);
         _markPlayerActed();
         emit TurnAction(_activePlayer, gameNumber, currentTurn, "create", address(0), 0);
     }
 
     // Pay resource and trade population for soldier
     function train(uint soldiers) external onlyActiveStrategy onlyPlayerNotActed {
-        PlayerState storage state = _playerStates[_activePlayer];
+        PlayerState memory state = _loadState(_activePlayer);
         uint newSoldiers = _validateTrain(state, soldiers);
 
         if (_payResources(state, newSoldiers)) {
             state.soldiers += newSoldiers;
         }
+        _storeState(_activePlayer, state);
         _markPlayerActed();
         emit TurnAction(_activePlayer, gameNumber, currentTurn, "train", address(0), soldiers);
     }
@@ -315,18 +557,23 @@ contract World is IWorld {
      * If they agree, each side effectively calls `produce` and `create`
      * using the other's civilian populations.
      */
-    function trade(address partner) external onlyActiveStrategy onlyPlayerNotActed {
-        PlayerState storage proposerState = _playerStates[_activePlayer];
-        PlayerState storage receiverState = _playerStates[partner];
-
+    function trade(address partner)
+        external
+        onlyActiveStrategy
+        onlyPlayerNotActed
+        pullsPlayer(partner)
+    {
         bool approve;
         try IStrategy(_playerStrategy[partner]).handleTrade{
             gas: HANDLE_TRADE_GAS_LIMIT
-        }(proposerState, receiverState) returns (bool _approve) {
+        }(_loadState(_activePlayer), _loadState(partner)) returns (bool _approve) {
             approve = _approve;
         } catch {}
 
         if (approve) {
+            PlayerState memory proposerState = _loadState(_activePlayer);
+            PlayerState memory receiverState = _loadCounterpartyState(partner, proposerState);
+
             uint proposerCivilians = _getCivilianPopulation(proposerState);
             uint receiverCivilians = _getCivilianPopulation(receiverState);
 
@@ -335,6 +582,9 @@ contract World is IWorld {
 
             receiverState.resources += proposerCivilians;
             receiverState.culture += proposerCivilians;
+
+            _storeState(_activePlayer, proposerState);
+            _storeState(partner, receiverState);
         }
         _markPlayerActed();
         emit TurnAction(_activePlayer, gameNumber, currentTurn, "trade", partner, 0);
@@ -353,10 +603,12 @@ contract World is IWorld {
      * Both sides loses soldiers unless there's a retreat
      * Player is disqualified if territory drops below 0
      */
-    function attack(address target, uint soldiers) external onlyActiveStrategy onlyPlayerNotActed {
-        PlayerState storage attackerState = _playerStates[_activePlayer];
-        PlayerState storage defenderState = _playerStates[target];
-
+    function attack(address target, uint soldiers)
+        external
+        onlyActiveStrategy
+        onlyPlayerNotActed
+        pullsPlayer(target)
+    {
         // Init vars
         AttackResponse resp;
         uint defenders;
@@ -368,13 +620,16 @@ contract World is IWorld {
         try IStrategy(_playerStrategy[target]).handleAttack{
             gas: HANDLE_ATTACK_GAS_LIMIT
         }(
-            attackerState, defenderState, soldiers
+            _loadState(_activePlayer), _loadState(target), soldiers
         ) returns (AttackResponse _resp, uint _defenders, uint _fortification) {
             resp = _resp;
             defenders = _defenders;
             fortification = _fortification;
         } catch {}
 
+        PlayerState memory attackerState = _loadState(_activePlayer);
+        PlayerState memory defenderState = _loadCounterpartyState(target, attackerState);
+
         // Validate attack response
         (resp, defenders, fortification) = _validateAttackResponse(
             defenderState, resp, defenders, fortification
@@ -419,16 +674,38 @@ contract World is IWorld {
         }
 
         // Clean up, check for defeat
+        _storeState(_activePlayer, attackerState);
+        _storeState(target, defenderState);
         _markPlayerActed();
         _processDefeatConditions(attackerState);
         _processDefeatConditions(defenderState);
         emit TurnAction(_activePlayer, gameNumber, currentTurn, "attack", target, soldiers);
     }
 
+    // Player state storage, override for a different storage layout
+
+    function _loadState(address player) internal view virtual returns (PlayerState memory) {
+        return _playerStates[player];
+    }
+
+    function _storeState(address player, PlayerState memory state) internal virtual {
+        _playerStates[player] = state;
+    }
+
+    // Trades and attacks can target the active player, share the same copy then
+    function _loadCounterpartyState(address player, PlayerState memory activeState)
+        private
+        view
+        returns (PlayerState memory)
+    {
+        if (player == _activePlayer) return activeState;
+        return _loadState(player);
+    }
+
     // General internal turn functions
 
-    function _initPlayerState(address player) private returns (PlayerState storage) {
-        PlayerState storage state = _playerStates[player];
+    function _initPlayerState(address player) private {
+        PlayerState memory state;
         state.player = player;
         state.currentTurn = 0;
 
@@ -441,14 +718,15 @@ contract World is IWorld {
         state.science = 1;
         state.culture = 0;
 
-        return state;
+        _storeState(player, state);
     }
 
-    function _initPlayerTurn(address player, PlayerState storage state) private {
+    function _initPlayerTurn(address player, PlayerState memory state) private {
         state.currentTurn += 1;
         _activePlayer = player;
         _activeStrategy = _playerStrategy[player];
-        _updateProduction();
+        _updateProduction(state);
+        _storeState(player, state);
     }
 
     function _finishPlayerTurn() private {
@@ -460,7 +738,7 @@ contract World is IWorld {
     function _progressTurn() private {
         currentTurnCompleted += 1;
 
-        if (currentTurnCompleted == numActivePlayers) {
+        if (currentTurnCompleted == numActivePlayers()) {
             currentTurn += 1;
             currentTurnCompleted = 0;
         }
@@ -470,7 +748,7 @@ contract World is IWorld {
         _hasPlayerActed = true;
     }
 
-    function _payResources(PlayerState storage state, uint cost) private returns (bool success) {
+    function _payResources(PlayerState memory state, uint cost) private returns (bool success) {
         if (cost <= state.resources) {
             state.resources -= cost;
             success = true;
@@ -529,7 +807,7 @@ contract World is IWorld {
         }
     }
 
-    function _takeLoot(PlayerState storage attackerState, PlayerState storage defenderState) private {
+    function _takeLoot(PlayerState memory attackerState, PlayerState memory defenderState) private {
         uint loot = _computeLoot(defenderState);
 
         if (loot > defenderState.resources) {
@@ -540,7 +818,7 @@ contract World is IWorld {
         }
     }
 
-    function _takeLand(PlayerState storage attackerState, PlayerState storage defenderState) private {
+    function _takeLand(PlayerState memory attackerState, PlayerState memory defenderState) private {
         if (defenderState.land > 0) {
             attackerState.land += 1;
 
@@ -551,7 +829,7 @@ contract World is IWorld {
         }
     }
 
-    function _takeCasualties(PlayerState storage state, uint soldiers) private {
+    function _takeCasualties(PlayerState memory state, uint soldiers) private {
         // Remove from soldiers
         if (soldiers >= state.soldiers) {
             state.soldiers = 0;
@@ -577,13 +855,62 @@ contract World is IWorld {
 
 
     function _resign(address player, string memory reason) private {
-        if (isPlayerActive[player]) {
-            isPlayerActive[player] = false;
-            numActivePlayers -= 1;
+        if (_isPlayerActive[player]) {
+            _deactivatePlayer(player);
             emit Resign(player, gameNumber, currentTurn, reason);
         }
     }
 
+    // Player registry
+
+    function _addPlayer(address player) internal {
+        if (_playerIndex[player] == 0) {
+            _players.push(player);
+            _playerIndex[player] = _players.length;
+        }
+    }
+
+    function _activatePlayer(address player) internal {
+        if (!_isPlayerActive[player]) {
+            _isPlayerActive[player] = true;
+            _activePlayers.push(player);
+            _activePlayerIndex[player] = _activePlayers.length;
+        }
+    }
+
+    // Swap and pop, moving the last active player into the freed slot
+    function _deactivatePlayer(address player) private {
+        _isPlayerActive[player] = false;
+
+        uint index = _activePlayerIndex[player];
+        uint lastIndex = _activePlayers.length;
+        if (index != lastIndex) {
+            address lastPlayer = _activePlayers[lastIndex - 1];
+            _activePlayers[index - 1] = lastPlayer;
+            _activePlayerIndex[lastPlayer] = index;
+        }
+        _activePlayers.pop();
+        delete _activePlayerIndex[player];
+    }
+
+    function _page(address[] storage players, uint offset, uint limit)
+        private
+        view
+        returns (address[] memory page)
+    {
+        if (offset >= players.length) return page;
+
+        uint end = players.length;
+        if (limit < end - offset) {
+            end = offset + limit;
+        }
+
+        page = new address[](end - offset);
+        for (uint i = offset; i < end; i++) {
+            page[i - offset] = players[i];
+        }
+    }
+
     // Internal production functions
 
     function _getCivilianPopulation(PlayerState memory state) private view returns (uint) {
@@ -598,8 +925,7 @@ contract World is IWorld {
         return state.land - state.farms;
     }
 
-    function _updateProduction() private {
-        PlayerState storage state = _playerStates[_activePlayer];
+    function _updateProduction(PlayerState memory state) private {
         _updatePopulation(state);
         _updateResources(state);
     }
@@ -610,7 +936,7 @@ contract World is IWorld {
      * Population grows by 10% as long as there's more food than population
      * Population cannot grow beyond 10 * science
      */
-    function _updatePopulation(PlayerState storage state) private {
+    function _updatePopulation(PlayerState memory state) private {
         uint food = state.farms * FOOD_PER_FARM;
 
         // There's sufficient food,  try to grow
@@ -625,7 +951,7 @@ contract World is IWorld {
     }
 
     // Each unfarmed land produces 1 resource per turn
-    function _updateResources(PlayerState storage state) private {
+    function _updateResources(PlayerState memory state) private {
         state.resources += _getUnfarmedLand(state);
     }
 
@@ -0,0 +1,85 @@
+// SPDX-License-Identifier: MIT OR Apache-2.0
+
+pragma solidity ^0.8.0;
+
+import "../mixins/Constants.sol";
+import "./BasicStrategy.sol";
+
+/**
+ * Plays whatever it's told, for differential tests against `civ.engine`.
+ *
+ * Scripts are set for every player at once so a test round needs a single
+ * setter transaction. Action codes follow the `TURN_ACTIONS` order in
+ * `civ.helpers`, 0 does nothing. Attack responses are raw `uint8`s returned
+ * as is, so out of range ones exercise `World`'s failure to decode them.
+ */
+contract TestScriptedStrategy is BasicStrategy {
+
+    struct Script {
+        uint8 action;
+        address target;
+        uint param;
+        uint8 response;
+        uint defenders;
+        uint fortifications;
+        bool approveTrades;
+    }
+
+    mapping(address => Script) public scripts;
+
+    // Public setter for testing purposes, sets scripts for any players
+    function setScripts(address[] calldata players, Script[] calldata _scripts) public {
+        require(players.length == _scripts.length, "Length mismatch");
+        for (uint i = 0; i < players.length; i++) {
+            scripts[players[i]] = _scripts[i];
+        }
+    }
+
+    function handleTurn(PlayerState calldata state) external override {
+        IWorld world = IWorld(msg.sender);
+        Script memory script = scripts[state.player];
+
+        if (script.action == 1) {
+            world.explore();
+        } else if (script.action == 2) {
+            world.research();
+        } else if (script.action == 3) {
+            world.produce();
+        } else if (script.action == 4) {
+            world.farm(script.param);
+        } else if (script.action == 5) {
+            world.create();
+        } else if (script.action == 6) {
+            world.train(script.param);
+        } else if (script.action == 7) {
+            world.trade(script.target);
+        } else if (script.action == 8) {
+            world.attack(script.target, script.param);
+        }
+    }
+
+    function handleTrade(
+        PlayerState calldata requesterState,
+        PlayerState calldata selfState
+    ) external override returns (bool approve) {
+        approve = scripts[selfState.player].approveTrades;
+    }
+
+    function handleAttack(
+        PlayerState calldata attackerState,
+        PlayerState calldata selfState,
+        uint attackers
+    ) external override returns (AttackResponse, uint, uint) {
+        Script memory script = scripts[selfState.player];
+        uint response = script.response;
+        uint defenders = script.defenders;
+        uint fortifications = script.fortifications;
+        // Encoded by hand, the ABI encoder would reject an out of range enum
+        assembly {
+            mstore(0, response)
+            mstore(32, defenders)
+            mstore(64, fortifications)
+            return(0, 96)
+        }
+    }
+}
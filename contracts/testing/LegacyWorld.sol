@@ -0,0 +1,53 @@
+// SPDX-License-Identifier: MIT OR Apache-2.0
+
+pragma solidity ^0.8.0;
+
+import "../World.sol";
+import "../mixins/Constants.sol";
+
+
+/**
+ * Test-only stand-in for a world deployed before the player registry: it
+ * forwards the views migrations read to `world`, and has no `getPlayers`,
+ * `getRegisteredPlayers` or `getStates`. Never deploy.
+ */
+contract LegacyWorld {
+
+    World public world;
+
+    constructor(address _world) {
+        world = World(_world);
+    }
+
+    function gameStartBlock() external view returns (uint) {
+        return world.gameStartBlock();
+    }
+
+    function gameNumber() external view returns (uint) {
+        return world.gameNumber();
+    }
+
+    function currentTurn() external view returns (uint) {
+        return world.currentTurn();
+    }
+
+    function currentTurnCompleted() external view returns (uint) {
+        return world.currentTurnCompleted();
+    }
+
+    function numActivePlayers() external view returns (uint) {
+        return world.numActivePlayers();
+    }
+
+    function isPlayerActive(address player) external view returns (bool) {
+        return world.isPlayerActive(player);
+    }
+
+    function getStrategy(address player) external view returns (address) {
+        return world.getStrategy(player);
+    }
+
+    function getState(address player) external view returns (PlayerState memory) {
+        return world.getState(player);
+    }
+}
@@ -0,0 +1,27 @@
+// SPDX-License-Identifier: MIT OR Apache-2.0
+
+pragma solidity ^0.8.0;
+
+import "../World.sol";
+import "../mixins/Constants.sol";
+
+
+/**
+ * Test-only World that lets game masters write state directly, so tests can
+ * start from a scenario instead of playing turns to reach it. Never deploy.
+ */
+contract WorldHarness is World {
+
+    // Overwrite a player's state, registering and activating them if needed
+    function seedState(address strategy, PlayerState calldata state) external onlyGameMaster {
+        _playerStrategy[state.player] = strategy;
+        _storeState(state.player, state);
+        _addPlayer(state.player);
+        _activatePlayer(state.player);
+    }
+
+    function seedTurn(uint turn, uint turnCompleted) external onlyGameMaster {
+        currentTurn = turn;
+        currentTurnCompleted = turnCompleted;
+    }
+}
@@ -13,11 +13,27 @@ interface IWorld {
     // Gameplay functions
     function startGame() external;
     function playTurn(address player) external;
+    function playTurns(address[] calldata players) external returns (uint played);
     function endGame() external;
 
     // Views
+    function numActivePlayers() external view returns(uint);
+    function numRegisteredPlayers() external view returns(uint);
+    function getPlayers(uint offset, uint limit) external view returns(address[] memory);
+    function getRegisteredPlayers(uint offset, uint limit) external view returns(address[] memory);
+    function getPendingPlayers(uint turn) external view returns(address[] memory);
     function getStrategy(address player) external view returns(address);
     function getState(address player) external view returns(PlayerState memory);
+    function getStates(address[] calldata players) external view returns(
+        PlayerState[] memory states, bool[] memory active, address[] memory strategies
+    );
+    function getSnapshot(address[] calldata players) external view returns(
+        uint turn,
+        uint turnCompleted,
+        PlayerState[] memory states,
+        bool[] memory active,
+        address[] memory strategies
+    );
     function getCivilianPopulation(address player) external view returns(uint);
     function getNextScienceCost(PlayerState memory state) external returns(uint);
 
@@ -0,0 +1,23 @@
+import logging
+
+from brownie import World, accounts
+from civ.daemon import DEFAULT_POLL_INTERVAL, TurnDaemon
+from civ.metadata import WORLDS
+from civ.runner import DEFAULT_WINDOW
+
+
+def main(poll_interval=DEFAULT_POLL_INTERVAL, window=DEFAULT_WINDOW):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    account = accounts.load("1")
+    world = World.at(WORLDS[-1])
+    print("Game master daemon for World:", world.address)
+
+    # Players come from the world's registry
+    daemon = TurnDaemon(
+        world, account, None,
+        window=int(window), poll_interval=float(poll_interval),
+    )
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        daemon.stop()
@@ -1,13 +1,27 @@
 from brownie import World, accounts
 from civ.metadata import PLAYERS, WORLDS
+from civ.migration import MIGRATION_BATCH_SIZE, verify_migration
 
 
-def main():
+def main(lazy=False, batch_size=MIGRATION_BATCH_SIZE):
+    """
+    Migrate the last world from the one before. Lazily, players are pulled
+    from the old world as they play; otherwise they're copied now,
+    `batch_size` per transaction so each fits in a block.
+    """
     accounts.load("1")
     players = list(PLAYERS.values())
 
     old_world = World.at(WORLDS[-2])
     new_world = World.at(WORLDS[-1])
 
-    new_world.migrateWorld(old_world.address, { 'from': accounts[0] })
-    new_world.migratePlayers(old_world.address, players, { 'from': accounts[0] })
+    if lazy:
+        new_world.migrateWorldLazily(old_world.address, { 'from': accounts[0] })
+    else:
+        new_world.migrateWorld(old_world.address, { 'from': accounts[0] })
+        for i in range(0, len(players), batch_size):
+            new_world.migratePlayers(
+                old_world.address, players[i:i + batch_size], { 'from': accounts[0] }
+            )
+
+    verify_migration(new_world, old_world, players).print()
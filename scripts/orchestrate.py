@@ -0,0 +1,31 @@
+import asyncio
+
+from brownie import World, accounts
+from civ.orchestrator import Orchestrator, load_config
+
+
+def main(config='worlds.json', command='status', rounds=1):
+    """
+    Run a game master command on every world in `config`, e.g.
+    `brownie run orchestrate main worlds.json play_round 3`
+    """
+    account = accounts.load("1")
+    orchestrator = Orchestrator.from_config(load_config(config), account, World)
+    try:
+        if command == 'play_round':
+            results = asyncio.run(orchestrator.play(int(rounds)))
+        else:
+            results = asyncio.run(orchestrator.run(command))
+    finally:
+        orchestrator.close()
+
+    for name, result in results.items():
+        if isinstance(result, Exception):
+            print(f"{name}: failed -> {result!r}")
+        elif isinstance(result, list):
+            for report in result:
+                print(f"{name}: {report}")
+                for player, reason in report.failed.items():
+                    print(f"  Failed: {player} -> {reason}")
+        else:
+            print(f"{name}: {result}")
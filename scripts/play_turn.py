@@ -2,28 +2,45 @@ import random
 
 from brownie import World, accounts
 from civ.metadata import PLAYERS, WORLDS
+from civ.metrics import TurnMetrics
+from civ.runner import DEFAULT_WINDOW, TurnRunner
 
 
-def main():
+def main(window=DEFAULT_WINDOW, metrics_path=None, trace=False, batch_size=1):
+    """
+    With `metrics_path`, writes turn metrics to `<metrics_path>.prom` and
+    appends them to `<metrics_path>.jsonl`. `trace` also measures strategy gas.
+    `batch_size` plays that many players per `playTurns` transaction (metrics
+    are only recorded for single turns).
+    """
     account = accounts.load("1")
     world = World.at(WORLDS[-1])
     print("Playing in World:", world.address)
-    turn = world.currentTurn()
 
     players = list(PLAYERS.values())
     random.shuffle(players)
 
-    for player in players:
-        if world.isPlayerActive(player):
-            print("Active:", player)
+    metrics = TurnMetrics(trace=trace in (True, 'true', '1')) if metrics_path else None
+    runner = TurnRunner(
+        world, accounts[0], window=int(window), metrics=metrics, batch_size=int(batch_size),
+    )
+    report, pending = runner.read_round(players)
+    print("Turn:", report.turn)
+    for player in report.inactive:
+        print("Not active:", player)
+    for player in report.skipped:
+        print("Already played this turn, skipping:", player)
 
-            state = world.getState(player)
-            _turn = state[1]
+    print("> Playing turn for", len(pending), "players...")
+    runner.play(pending, report)
 
-            if _turn < turn:
-                print("> Playing turn...")
-                tx = world.playTurn(player, { 'from': accounts[0] })
-            else:
-                print("> Already played this turn, skipping")
-        else:
-            print("Not active:", player)
+    print("Played:", len(report.played))
+    for player, reason in report.failed.items():
+        print("Failed:", player, "->", reason)
+
+    if metrics:
+        for record in metrics.records:
+            if record['no_action']:
+                print("No action:", record['player'], "(strategy failed or did nothing)")
+        metrics.write_prometheus(f"{metrics_path}.prom")
+        metrics.write_jsonl(f"{metrics_path}.jsonl")
@@ -0,0 +1,53 @@
+from brownie import TestScriptedStrategy, WorldHarness, accounts, project
+from civ.helpers import TURN_ACTIONS, seed_state, seed_turn
+from civ.profiler import Profile, sample_states
+
+TRADE = TURN_ACTIONS.index('trade')
+ATTACK = TURN_ACTIONS.index('attack')
+
+
+def main(strategy='TestFarmStrategy', samples=50, seed=0):
+    """
+    Profile a strategy's gas over sampled states, e.g.
+    `brownie run profile_strategy main TestAttackStrategy 100`
+
+    Every callback is measured inside `World.playTurn`, with the gas limit
+    and calldata `World` gives it: `handleTurn` on the player's own turn,
+    `handleTrade` and `handleAttack` on a scripted opponent's turn trading
+    with or attacking the player with all its soldiers.
+    """
+    samples, seed = int(samples), int(seed)
+    game_master, player, opponent = accounts[0:3]
+    container = getattr(project.get_loaded_projects()[0], strategy)
+    strategy = container.deploy({ 'from': game_master })
+    scripted = TestScriptedStrategy.deploy({ 'from': game_master })
+    world = WorldHarness.deploy({ 'from': game_master })
+    print("Profiling", container._name, "over", samples, "states")
+
+    profile = Profile()
+    states = sample_states(samples, seed)
+    opponent_states = sample_states(samples, seed + 1)
+
+    for state, opponent_state in zip(states, opponent_states):
+        turn = max(state['current_turn'], opponent_state['current_turn']) + 1
+        tx = play(world, game_master, player, strategy, state, opponent, scripted, opponent_state, turn)
+        profile.add('handleTurn', tx.trace, strategy, state)
+
+        for callback, action, param in (
+            ('handleTrade', TRADE, 0),
+            ('handleAttack', ATTACK, opponent_state['soldiers']),
+        ):
+            script = (action, player, param, 0, 0, 0, False)
+            scripted.setScripts([opponent], [script], { 'from': game_master })
+            tx = play(world, game_master, opponent, scripted, opponent_state, player, strategy, state, turn)
+            profile.add(callback, tx.trace, strategy, (state, opponent_state))
+
+    profile.print()
+
+
+def play(world, game_master, player, strategy, state, opponent, opponent_strategy, opponent_state, turn):
+    # Seed both players so actions against the opponent resolve, then play
+    seed_state(world, player, strategy, **state)
+    seed_state(world, opponent, opponent_strategy, **opponent_state)
+    seed_turn(world, turn)
+    return world.playTurn(player, { 'from': game_master })
@@ -1,14 +1,12 @@
-import random
-
-from brownie import World, accounts
-from civ.helpers import PLAYER_STATE_KEYS, parse_player_state
+from brownie import World
+from civ.helpers import get_states
 from civ.metadata import PLAYERS, WORLDS
 
 
 def main():
     world = World.at(WORLDS[-1])
-    for player, wallet in PLAYERS.items():
-        state = world.getState(wallet)
+    states, _, _ = get_states(world, PLAYERS.values())
+    for player, state in zip(PLAYERS, states):
         print(player, "->")
-        print(parse_player_state(state))
+        print(state)
         print("\n")
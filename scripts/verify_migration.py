@@ -0,0 +1,9 @@
+from brownie import World
+from civ.metadata import PLAYERS, WORLDS
+from civ.migration import verify_migration
+
+
+def main():
+    old_world = World.at(WORLDS[-2])
+    new_world = World.at(WORLDS[-1])
+    verify_migration(new_world, old_world, list(PLAYERS.values())).print()
@@ -4,3 +4,5 @@ ERROR_GAME_NOT_IN_PROGRESS = "Game not in progress"
 ERROR_PLAYER_NOT_ACTIVE = "Player is not active"
 ERROR_ONLY_PLAYER_NOT_ACTED = "Player already acted this turn"
 ERROR_ONLY_ACTIVE_STRATEGY = "Can only be called by active strategy"
+ERROR_WORLD_HAS_PLAYERS = "World already has players"
+ERROR_PLAYERS_LEFT_TO_PULL = "Active players left to pull"
@@ -1,7 +1,7 @@
 import math
 
 import pytest
-from brownie import accounts, reverts
+from civ.testing import accounts, reverts
 from civ.helpers import *
 from errors import *
 
@@ -0,0 +1,59 @@
+import random
+
+import numpy as np
+from civ import engine
+from civ.batch import *
+
+# Batch simulator tests, checked against the reference engine
+
+class ScriptStrategy:
+    # Plays a fixed list of (action, param) moves
+    def __init__(self, moves):
+        self.moves = moves
+
+    def handle_turn(self, world, state):
+        action, param = self.moves[state.current_turn - 1]
+        if action == EXPLORE: world.explore()
+        elif action == RESEARCH: world.research()
+        elif action == PRODUCE: world.produce()
+        elif action == FARM: world.farm(param)
+        elif action == CREATE: world.create()
+        elif action == TRAIN: world.train(param)
+
+def test_batch_matches_engine():
+    rng = random.Random(0)
+    games, players, turns = 4, 3, 30
+    actions = np.array([
+        [[rng.choice(DOMESTIC_ACTIONS) for _ in range(players)] for _ in range(games)]
+        for _ in range(turns)
+    ])
+    params = np.array([
+        [[rng.randrange(8) for _ in range(players)] for _ in range(games)]
+        for _ in range(turns)
+    ])
+
+    batch = BatchWorld(games, players)
+    for turn in range(turns):
+        batch.step(actions[turn], params[turn])
+
+    for game in range(games):
+        world = engine.World()
+        for player in range(players):
+            moves = list(zip(actions[:, game, player], params[:, game, player]))
+            world.register_strategy(player, ScriptStrategy(moves))
+        world.start_game()
+        for turn in range(turns):
+            for player in range(players):
+                world.play_turn(player)
+
+        for player in range(players):
+            state = world.get_state(player)
+            for key in COLUMNS:
+                assert getattr(batch, key)[game, player] == getattr(state, key)
+
+def test_batch_skips_inactive_players():
+    batch = BatchWorld(2, 2)
+    batch.active[1, 1] = False
+    batch.step(CREATE)
+    assert batch.culture.tolist() == [[10, 10], [10, 0]]
+    assert batch.resources[1, 1] == 50
@@ -0,0 +1,99 @@
+from civ.testing import accounts, chain
+from civ.cache import CachedWorld
+from civ.helpers import *
+
+# Block-scoped view cache
+
+def test_cache_block_scoped(world, create_strategy):
+    players = accounts[1:3]
+    for player in players:
+        world.registerStrategy(create_strategy, { 'from': player })
+    world.startGame()
+
+    cached = CachedWorld(world, block_interval=0)
+    assert cached.getState(players[0]) == world.getState(players[0])
+    assert cached.getState(str(players[0]).lower()) == world.getState(players[0])
+    assert cached.currentTurnCompleted() == 0
+    assert (cached.hits, cached.misses) == (1, 2)
+
+    # A new block drops the cache, transactions go through
+    cached.playTurn(players[0])
+    assert cached.block == chain.height
+    assert len(cached) == 0
+    assert parse_player_state(cached.getState(players[0]))['culture'] == INITIAL_POP
+    assert cached.currentTurnCompleted() == 1
+    assert cached.misses == 4
+
+    # Mined around the wrapper
+    world.playTurn(players[1])
+    assert cached.currentTurn() == 2
+    assert cached.getStrategy(players[1]) == create_strategy
+
+def test_cache_block_interval(world, create_strategy):
+    player = accounts[1]
+    world.registerStrategy(create_strategy, { 'from': player })
+    world.startGame()
+
+    # Views stay at the block read until the interval passes
+    cached = CachedWorld(world, block_interval=3600)
+    before = cached.getState(player)
+    world.playTurn(player)
+    assert cached.getState(player) == before
+    cached.refresh()
+    assert cached.getState(player) == world.getState(player)
+
+def test_cache_lru(world):
+    cached = CachedWorld(world, maxsize=2, block_interval=3600)
+    for player in accounts[1:4]:
+        cached.isPlayerActive(player)
+    assert len(cached) == 2
+    cached.isPlayerActive(accounts[3])
+    assert cached.hits == 1
+    cached.isPlayerActive(accounts[1])
+    assert cached.misses == 4
+
+def test_cache_events(world, create_strategy, attack_strategy):
+    player, defender, rando = accounts[1:4]
+    world.registerStrategy(attack_strategy, { 'from': player })
+    world.registerStrategy(create_strategy, { 'from': defender })
+    world.registerStrategy(create_strategy, { 'from': rando })
+    attack_strategy.setAttackTarget(defender, { 'from': player })
+    world.startGame()
+
+    cached = CachedWorld(world, block_interval=0, events=True)
+    players = (player, defender, rando)
+    for p in players:
+        cached.getState(p)
+    assert cached.misses == 3
+
+    # Attacker and defender are refreshed, the third player is still cached
+    world.playTurn(player)
+    for p in players:
+        assert cached.getState(p) == world.getState(p)
+    assert (cached.hits, cached.misses) == (1, 5)
+
+    # Registrations emit no events, the wrapper clears on them
+    world.endGame()
+    cached.isPlayerActive(accounts[4])
+    cached.registerStrategy(create_strategy, { 'from': accounts[4] })
+    assert cached.isPlayerActive(accounts[4])
+
+def test_cache_reorg(world, create_strategy):
+    players = accounts[1:3]
+    for player in players:
+        world.registerStrategy(create_strategy, { 'from': player })
+    world.startGame()
+    chain.snapshot()
+
+    cached = CachedWorld(world, block_interval=0, events=True)
+    world.playTurn(players[0])
+    played = cached.getState(players[0])
+    assert cached.block == chain.height
+
+    # The turn is reorged out for blocks naming another player, at a greater height
+    chain.revert()
+    world.playTurn(players[1])
+    chain.mine()
+    assert cached.getState(players[0]) != played
+    assert cached.getState(players[0]) == world.getState(players[0])
+    assert cached.block == chain.height
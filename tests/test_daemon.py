@@ -0,0 +1,55 @@
+from civ.testing import accounts
+from civ.daemon import TurnDaemon
+from civ.helpers import *
+
+# Resident game master
+
+def test_daemon_plays_due_players(world, create_strategy):
+    players = accounts[1:4]
+    for player in players:
+        world.registerStrategy(create_strategy, { 'from': player })
+
+    daemon = TurnDaemon(world, accounts[0], players, window=2)
+
+    # Nothing to do before the game starts
+    assert daemon.tick() is None
+    world.startGame()
+
+    # One player already played, only the others are due
+    world.playTurn(players[0])
+    report = daemon.tick()
+    assert sorted(report.played) == sorted(players[1:])
+    assert report.skipped == [players[0]]
+    assert world.currentTurn() == 2
+
+    # Each round is due as soon as the previous one completes
+    report = daemon.tick()
+    assert report.turn == 2
+    assert sorted(report.played) == sorted(players)
+    assert daemon.tick().turn == 3
+    assert world.currentTurn() == 4
+
+    for player in players:
+        assert_player_state(world, player, 'culture', INITIAL_POP * (world.currentTurn() - 1))
+
+def test_daemon_skips_inactive(world, create_strategy):
+    players = accounts[1:4]
+    for player in players:
+        world.registerStrategy(create_strategy, { 'from': player })
+    world.startGame()
+    world.resign({ 'from': players[2] })
+
+    daemon = TurnDaemon(world, accounts[0], players, shuffle=False)
+    daemon.run(max_ticks=1)
+    assert world.currentTurn() == 2
+    assert_player_state(world, players[2], 'current_turn', 0)
+
+def test_daemon_reads_registry(world, create_strategy):
+    players = accounts[1:4]
+    for player in players:
+        world.registerStrategy(create_strategy, { 'from': player })
+    world.startGame()
+
+    daemon = TurnDaemon(world, accounts[0], None)
+    assert sorted(daemon.tick().played) == sorted(players)
+    assert world.currentTurn() == 2
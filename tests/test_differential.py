@@ -0,0 +1,113 @@
+import os
+
+from civ.testing import ZERO_ADDRESS, accounts, given, reverts
+from hypothesis import settings, strategies as st
+from civ.engine import Revert, World as Engine
+from civ.helpers import *
+from civ.strategies import Script, ScriptedStrategy
+
+# Differential fuzzing: random scripted games must play out identically on
+# `World.sol` and `civ.engine`. Spread examples across processes with
+#   brownie test tests/test_differential.py -n auto
+# and raise FUZZ_EXAMPLES for longer runs.
+
+NUM_PLAYERS = 4
+MAX_ROUNDS = 8
+FUZZ_EXAMPLES = int(os.environ.get('FUZZ_EXAMPLES', 50))
+
+# Targets are player indexes, NUM_PLAYERS targets the zero address. Values
+# go past the valid ranges so validation and failing actions are covered,
+# attack responses over all of uint8 so undecodable ones revert the attack.
+scripts = st.builds(
+    Script,
+    action=st.integers(0, len(TURN_ACTIONS) - 1),
+    target=st.integers(0, NUM_PLAYERS),
+    param=st.integers(0, 30),
+    response=st.one_of(st.integers(0, 2), st.integers(0, 255)),
+    defenders=st.integers(0, 30),
+    fortifications=st.integers(0, 2 * MAX_FORTIFICATION),
+    approve_trades=st.booleans(),
+)
+# Scripts per player, the turn order, and whether the round is one playTurns
+rounds = st.lists(
+    st.tuples(
+        st.lists(scripts, min_size=NUM_PLAYERS, max_size=NUM_PLAYERS),
+        st.permutations(range(NUM_PLAYERS)),
+        st.booleans(),
+    ),
+    min_size=1,
+    max_size=MAX_ROUNDS,
+)
+
+def resolve_target(players, script):
+    target = players[script.target] if script.target < len(players) else ZERO_ADDRESS
+    return script._replace(target=str(target))
+
+def summary(events):
+    return [dict(args) for name, args in events if name == 'TurnSummary']
+
+def assert_events(tx, events):
+    summaries = tx.events['TurnSummary'] if 'TurnSummary' in tx.events else []
+    assert [dict(event) for event in summaries] == summary(events)
+    resigns = tx.events['Resign'] if 'Resign' in tx.events else []
+    assert [dict(event) for event in resigns] == [
+        args for name, args in events if name == 'Resign'
+    ]
+
+@given(rounds=rounds)
+@settings(settings.get_profile('civ-evm'), max_examples=FUZZ_EXAMPLES, deadline=None)
+def test_world_matches_engine(world, scripted_strategy, rounds):
+    players = accounts[1:NUM_PLAYERS + 1]
+    engine = Engine(record_events=True)
+    engine_strategies = {}
+
+    for player in players:
+        world.registerStrategy(scripted_strategy, { 'from': player })
+        engine_strategies[player] = ScriptedStrategy()
+        engine.register_strategy(str(player), engine_strategies[player])
+    world.startGame()
+    engine.start_game()
+
+    for round_scripts, order, batched in rounds:
+        round_scripts = [resolve_target(players, script) for script in round_scripts]
+
+        # One transaction sets every player's script for the round
+        scripted_strategy.setScripts(players, round_scripts)
+        for player, script in zip(players, round_scripts):
+            engine_strategies[player].script = script
+
+        if batched:
+            # Inactive players are skipped, as are those who already played
+            batch = [players[i] for i in order]
+            num_events = len(engine.events)
+            played = engine.play_turns([str(player) for player in batch])
+            tx = world.playTurns(batch)
+            assert tx.return_value == played
+            assert_events(tx, engine.events[num_events:])
+            continue
+
+        for i in order:
+            player = players[i]
+            assert world.isPlayerActive(player) == engine.is_player_active(str(player))
+            if not engine.is_player_active(str(player)):
+                continue
+
+            num_events = len(engine.events)
+            try:
+                engine.play_turn(str(player))
+            except Revert as exc:
+                with reverts(str(exc)):
+                    world.playTurn(player)
+                continue
+
+            tx = world.playTurn(player)
+            assert_events(tx, engine.events[num_events:])
+
+    # Everything else ends up in the same place too
+    assert world.currentTurn() == engine.current_turn
+    assert world.currentTurnCompleted() == engine.current_turn_completed
+    assert world.numActivePlayers() == engine.num_active_players
+    states, active, _ = get_states(world, players)
+    for player, state, is_active in zip(players, states, active):
+        assert state == engine.get_state(str(player)).as_dict()
+        assert is_active == engine.is_player_active(str(player))
@@ -0,0 +1,161 @@
+import pytest
+from civ.engine import AttackResponse, Revert, World
+from civ.helpers import *
+from civ.strategies import *
+
+# Off-chain engine tests, mirroring the World.sol gameplay tests
+
+@pytest.fixture
+def engine():
+    return World(record_events=True)
+
+def last_event(engine, name):
+    return [args for _name, args in engine.events if _name == name][-1]
+
+def test_engine_turn_progression(engine):
+    player, partner = 'player', 'partner'
+    engine.register_strategy(player, CreateStrategy())
+    engine.register_strategy(partner, CreateStrategy())
+    engine.start_game()
+
+    for turn in range(1, 11):
+        engine.play_turn(player)
+        assert engine.current_turn == turn
+        engine.play_turn(partner)
+        assert engine.current_turn == turn + 1
+        assert engine.get_state(player).current_turn == turn
+        assert engine.get_state(player).culture == 10 * turn
+
+    with pytest.raises(Revert, match="Player is not active"):
+        engine.play_turn('rando')
+
+def test_engine_prevents_multiple_actions(engine):
+    player = 'player'
+    engine.register_strategy(player, MultiActionStrategy())
+    engine.start_game()
+
+    engine.play_turn(player)
+    assert engine.get_state(player).culture == 0
+    assert engine.get_state(player).resources == INITIAL_RESOURCES + INITIAL_LAND
+    assert [name for name, _ in engine.events] == ['TurnSummary']
+
+def test_engine_farm(engine):
+    player = 'player'
+    engine.register_strategy(player, FarmStrategy())
+    engine.start_game()
+
+    engine.play_turn(player)
+    assert engine.get_state(player).farms == 4
+    engine.play_turn(player)
+    assert engine.get_state(player).resources == INITIAL_LAND + 11 + INITIAL_POP
+    engine.play_turn(player)
+    assert engine.get_state(player).science == 2
+
+    population = INITIAL_POP
+    for turn in range(4, 13):
+        engine.play_turn(player)
+        population += 1
+        assert last_event(engine, 'TurnSummary')['population'] == population
+
+def test_engine_trade_approved(engine):
+    player, partner = 'player', 'partner'
+    engine.register_strategy(player, TradeStrategy(partner))
+    engine.register_strategy(partner, TradeStrategy(player))
+    engine.start_game()
+
+    engine.play_turn(player)
+    assert last_event(engine, 'TurnAction')['opponent'] == partner
+    assert engine.get_state(player).resources == INITIAL_RESOURCES + INITIAL_POP + INITIAL_LAND
+    assert engine.get_state(partner).resources == INITIAL_RESOURCES + INITIAL_POP
+    assert engine.get_state(partner).culture == INITIAL_POP
+
+def test_engine_attack_fight_win(engine):
+    player, defender = 'player', 'defender'
+    attack_strategy = AttackStrategy(train_target=5)
+    defense_strategy = AttackStrategy(train_target=1)
+    engine.register_strategy(player, attack_strategy)
+    engine.register_strategy(defender, defense_strategy)
+    engine.start_game()
+    engine.play_turn(player)
+    engine.play_turn(defender)
+
+    attack_strategy.target = defender
+    defense_strategy.set_attack_response(AttackResponse.FIGHT, 1, 0)
+    engine.play_turn(player)
+
+    state = engine.get_state(player)
+    assert state.land == INITIAL_LAND + 1
+    assert state.resources == INITIAL_RESOURCES + (INITIAL_LAND * 2) - 5 + compute_loot()
+    assert (state.soldiers, state.population) == (0, 5)
+    state = engine.get_state(defender)
+    assert state.land == INITIAL_LAND - 1
+    assert (state.soldiers, state.population) == (0, 9)
+
+def test_engine_undecodable_response(engine):
+    player, defender, trader, partner = 'player', 'defender', 'trader', 'partner'
+    attack_strategy = AttackStrategy(train_target=5)
+    defense_strategy = AttackStrategy(train_target=1)
+    partner_strategy = TradeStrategy(trader)
+    engine.register_strategy(player, attack_strategy)
+    engine.register_strategy(defender, defense_strategy)
+    engine.register_strategy(trader, TradeStrategy(partner))
+    engine.register_strategy(partner, partner_strategy)
+    engine.start_game()
+    for p in (player, defender, trader, partner):
+        engine.play_turn(p)
+    num_events = len(engine.events)
+    culture = engine.get_state(partner).culture
+
+    # An out of range response reverts the attack, the turn still counts
+    attack_strategy.target = defender
+    defense_strategy.set_attack_response(3, 0, 0)
+    before = engine.get_state(player)
+    engine.play_turn(player)
+    state = engine.get_state(player)
+    assert state.current_turn == 2
+    assert (state.land, state.soldiers) == (before.land, before.soldiers)
+    assert engine.get_state(defender).land == INITIAL_LAND
+
+    # As does a trade answer that isn't a bool
+    partner_strategy.handle_trade = lambda requester_state, self_state: 2
+    engine.play_turn(trader)
+    assert engine.get_state(partner).culture == culture
+    assert [name for name, _ in engine.events[num_events:]] == ['TurnSummary', 'TurnSummary']
+
+def test_engine_defeat_no_land(engine):
+    player, defender = 'player', 'defender'
+    attack_strategy = AttackStrategy(train_target=5)
+    engine.register_strategy(player, attack_strategy)
+    engine.register_strategy(defender, AttackStrategy())
+    engine.start_game()
+    engine.play_turn(player)
+    engine.play_turn(defender)
+
+    attack_strategy.target = defender
+    for x in range(5):
+        engine.play_turn(player)
+        if engine.is_player_active(defender):
+            engine.play_turn(defender)
+
+    assert last_event(engine, 'Resign')['reason'] == RESIGN_MESSAGE_LAND
+    assert engine.num_active_players == 1
+    assert not engine.is_player_active(defender)
+
+def test_engine_play_turns(engine):
+    players = ['a', 'b', 'c']
+    for player in players:
+        engine.register_strategy(player, CreateStrategy())
+    engine.start_game()
+    engine.play_turn('b')
+    engine.resign('c')
+
+    # Inactive players are skipped, rounds roll over mid-batch
+    assert engine.play_turns(['a', 'b', 'c', 'a', 'rando']) == 3
+    assert engine.current_turn == 3
+    assert engine.current_turn_completed == 0
+    assert engine.get_state('a').current_turn == 2
+    assert engine.get_state('c').current_turn == 0
+
+    # Players who already played this turn are skipped
+    assert engine.play_turns(['b', 'b']) == 1
+    assert engine.current_turn_completed == 1
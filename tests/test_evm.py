@@ -0,0 +1,128 @@
+import json
+import pytest
+from hypothesis import strategies as st
+from civ import evm
+from civ.evm import *
+from civ.helpers import PLAYER_STATE_KEYS
+
+# In-process EVM backend: ABI values without a chain, then built contracts on it
+
+PLAYER = '0x' + '01' * 20
+STATE_ABI = {
+    'name': 'state', 'type': 'tuple',
+    'components': [
+        {'name': 'player', 'type': 'address'},
+        *({'name': key, 'type': 'uint256'} for key in PLAYER_STATE_KEYS[1:]),
+    ],
+}
+STATES_ABI = [
+    dict(STATE_ABI, name='states', type='tuple[]'),
+    {'name': 'active', 'type': 'bool[]'},
+    {'name': 'strategies', 'type': 'address[]'},
+]
+
+def test_address():
+    address = Address(PLAYER)
+    assert address == PLAYER.upper().replace('0X', '0x')
+    assert address != '0x' + '02' * 20
+    assert address in {Address(PLAYER)}
+    assert Account(PLAYER) == address and address == Account(PLAYER)
+    assert Account(PLAYER) in {str(address)}
+
+def test_encode_decode():
+    state = (PLAYER, 1, 5, 0, 1, 10, 0, 10, 50)
+    data = encode_args(STATES_ABI, [[state], [True], [Account(PLAYER)]])
+    states, active, strategies = decode_outputs(STATES_ABI, data)
+    assert states == [state]
+    assert states[0]['culture'] == 10
+    assert states[0].dict()['player'] == Account(PLAYER)
+    assert active == [True] and strategies == [PLAYER]
+
+    # One output is returned as is, structs by field name too
+    named = dict(zip(PLAYER_STATE_KEYS, state))
+    assert decode_outputs([STATE_ABI], encode_args([STATE_ABI], [named])) == state
+    assert decode_outputs([], b'') is None
+
+    with pytest.raises(TypeError):
+        encode_args(STATES_ABI, [[state]])
+
+def test_reverts():
+    with reverts("Not a player"):
+        raise VirtualMachineError("Not a player")
+    with reverts():
+        raise VirtualMachineError()
+    with pytest.raises(AssertionError):
+        with reverts("Not a player"):
+            raise VirtualMachineError("Game not in progress")
+    with pytest.raises(AssertionError):
+        with reverts():
+            pass
+
+@pytest.fixture
+def built(tmp_path):
+    """`Math` and `Revert` containers from web3's compiled test contracts."""
+    from brownie import network
+    if evm._tester is None and network.is_connected():
+        pytest.skip("brownie's network is in use")
+
+    sources = 'web3._utils.contract_sources.contract_data'
+    math_contract = pytest.importorskip(f'{sources}.math_contract')
+    revert_contract = pytest.importorskip(f'{sources}.revert_contract')
+    for name, data in (
+        ('Math', math_contract.MATH_CONTRACT_DATA),
+        ('Revert', revert_contract.REVERT_CONTRACT_DATA),
+    ):
+        build = {'contractName': name, 'abi': data['abi'], 'bytecode': data['bytecode']}
+        (tmp_path / f'{name}.json').write_text(json.dumps(build))
+    containers = connect(tmp_path)
+    with isolation():
+        yield containers
+
+@pytest.fixture
+def math(built):
+    return accounts[0].deploy(built['Math'])
+
+def test_deploy(built):
+    from brownie import web3
+
+    math = accounts[0].deploy(built['Math'])
+    assert math.tx.status == Status.Confirmed
+    assert built['Math'][-1] == math
+    assert built['Math'].at(math.address).counter() == 0
+    assert web3.eth.block_number == chain.height == math.tx.block_number
+
+    tx = math.incrementCounter(5, { 'from': accounts[1] })
+    assert tx.return_value == 5 and tx.gas_used > 0
+    assert tx.events['Increased'][0]['value'] == 5
+    assert tx.events['Increased'][0].address == math
+    assert math.counter() == 5
+    assert math.counter(block_identifier=tx.block_number - 1) == 0
+    assert [event.args['value'] for event in math.events.get_sequence(0, event_type='Increased')] == [5]
+
+def test_built_reverts(built):
+    contract = accounts[0].deploy(built['Revert'])
+    assert contract.normalFunction()
+    with reverts("Function has been reverted."):
+        contract.revertWithMessage()
+    with reverts():
+        contract.revertWithoutMessage()
+
+def test_isolation(math):
+    height = chain.height
+    with isolation():
+        math.incrementCounter(3)
+        assert math.counter() == 3
+    assert math.counter() == 0
+    assert chain.height == height
+
+    chain.snapshot()
+    math.incrementCounter(4)
+    chain.revert()
+    assert math.counter() == 0
+
+@given(value=st.integers(min_value=1, max_value=100))
+def test_given(math, value):
+    # Every example starts from the chain the fixtures left
+    assert math.counter() == 0
+    math.incrementCounter(value)
+    assert math.counter() == value
@@ -1,6 +1,6 @@
 import pytest
 
-from brownie import accounts, reverts
+from civ.testing import accounts, reverts
 from errors import *
 
 # Game master role
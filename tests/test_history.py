@@ -0,0 +1,88 @@
+import sqlite3
+
+import numpy as np
+import pytest
+from civ.engine import World
+from civ.helpers import *
+from civ.history import replay, rows_from_events, rows_from_index, write_history
+from civ.strategies import CreateStrategy, FarmStrategy, TradeStrategy
+
+# Columnar game history
+
+@pytest.fixture
+def engine():
+    engine = World(record_events=True)
+    engine.register_strategy('farmer', FarmStrategy())
+    engine.register_strategy('creator', CreateStrategy())
+    engine.register_strategy('trader', TradeStrategy('creator'))
+    engine.start_game()
+    for turn in range(10):
+        for player in ('farmer', 'creator', 'trader'):
+            if engine.is_player_active(player):
+                engine.play_turn(player)
+    return engine
+
+def test_history_from_engine(engine, tmp_path):
+    history = write_history(tmp_path, rows_from_events(engine.events))
+    assert isinstance(history['culture'], np.memmap)
+    assert len(history) == 30
+    assert history.games() == [1]
+
+    # Columns match the events row for row
+    summaries = [args for name, args in engine.events if name == 'TurnSummary']
+    for i, summary in enumerate(summaries):
+        assert history.players[history['player'][i]] == summary['player']
+        assert history['turn'][i] == summary['turn']
+        assert history['culture'][i] == summary['culture']
+
+    rows = history.turn_slice(1, 1)
+    assert rows == slice(0, 3)
+    assert TURN_ACTIONS[history['action'][0]] == 'farm'
+    assert history['param'][0] == 4
+    assert TURN_ACTIONS[history['action'][2]] == 'trade'
+    assert history.players[history['opponent'][2]] == 'creator'
+    assert history['opponent'][0] == -1
+
+    turns, science = history.column_by_turn('science', 'farmer', 1)
+    assert turns.tolist() == list(range(1, 11))
+    assert science[-1] == engine.get_state('farmer').science
+
+def test_history_replay(engine, tmp_path, capsys):
+    history = write_history(tmp_path, rows_from_events(engine.events))
+    turns = [(game, turn, len(rows['player'])) for game, turn, rows in history.replay()]
+    assert turns == [(1, turn, 3) for turn in range(1, 11)]
+    assert list(history.replay(game=2)) == []
+
+    replay(tmp_path, player='trader')
+    out = capsys.readouterr().out
+    assert out.count("Game 1, turn") == 10
+    assert out.count("trader trade creator") == 10
+    assert "farmer" not in out
+
+def test_history_from_index(tmp_path):
+    # Minimal indexer tables with one played turn
+    db_path = str(tmp_path / 'index.db')
+    db = sqlite3.connect(db_path)
+    db.executescript("""
+        CREATE TABLE turn_actions (
+            block, log_index, tx, player, game, turn, action, opponent, param
+        );
+        CREATE TABLE turn_summaries (
+            block, log_index, tx, player, game, turn,
+            land, farms, science, culture, soldiers, population, resources
+        );
+    """)
+    db.execute(
+        "INSERT INTO turn_actions VALUES (1, 0, '0x01', '0xaa', 1, 1, 'create', ?, 0)",
+        ('0x' + '0' * 40,),
+    )
+    db.execute("INSERT INTO turn_summaries VALUES (1, 1, '0x01', '0xaa', 1, 1, 5, 0, 1, 10, 0, 10, 55)")
+    db.execute("INSERT INTO turn_summaries VALUES (2, 0, '0x02', '0xbb', 1, 1, 5, 0, 1, 0, 0, 10, 55)")
+    db.commit()
+    db.close()
+
+    history = write_history(tmp_path / 'history', rows_from_index(db_path))
+    assert history.players == ['0xaa', '0xbb']
+    assert [TURN_ACTIONS[code] for code in history['action']] == ['create', '']
+    assert history['opponent'].tolist() == [-1, -1]
+    assert history['resources'].tolist() == [55, 55]
@@ -0,0 +1,65 @@
+from civ.testing import accounts, chain
+from civ.helpers import *
+from civ.indexer import Indexer
+
+# Event indexer
+
+def test_indexer_player_states(world, create_strategy):
+    players = accounts[1:4]
+    for player in players:
+        world.registerStrategy(create_strategy, { 'from': player })
+    world.startGame()
+
+    indexer = Indexer(world, ':memory:')
+    for turn in range(1, 4):
+        for player in players:
+            world.playTurn(player)
+        indexer.sync()
+
+        for player in players:
+            state = indexer.get_state_at(player, 1, turn)
+            assert state == parse_player_state(world.getState(player))
+
+    # Earlier turns stay queryable, actions are indexed per turn
+    assert indexer.get_state_at(players[0], 1, 1)['culture'] == INITIAL_POP
+    assert len(indexer.get_actions(1, turn=2)) == len(players)
+
+    # Nothing new to index
+    assert indexer.sync() == 0
+
+def test_indexer_attacks(world, attack_strategy):
+    player, defender = accounts[1:3]
+    world.registerStrategy(attack_strategy, { 'from': player })
+    world.registerStrategy(attack_strategy, { 'from': defender })
+    world.startGame()
+
+    attack_strategy.setAttackTarget(defender, { 'from': player })
+    for x in range(5):
+        world.playTurn(player)
+        if world.isPlayerActive(defender):
+            world.playTurn(defender)
+
+    indexer = Indexer(world, ':memory:')
+    indexer.sync()
+    assert len(indexer.get_attacks_on(defender, 1)) == 5
+    assert indexer.get_attacks_on(player, 1) == []
+    assert indexer.get_resigns(1)[0]['reason'] == RESIGN_MESSAGE_LAND
+
+def test_indexer_reorg(world, create_strategy, explore_strategy):
+    player = accounts[1]
+    world.registerStrategy(create_strategy, { 'from': player })
+    world.startGame()
+
+    indexer = Indexer(world, ':memory:')
+    chain.snapshot()
+    world.playTurn(player)
+    indexer.sync()
+    assert indexer.get_state_at(player, 1, 1)['culture'] == INITIAL_POP
+
+    # Replace the indexed block with one where the player explores
+    chain.revert()
+    world.updateStrategy(explore_strategy, { 'from': player })
+    world.playTurn(player)
+    indexer.sync()
+    assert indexer.get_state_at(player, 1, 1)['culture'] == 0
+    assert indexer.get_actions(1, turn=1)[0]['action'] == 'explore'
@@ -0,0 +1,179 @@
+import sqlite3
+
+import pytest
+from civ.engine import World
+from civ.indexer import SCHEMA
+from civ.leaderboard import Leaderboard
+from civ.strategies import CreateStrategy, FarmStrategy, ProduceStrategy, TradeStrategy
+
+# Incremental leaderboard
+
+PLAYERS = ('farmer', 'creator', 'trader', 'producer')
+
+def summary(player, turn, game=1, **values):
+    return ('TurnSummary', {
+        'player': player, 'game': game, 'turn': turn,
+        'land': 5, 'farms': 0, 'science': 1, 'culture': 0,
+        'soldiers': 0, 'population': 10, 'resources': 50,
+        **values,
+    })
+
+def rankings(states, metric):
+    # What the scoreboard used to compute from every player's state
+    return sorted(
+        ((state.player, getattr(state, metric)) for state in states),
+        key=lambda item: (-item[1], item[0]),
+    )
+
+@pytest.fixture
+def engine():
+    engine = World(record_events=True)
+    engine.register_strategy('farmer', FarmStrategy())
+    engine.register_strategy('creator', CreateStrategy())
+    engine.register_strategy('trader', TradeStrategy('creator'))
+    engine.register_strategy('producer', ProduceStrategy())
+    engine.start_game()
+    return engine
+
+def test_leaderboard_matches_states(engine):
+    board = Leaderboard()
+    for turn in range(20):
+        # Standings as of each player's last turn
+        states = {}
+        for player in PLAYERS:
+            start = len(engine.events)
+            engine.play_turn(player)
+            board.apply_events(engine.events[start:])
+            states[player] = engine.get_state(player)
+
+        for metric in board.metrics:
+            assert board.top(metric, len(PLAYERS)) == rankings(states.values(), metric)
+            assert board.top(metric, 2) == rankings(states.values(), metric)[:2]
+    assert board.turn == 20
+
+    # The creator accepted a trade after their turn, only seen on their next one
+    assert board.values['creator']['culture'] < engine.get_state('creator').culture
+
+def test_leaderboard_ranks():
+    board = Leaderboard()
+    board.apply_events([
+        summary('a', 1, culture=10, land=3),
+        summary('b', 1, culture=30, land=3),
+        summary('c', 1, culture=10, land=7),
+    ])
+    assert board.top('culture') == [('b', 30), ('a', 10), ('c', 10)]
+    assert board.top('culture', 1, offset=1) == [('a', 10)]
+    assert [board.rank(player, 'culture') for player in 'abc'] == [2, 1, 2]
+    assert [board.rank(player, 'land') for player in 'abc'] == [2, 2, 1]
+    assert board.rank('d', 'culture') is None
+
+    # A new summary moves the player
+    board.apply(*summary('a', 1, culture=40))
+    assert board.top('culture') == [('a', 40), ('b', 30), ('c', 10)]
+    assert len(board) == 3
+
+    # Resigned players leave the rankings
+    board.apply('Resign', {'player': 'b', 'game': 1, 'turn': 1, 'reason': ''})
+    assert board.top('culture') == [('a', 40), ('c', 10)]
+    assert 'b' not in board
+    assert board.rank('c', 'culture') == 2
+
+    # Other events and older games are ignored
+    assert not board.apply('TurnAction', {'player': 'a', 'game': 1, 'turn': 1})
+    assert not board.apply(*summary('b', 1, game=0, culture=100))
+    assert 'b' not in board
+
+    # A newer game starts over
+    board.apply(*summary('b', 1, game=2, culture=1))
+    assert board.standings() == {
+        'game': 2, 'turn': 1, 'players': 1,
+        'culture': [('b', 1)], 'land': [('b', 5)],
+        'population': [('b', 10)], 'resources': [('b', 50)],
+    }
+
+def test_leaderboard_rank_history():
+    board = Leaderboard(metrics=['culture'])
+    board.apply_events([
+        summary('a', 1, culture=10),
+        summary('b', 1, culture=5),
+        summary('a', 2, culture=10),
+        summary('b', 2, culture=20),
+        summary('a', 3, culture=30),
+        summary('b', 3, culture=25),
+        summary('a', 4, culture=40),
+    ])
+    assert board.rank_history('a', 'culture') == [(1, 1), (2, 2), (3, 1)]
+    assert board.rank_history('b', 'culture') == [(1, 2), (2, 1), (3, 2)]
+    assert [board.rank_at('a', 'culture', turn) for turn in range(5)] == [None, 1, 2, 1, 1]
+
+    # The current turn as it stands, closed on the next turn
+    board.apply(*summary('b', 4, culture=50))
+    assert board.rank_history('b', 'culture') == [(1, 2), (2, 1), (3, 2), (4, 1)]
+    board.apply(*summary('a', 5, culture=60))
+    assert board.rank_history('a', 'culture') == [(1, 1), (2, 2), (3, 1), (4, 2), (5, 1)]
+
+def index_db():
+    db = sqlite3.connect(':memory:')
+    db.executescript(SCHEMA)
+    return db
+
+def insert_summary(db, block, log_index, player, turn, culture):
+    db.execute(
+        "INSERT INTO turn_summaries VALUES (?, ?, '0x', ?, 1, ?, 5, 0, 1, ?, 0, 10, 55)",
+        (block, log_index, player, turn, culture),
+    )
+
+def insert_block(db, number, block_hash):
+    db.execute("INSERT OR REPLACE INTO blocks VALUES (?, ?)", (number, block_hash))
+    db.execute("INSERT OR REPLACE INTO meta VALUES ('block', ?)", (str(number),))
+
+def test_leaderboard_from_index():
+    db = index_db()
+    insert_summary(db, 1, 0, '0xaa', 1, 10)
+    insert_summary(db, 1, 1, '0xbb', 1, 20)
+
+    board = Leaderboard()
+    assert board.sync_index(db) == 2
+    assert board.top('culture') == [('0xbb', 20), ('0xaa', 10)]
+    assert board.cursor == (1, 1)
+
+    # Only new rows are read
+    insert_summary(db, 2, 0, '0xaa', 2, 30)
+    db.execute("INSERT INTO resigns VALUES (2, 1, '0x02', '0xaa', 1, 2, 'Population has gone to 0')")
+    assert board.sync_index(db) == 2
+    assert board.top('culture') == [('0xbb', 20)]
+    assert board.rank_history('0xaa', 'culture') == [(1, 2)]
+    assert board.sync_index(db) == 0
+
+def test_leaderboard_index_reorg():
+    db = index_db()
+    insert_summary(db, 1, 0, '0xaa', 1, 10)
+    insert_summary(db, 1, 1, '0xbb', 1, 20)
+    insert_block(db, 1, '0x01')
+    db.execute("INSERT INTO resigns VALUES (2, 0, '0x02', '0xaa', 1, 2, 'Population has gone to 0')")
+    insert_block(db, 2, '0x02')
+
+    board = Leaderboard()
+    board.sync_index(db)
+    assert board.top('culture') == [('0xbb', 20)]
+
+    # The indexer drops block 2, the resign is undone before it indexes again
+    db.execute("DELETE FROM resigns WHERE block >= 2")
+    db.execute("DELETE FROM blocks WHERE number >= 2")
+    db.execute("UPDATE meta SET value = '1' WHERE key = 'block'")
+    assert board.sync_index(db) == 2
+    assert board.top('culture') == [('0xbb', 20), ('0xaa', 10)]
+
+    # Its replacement has another summary instead
+    insert_summary(db, 2, 0, '0xaa', 2, 30)
+    insert_block(db, 2, '0x02b')
+    board.sync_index(db)
+    assert board.top('culture') == [('0xaa', 30), ('0xbb', 20)]
+
+    # The block read last replaced in place
+    db.execute("DELETE FROM turn_summaries WHERE block >= 2")
+    insert_summary(db, 2, 0, '0xaa', 2, 15)
+    insert_block(db, 2, '0x02c')
+    board.sync_index(db)
+    assert board.top('culture') == [('0xbb', 20), ('0xaa', 15)]
+    assert board.cursor == (2, 0)
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+from civ.testing import ZERO_ADDRESS, accounts
+from civ.metrics import TurnMetrics
+from civ.runner import TurnRunner
+
+# Turn metrics recorded by the runner
+
+@pytest.mark.brownie_only
+def test_turn_metrics(world, create_strategy, scripted_strategy, tmp_path):
+    player, failing = accounts[1:3]
+    world.registerStrategy(create_strategy, { 'from': player })
+    world.registerStrategy(scripted_strategy, { 'from': failing })
+    world.startGame()
+
+    # Attacking the zero address reverts inside the strategy call
+    scripted_strategy.setScripts([failing], [(8, ZERO_ADDRESS, 0, 0, 0, 0, False)])
+
+    metrics = TurnMetrics(trace=True)
+    runner = TurnRunner(world, accounts[0], metrics=metrics)
+    report = runner.play_round([player, failing])
+    assert len(report.played) == 2
+
+    records = {record['player']: record for record in metrics.records}
+    assert not records[player]['no_action']
+    assert records[player]['strategy_gas'] > 0
+    assert not records[player]['strategy_failed']
+    assert records[failing]['no_action']
+    assert records[failing]['strategy_failed']
+    for record in records.values():
+        assert record['status'] == 'confirmed'
+        assert record['turn'] == 1
+        assert record['gas_used'] > 0
+        assert record['rpc_latency'] >= 0
+
+    metrics.write_jsonl(tmp_path / 'metrics.jsonl')
+    lines = (tmp_path / 'metrics.jsonl').read_text().splitlines()
+    assert [json.loads(line)['player'] for line in lines] == [r['player'] for r in metrics.records]
+
+    metrics.write_prometheus(tmp_path / 'metrics.prom')
+    prom = (tmp_path / 'metrics.prom').read_text()
+    assert 'civ_turns_total{status="confirmed"} 2' in prom
+    assert 'civ_turns_no_action_total 1' in prom
+    assert 'civ_turn_gas_used_count 2' in prom
+    assert f'civ_player_no_action{{player="{failing}"}} 1' in prom
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+
+from civ.testing import World, accounts
+from civ.helpers import *
+from civ.orchestrator import Orchestrator, WorldHandle
+
+# Game master commands across several worlds
+
+def test_orchestrator(create_strategy):
+    players = accounts[1:4]
+    worlds = [accounts[0].deploy(World) for _ in range(3)]
+    for world in worlds:
+        for player in players:
+            world.registerStrategy(create_strategy, { 'from': player })
+
+    orchestrator = Orchestrator(accounts[0], rpc_workers=4)
+    for i, world in enumerate(worlds):
+        orchestrator.add_world(f"world{i}", world, players, window=2)
+
+    try:
+        results = asyncio.run(orchestrator.run('start_game'))
+        assert all(world.isGameInProgress() for world in worlds)
+
+        results = asyncio.run(orchestrator.play(2))
+        for name, reports in results.items():
+            assert [len(report.played) for report in reports] == [3, 3]
+
+        results = asyncio.run(orchestrator.run('status', ['world0', 'world2']))
+        assert sorted(results) == ['world0', 'world2']
+        assert results['world0'] == {
+            'game': 1, 'in_progress': True, 'turn': 3, 'turn_completed': 0,
+            'active': 3, 'pending': 3,
+        }
+        for world in worlds:
+            assert_player_state(world, players[0], 'culture', INITIAL_POP * 2)
+
+        # A failing world doesn't stop the others
+        # Sent with the orchestrator's nonces, which the other worlds share
+        orchestrator._transact(worlds[1].endGame)
+        results = asyncio.run(orchestrator.run('end_game'))
+        assert isinstance(results['world1'], Exception)
+        assert results['world0'].status == 1
+        assert not any(world.isGameInProgress() for world in worlds)
+    finally:
+        orchestrator.close()
+
+def test_orchestrator_timeout_holds_slot():
+    release = threading.Event()
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def status(handle):
+        with lock:
+            running.append(handle)
+            peak.append(len(running))
+        release.wait(5)
+        with lock:
+            running.remove(handle)
+        return 'done'
+
+    orchestrator = Orchestrator(accounts[0], rpc_workers=4, timeout=0.1)
+    orchestrator.status = status
+    handle = orchestrator.worlds['world'] = WorldHandle('world', None, [], None)
+
+    async def main():
+        # The timed out call keeps running and keeps the world's only slot
+        results = await orchestrator.run('status')
+        assert isinstance(results['world'], asyncio.TimeoutError)
+        waiting = asyncio.create_task(orchestrator.run_command('status', handle))
+        await asyncio.sleep(0.3)
+        assert max(peak) == 1 and not waiting.done()
+        release.set()
+        return await waiting
+
+    try:
+        assert asyncio.run(main()) == 'done'
+        assert max(peak) == 1
+    finally:
+        orchestrator.close()
@@ -0,0 +1,59 @@
+from civ.testing import ZERO_ADDRESS, PackedWorld, World, accounts
+from civ.helpers import *
+
+# Packed storage layout behaves exactly like the default one
+
+def play_scenario(world, farm_strategy, attack_strategy):
+    farmer, player, defender = accounts[1:4]
+    world.registerStrategy(farm_strategy, { 'from': farmer })
+    world.registerStrategy(attack_strategy, { 'from': player })
+    world.registerStrategy(attack_strategy, { 'from': defender })
+    world.startGame()
+
+    attack_strategy.setTrainTarget(5, { 'from': player })
+    attack_strategy.setTrainTarget(1, { 'from': defender })
+    attack_strategy.setAttackTarget(ZERO_ADDRESS, { 'from': player })
+    for turn in range(3):
+        for _player in [farmer, player, defender]:
+            world.playTurn(_player)
+
+    attack_strategy.setAttackTarget(defender, { 'from': player })
+    attack_strategy.setAttackResponse(1, 1, 0, { 'from': defender })
+    tx = world.playTurn(player)
+    return [farmer, player, defender], tx
+
+def test_packed_world_matches_world(world, packed_world, farm_strategy, attack_strategy):
+    players, tx = play_scenario(world, farm_strategy, attack_strategy)
+    _, packed_tx = play_scenario(packed_world, farm_strategy, attack_strategy)
+
+    assert dict(packed_tx.events['TurnSummary'][0]) == dict(tx.events['TurnSummary'][0])
+    for player in players:
+        assert packed_world.getState(player) == world.getState(player)
+        assert packed_world.isPlayerActive(player) == world.isPlayerActive(player)
+
+def test_packed_world_migration(world, farm_strategy, create_strategy):
+    players = accounts[1:4]
+    for player in players:
+        world.registerStrategy(farm_strategy, { 'from': player })
+    world.startGame()
+    for player in players:
+        world.playTurn(player)
+
+    # Migrate into packed storage and back
+    packed_world = accounts[0].deploy(PackedWorld)
+    packed_world.migrateWorld(world)
+    packed_world.migratePlayers(world, players)
+    assert packed_world.validateMigration(world)
+
+    new_world = accounts[0].deploy(World)
+    new_world.migrateWorld(packed_world)
+    new_world.migratePlayers(packed_world, players)
+    assert new_world.validateMigration(world)
+    for player in players:
+        assert packed_world.getState(player) == world.getState(player)
+        assert new_world.getState(player) == world.getState(player)
+
+    # Turns carry on in packed storage
+    for player in players:
+        packed_world.playTurn(player)
+    assert_player_state(packed_world, players[0], 'current_turn', 2)
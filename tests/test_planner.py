@@ -0,0 +1,48 @@
+from civ.engine import PlayerState, World
+from civ.planner import Plan, play_action, search
+from civ.projection import CREATE, project
+
+# Opening search on the engine rules
+
+class ScheduleStrategy:
+
+    def __init__(self, actions):
+        self.actions = actions
+
+    def handle_turn(self, world, state):
+        name, n = self.actions[state.current_turn - 1]
+        if name in ('farm', 'train'):
+            getattr(world, name)(n)
+        else:
+            getattr(world, name)()
+
+def test_plan_replays_on_engine():
+    plan = search(horizon=20, beam=50)
+    assert len(plan.actions) == 20
+
+    engine = World()
+    engine.register_strategy('player', ScheduleStrategy(plan.actions))
+    engine.start_game()
+    for turn in range(20):
+        engine.play_turn('player')
+    state = engine.get_state('player')
+    assert state == plan.state
+    assert plan.value == state.culture
+
+def test_plan_beats_fixed_policy():
+    initial = PlayerState.initial('player')
+    plan = search(horizon=40, beam=200)
+    assert plan.value > project(initial, 40, CREATE).culture
+
+def test_custom_objective():
+    plan = search(horizon=10, beam=50, objective=lambda state: state.land)
+    assert plan.state.land == 5 + 10
+    assert plan.book() == [(1, 10, ('explore', 0))]
+
+def test_book():
+    actions = [('farm', 4), ('produce', 0), ('produce', 0), ('research', 0)]
+    plan = Plan(actions, None, 0)
+    assert plan.book() == [
+        (1, 1, ('farm', 4)), (2, 3, ('produce', 0)), (4, 4, ('research', 0)),
+    ]
+    assert play_action(PlayerState.initial('player'), ('farm', 4)).farms == 4
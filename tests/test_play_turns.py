@@ -0,0 +1,95 @@
+from civ.testing import World, accounts, reverts
+from civ.helpers import *
+from civ.runner import TurnRunner
+from errors import *
+
+# Batched turns
+
+def register(world, strategy, players):
+    for player in players:
+        world.registerStrategy(strategy, { 'from': player })
+
+def test_play_turns_round(world, create_strategy):
+    players = accounts[1:5]
+    register(world, create_strategy, players)
+    world.startGame()
+
+    tx = world.playTurns(players)
+    assert tx.return_value == 4
+    assert world.currentTurn() == 2
+    assert world.currentTurnCompleted() == 0
+    assert [event['player'] for event in tx.events['TurnSummary']] == players
+    assert [event['turn'] for event in tx.events['TurnSummary']] == [1] * 4
+    assert len(tx.events['TurnAction']) == 4
+    for player in players:
+        assert_player_state(world, player, 'culture', INITIAL_POP)
+
+def test_play_turns_matches_play_turn(world, attack_strategy, create_strategy):
+    players = accounts[1:4]
+    worlds = [world, accounts[0].deploy(World)]
+    for _world in worlds:
+        register(_world, create_strategy, players[:2])
+        register(_world, attack_strategy, players[2:])
+        _world.startGame()
+    attack_strategy.setAttackTarget(players[0], { 'from': players[2] })
+
+    single = [world.playTurn(player) for player in players * 3]
+    batch = worlds[1].playTurns(players * 3)
+
+    summaries = [dict(tx.events['TurnSummary'][0]) for tx in single]
+    assert [dict(event) for event in batch.events['TurnSummary']] == summaries
+    assert worlds[1].currentTurn() == world.currentTurn() == 4
+    for player in players:
+        assert worlds[1].getState(player) == world.getState(player)
+
+def test_play_turns_skips(world, create_strategy):
+    players = accounts[1:5]
+    register(world, create_strategy, players)
+    world.startGame()
+    world.playTurn(players[0])
+    world.resign({ 'from': players[3] })
+
+    # Played, inactive and unknown players are skipped
+    tx = world.playTurns([players[0], players[1], players[3], accounts[8], players[1]])
+    assert tx.return_value == 1
+    assert world.currentTurn() == 1
+    assert world.currentTurnCompleted() == 2
+
+    # Rounds roll over mid-batch
+    tx = world.playTurns([players[2], players[0], players[1]])
+    assert tx.return_value == 3
+    assert world.currentTurn() == 2
+    assert world.currentTurnCompleted() == 2
+    assert [event['turn'] for event in tx.events['TurnSummary']] == [1, 2, 2]
+
+def test_play_turns_only_game_master(world, create_strategy):
+    register(world, create_strategy, accounts[1:3])
+    world.startGame()
+    with reverts(ERROR_NOT_GM):
+        world.playTurns(accounts[1:3], { 'from': accounts[1] })
+
+def test_runner_batches(world, create_strategy):
+    players = accounts[1:6]
+    register(world, create_strategy, players)
+    world.startGame()
+    world.playTurn(players[4])
+
+    runner = TurnRunner(world, accounts[0], batch_size=2)
+    report = runner.play(players)
+    assert report.played == players[:4]
+    assert report.skipped == players[4:]
+    assert world.currentTurn() == 2
+
+def test_runner_batch_all_skipped(world, create_strategy):
+    players = accounts[1:5]
+    register(world, create_strategy, players)
+    world.startGame()
+    for player in players[2:]:
+        world.playTurn(player)
+
+    # The second batch emits no TurnSummary at all
+    runner = TurnRunner(world, accounts[0], batch_size=2)
+    report = runner.play(players)
+    assert report.played == players[:2]
+    assert report.skipped == players[2:]
+    assert not report.failed
@@ -1,6 +1,6 @@
 import pytest
 
-from brownie import ZERO_ADDRESS, accounts, reverts
+from civ.testing import ZERO_ADDRESS, accounts, reverts
 from errors import *
 
 # Registration, strategy update, surrender
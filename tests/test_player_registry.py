@@ -0,0 +1,73 @@
+from civ.testing import World, accounts
+from civ.helpers import *
+
+# Enumerable player registry
+
+def test_registry_pages(world, basic_strategy):
+    players = accounts[1:8]
+    for player in players:
+        world.registerStrategy(basic_strategy, { 'from': player })
+
+    assert world.numActivePlayers() == 7
+    assert world.numRegisteredPlayers() == 7
+    assert world.getPlayers(0, 3) == players[0:3]
+    assert world.getPlayers(6, 3) == players[6:7]
+    assert world.getPlayers(7, 3) == []
+    assert world.getPlayers(2, 2 ** 256 - 1) == players[2:]
+    assert get_players(world, page_size=2) == players
+    assert get_registered_players(world, page_size=3) == players
+
+    # Registering again doesn't duplicate
+    world.registerStrategy(basic_strategy, { 'from': players[0] })
+    assert world.numActivePlayers() == 7
+    assert world.numRegisteredPlayers() == 7
+
+def test_registry_resign_swap_and_pop(world, basic_strategy):
+    players = accounts[1:5]
+    for player in players:
+        world.registerStrategy(basic_strategy, { 'from': player })
+
+    # Last player moves into the resigned player's slot
+    world.resign({ 'from': players[1] })
+    assert world.getPlayers(0, 10) == [players[0], players[3], players[2]]
+    assert world.numActivePlayers() == 3
+
+    # Resigning the last player just pops
+    world.resign({ 'from': players[2] })
+    assert world.getPlayers(0, 10) == [players[0], players[3]]
+
+    # Resigned players stay registered and can come back before the game
+    assert get_registered_players(world) == players
+    world.registerStrategy(basic_strategy, { 'from': players[1] })
+    assert world.getPlayers(0, 10) == [players[0], players[3], players[1]]
+    assert world.numRegisteredPlayers() == 4
+
+def test_pending_players(world, create_strategy):
+    players = accounts[1:5]
+    for player in players:
+        world.registerStrategy(create_strategy, { 'from': player })
+    world.startGame()
+
+    assert get_pending_players(world) == players
+    world.playTurn(players[2])
+    world.resign({ 'from': players[0] })
+    assert get_pending_players(world) == [players[3], players[1]]
+    assert world.getPendingPlayers(0) == []
+
+    for player in get_pending_players(world):
+        world.playTurn(player)
+    assert world.currentTurn() == 2
+    assert get_pending_players(world) == [players[3], players[1], players[2]]
+
+def test_migrate_registered_players(world, create_strategy):
+    players = accounts[1:6]
+    for player in players:
+        world.registerStrategy(create_strategy, { 'from': player })
+    world.resign({ 'from': players[4] })
+
+    new_world = accounts[0].deploy(World)
+    new_world.migrateRegisteredPlayers(world, 0, 3)
+    new_world.migrateRegisteredPlayers(world, 3, 3)
+    assert get_registered_players(new_world) == players
+    assert get_players(new_world) == players[:4]
+    assert new_world.getStrategy(players[0]) == create_strategy
@@ -0,0 +1,62 @@
+from civ.helpers import *
+from civ.profiler import *
+
+# Gas accounting on a synthetic trace: World (depth 0) calls the strategy,
+# which calls back into World once
+
+WORLD = '0x' + '11' * 20
+STRATEGY = '0x' + '22' * 20
+
+def step(address, depth, op, gas, gas_cost, fn):
+    return {
+        'address': address, 'depth': depth, 'op': op,
+        'gas': gas, 'gasCost': gas_cost, 'fn': fn,
+    }
+
+TRACE = [
+    step(WORLD, 0, 'PUSH1', 10000, 3, 'World.playTurn'),
+    step(WORLD, 0, 'CALL', 9997, 100, 'World.playTurn'),
+    step(STRATEGY, 1, 'SLOAD', 5000, 2100, 'Strategy.handleTurn'),
+    step(STRATEGY, 1, 'CALL', 2900, 100, 'Strategy.handleTurn'),
+    step(WORLD, 2, 'SSTORE', 2000, 1500, 'World.explore'),
+    step(WORLD, 2, 'STOP', 500, 0, 'World.explore'),
+    step(STRATEGY, 1, 'STOP', 400, 0, 'Strategy.handleTurn'),
+    step(WORLD, 0, 'POP', 4300, 2, 'World.playTurn'),
+    step(WORLD, 0, 'STOP', 4298, 0, 'World.playTurn'),
+]
+
+def test_find_frame():
+    assert find_frame(TRACE, STRATEGY) == (2, 7)
+    assert find_frame(TRACE, '0x' + '33' * 20) is None
+    assert frame_gas(TRACE, 2, 7) == 4600
+    assert not frame_failed(TRACE, 2, 7)
+
+def test_step_costs_add_up():
+    costs = step_costs(TRACE, 2, 7)
+    assert costs == [2100, 1000, 1500, 0, 0]
+    assert sum(costs) == frame_gas(TRACE, 2, 7)
+    assert sum(step_costs(TRACE)) == frame_gas(TRACE, 0, len(TRACE))
+
+def test_profile():
+    profile = Profile()
+    assert profile.add('handleTurn', TRACE, STRATEGY, 'state') == 4600
+    assert profile.headroom('handleTurn') == HANDLE_TURN_GAS_LIMIT - 4600
+    assert profile.worst_input['handleTurn'] == 'state'
+    assert profile.opcodes['handleTurn']['SLOAD'] == 2100
+    assert profile.opcodes['handleTurn']['SSTORE'] == 1500
+    assert profile.functions['handleTurn']['World.explore'] == 1500
+    assert sum(profile.functions['handleTurn'].values()) == 4600
+
+    # Running out of gas counts as a failure
+    failed = [dict(s) for s in TRACE]
+    failed[6]['op'] = 'REVERT'
+    profile.add('handleTurn', failed, STRATEGY)
+    assert profile.failures['handleTurn'] == 1
+
+def test_sample_states():
+    states = sample_states(20, seed=1)
+    assert states[0] == INITIAL_STATE
+    assert sample_states(20, seed=1) == states
+    for state in states:
+        assert state['farms'] <= state['land']
+        assert state['soldiers'] <= state['population']
@@ -0,0 +1,79 @@
+import pytest
+from civ.engine import PlayerState, World
+from civ.helpers import *
+from civ.projection import (
+    CREATE, EXPLORE, IDLE, POLICIES, PRODUCE,
+    loot_at, population_at, project, resources_at, turns_until_pop_cap,
+)
+from civ.strategies import BasicStrategy, CreateStrategy, ExploreStrategy, ProduceStrategy
+
+# Closed-form projections match stepping the engine turn by turn
+
+POLICY_STRATEGIES = {
+    IDLE: BasicStrategy,
+    PRODUCE: ProduceStrategy,
+    CREATE: CreateStrategy,
+    EXPLORE: ExploreStrategy,
+}
+
+STATES = [
+    {},
+    { 'farms': 4, 'science': 3 },
+    { 'farms': 5, 'science': 50, 'population': 3 },
+    { 'farms': 2, 'science': 2, 'soldiers': 4 },
+    { 'land': 3, 'farms': 3, 'science': 10, 'soldiers': 12 },
+    { 'land': 20, 'farms': 20, 'science': 100 },
+]
+
+def play(fields, policy, turns):
+    player = 'player'
+    engine = World()
+    engine.register_strategy(player, POLICY_STRATEGIES[policy]())
+    state = engine._player_states[player]
+    for key, val in fields.items():
+        setattr(state, key, val)
+    start = state.copy()
+
+    engine.start_game()
+    states = []
+    for turn in range(turns):
+        engine.play_turn(player)
+        states.append(engine.get_state(player))
+    return start, states
+
+@pytest.mark.parametrize('policy', POLICIES)
+@pytest.mark.parametrize('fields', STATES)
+def test_project_matches_engine(fields, policy):
+    start, states = play(fields, policy, 60)
+    for turns, state in enumerate(states, 1):
+        assert project(start, turns, policy) == state
+    assert project(start, 0, policy) == start
+
+def test_project_dict_state():
+    state = parse_player_state(PlayerState.initial('player'))
+    assert project(state, 3, CREATE) == project(PlayerState.initial('player'), 3, CREATE)
+
+def test_project_invalid():
+    with pytest.raises(ValueError):
+        project(PlayerState.initial('player'), 1, 'research')
+    with pytest.raises(ValueError):
+        project(PlayerState.initial('player'), -1)
+
+def test_turns_until_pop_cap():
+    fields = { 'farms': 5, 'science': 50, 'population': 3 }
+    start, states = play(fields, IDLE, 100)
+    turns = turns_until_pop_cap(start)
+    assert states[turns - 1].population == states[-1].population
+    assert states[turns - 2].population < states[turns - 1].population
+
+    # No food, no growth
+    assert turns_until_pop_cap(PlayerState.initial('player')) == 0
+
+def test_resources_and_loot_at():
+    state = PlayerState.initial('player')
+    assert resources_at(state, 200) == INITIAL_RESOURCES + 200 * INITIAL_LAND
+    assert loot_at(state, 1) == compute_loot(1)
+    assert population_at(state, 10) == INITIAL_POP
+
+    start, states = play({ 'farms': 4, 'science': 3 }, PRODUCE, 200)
+    assert resources_at(start, 200, PRODUCE) == states[-1].resources
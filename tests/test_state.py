@@ -0,0 +1,92 @@
+import pytest
+from eth_abi import encode
+from civ.engine import PlayerState as EnginePlayerState
+from civ.helpers import PLAYER_STATE_KEYS
+from civ.state import *
+
+# Raw PlayerState decoding
+
+# Addresses ending in zero bytes, which fixed-size byte strings would strip
+PLAYERS = ['0x' + f"{i:02x}" * 20 for i in range(1, 3)] + ['0x' + '03' * 18 + '0000']
+STRATEGY = '0x' + 'ab' * 19 + '00'
+STATE_TYPE = '(address,uint256,uint256,uint256,uint256,uint256,uint256,uint256,uint256)'
+
+def states():
+    return [
+        PlayerState(to_address(bytes.fromhex(player[2:])), i, 5 + i, i, 1, 10 * i, 0, 10, 50 + i)
+        for i, player in enumerate(PLAYERS)
+    ]
+
+def encode_states(states, active, strategies):
+    return encode(
+        [f'{STATE_TYPE}[]', 'bool[]', 'address[]'],
+        [[tuple(state) for state in states], active, strategies],
+    )
+
+def test_player_state():
+    assert EnginePlayerState is PlayerState
+    state = PlayerState.initial('player')
+    assert state.as_dict()['population'] == 10
+    assert state.copy() == state and state.copy() is not state
+
+def test_decode_state():
+    state = states()[1]
+    assert decode_state(encode([STATE_TYPE], [tuple(state)])) == state
+
+    # At an offset, as in a returned array
+    data = encode(['uint256', STATE_TYPE], [7, tuple(state)])
+    assert decode_state(data, 32) == state
+
+def test_decode_states():
+    expected = states()
+    data = encode_states(expected, [True, False, True], [STRATEGY] * 3)
+    decoded, active, strategies = decode_states(data)
+    assert decoded == expected
+    assert active == [True, False, True]
+    assert strategies == [to_address(bytes.fromhex(STRATEGY[2:]))] * 3
+
+    assert decode_states(encode_states([], [], [])) == ([], [], [])
+
+def test_decode_states_array():
+    expected = states()
+    data = encode_states(expected, [True, False, True], [STRATEGY] * 3)
+    array, active, strategies = decode_states_array(data)
+    assert array.dtype == STATE_DTYPE
+    assert [to_address(player) for player in array['player']] == [state.player for state in expected]
+    for key in PLAYER_STATE_KEYS[1:]:
+        assert array[key].tolist() == [getattr(state, key) for state in expected]
+    assert active.tolist() == [True, False, True]
+    assert strategies.tolist() == [bytes.fromhex(STRATEGY[2:])] * 3
+
+    array, active, strategies = decode_states_array(encode_states([], [], []))
+    assert len(array) == len(active) == len(strategies) == 0
+
+    # Values beyond uint64
+    big = states()
+    big[0].culture = 2 ** 64
+    with pytest.raises(OverflowError):
+        decode_states_array(encode_states(big, [True] * 3, [STRATEGY] * 3))
+
+def test_decode_snapshot_array():
+    expected = states()
+    data = encode(
+        ['uint256', 'uint256', f'{STATE_TYPE}[]', 'bool[]', 'address[]'],
+        [4, 2, [tuple(state) for state in expected], [True] * 3, [STRATEGY] * 3],
+    )
+    turn, turn_completed, array, active, strategies = decode_snapshot_array(data)
+    assert (turn, turn_completed) == (4, 2)
+    assert array['resources'].tolist() == [50, 51, 52]
+    assert active.all()
+
+def test_decode_summary():
+    state = states()[2]
+    log = {
+        'topics': [
+            b'\x00' * 32,
+            encode(['address'], [state.player]),
+            encode(['uint256'], [3]),
+            encode(['uint256'], [state.current_turn]),
+        ],
+        'data': encode(['uint256'] * 7, list(state)[2:]),
+    }
+    assert decode_summary(log) == (3, state)
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+from civ.engine import AttackResponse, PlayerState, compute_loot, resolve_attack, resolve_trade
+from civ.helpers import DEFENSE_CULTURE_BONUS
+from civ.profiler import sample_states
+from civ.state import ADDRESS_SIZE, STATE_DTYPE
+from civ.targeting import Targeting
+
+# All-pairs attack and trade evaluation
+
+def players(count, seed=0):
+    return [
+        PlayerState(f"p{i}", **state)
+        for i, state in enumerate(sample_states(count, seed))
+    ]
+
+@pytest.mark.parametrize('seed', range(3))
+def test_targeting_matches_engine(seed):
+    states = players(12, seed)
+    # Some defenders too poor to fortify, some with nothing to loot
+    states[1].resources = 3
+    states[2].resources = 0
+    targeting = Targeting.from_states(states, fortifications=7)
+
+    for i, attacker in enumerate(states):
+        for j, defender in enumerate(states):
+            if i == j:
+                continue
+            for response in AttackResponse:
+                a, d = attacker.copy(), defender.copy()
+                defenders = d.soldiers
+                resolve_attack(a, d, a.soldiers, response, defenders, 7)
+                outcome = targeting.attacks[response]
+
+                assert outcome.land[i, j] == a.land - attacker.land
+                if outcome.success[i, j]:
+                    assert outcome.loot[i, j] == a.resources - attacker.resources
+                else:
+                    assert outcome.loot[i, j] == 0
+                assert outcome.attacker_casualties[i, j] == attacker.population - a.population
+                assert outcome.defender_casualties[i, j] == defender.population - d.population
+                assert outcome.defense_culture[i, j] == d.culture - defender.culture
+
+            a, d = attacker.copy(), defender.copy()
+            resolve_trade(a, d, True)
+            assert targeting.trade[i, j] == a.culture - attacker.culture
+            assert targeting.trade[j, i] == d.culture - defender.culture
+
+def test_targeting_ranks():
+    states = [
+        PlayerState('a', land=5, resources=50, soldiers=15, population=20),
+        PlayerState('b', land=2, resources=100, soldiers=0, population=10),
+        PlayerState('c', land=10, resources=100, soldiers=20, population=30),
+        PlayerState('d', land=1, resources=1000, soldiers=0, population=40),
+    ]
+    targeting = Targeting.from_states(states, active=[True, True, True, False])
+
+    # b can only fortify, c fights back harder than a can attack
+    assert targeting.targets('a', response=AttackResponse.RETREAT) == [('b', 50), ('c', 10)]
+    assert targeting.targets('a') == [('b', 45), ('c', 0)]
+    assert targeting.targets('a', top=1) == [('b', 45)]
+    assert targeting.targets('a', key='land') == [('b', 1), ('c', 0)]
+    assert targeting.targets('d') == []
+
+    # Worst cases of costs and of the defender's gains are the largest
+    a, c = targeting.index('a'), targeting.index('c')
+    assert targeting.attack_values('attacker_casualties')[a, c] == 15
+    assert targeting.attack_values('attacker_casualties', AttackResponse.RETREAT)[a, c] == 0
+    assert targeting.attack_values('defense_culture')[a, c] == DEFENSE_CULTURE_BONUS
+    assert targeting.attack_values('defender_casualties')[a, c] == 0
+    with pytest.raises(ValueError):
+        targeting.attack_values('culture')
+
+    assert targeting.best_targets() == {
+        'a': ('b', 45), 'b': ('a', 0), 'c': ('b', 45), 'd': (None, 0),
+    }
+
+    # Civilians: a 5, b 10, c 10
+    assert targeting.partners('a') == [('b', 10), ('c', 10)]
+    assert targeting.partners('a', mutual=True, top=1) == [('b', 5)]
+    assert targeting.partners('b') == [('c', 10), ('a', 5)]
+    assert (targeting.mutual_trade == targeting.mutual_trade.T).all()
+
+def test_targeting_inputs():
+    states = players(5)
+    active = [True, True, False, True, True]
+    snapshot = {
+        'states': {state.player: state.as_dict() for state in states},
+        'active': dict(zip((state.player for state in states), active)),
+    }
+    targeting = Targeting.from_snapshot(snapshot)
+    assert targeting.players == [state.player for state in states]
+    assert not targeting.valid[:, 2].any() and not targeting.valid[2].any()
+    assert not targeting.valid.diagonal().any()
+
+    # Attackers sending fewer soldiers win fewer fights
+    fewer = Targeting.from_states(states, soldiers=0)
+    assert not fewer.attacks[AttackResponse.FIGHT].success.any()
+    assert not fewer.attack_values('loot').any()
+    assert fewer.attack_values('loot', AttackResponse.RETREAT)[0, 1] == compute_loot(states[1])
+
+    # From a civ.state array, raw addresses ending in zero bytes kept whole
+    addresses = [state.player.encode().ljust(ADDRESS_SIZE, b'\0') for state in states]
+    array = np.array(
+        [(address, *list(state)[1:]) for address, state in zip(addresses, states)],
+        dtype=STATE_DTYPE,
+    )
+    from_array = Targeting.from_states(array)
+    assert from_array.players == addresses
+    assert (from_array.trade == Targeting.from_states(states).trade).all()
@@ -0,0 +1,41 @@
+import pytest
+from civ.strategies import CreateStrategy, TradeStrategy
+from civ.tournament import *
+
+# Strategy tournaments on the engine
+
+def test_play_game():
+    results = play_game(('create', 'basic'), 20, seed=1)
+    create, basic = results
+    assert create['win'] == 1 and basic['win'] == 0
+    assert create['culture'][-1] > 0 and basic['culture'][-1] == 0
+    assert len(create['land']) == 20
+
+    # Seeded games replay exactly
+    assert play_game(('create', 'basic'), 20, seed=1) == results
+
+def test_run_tournament():
+    specs = ['create', 'basic', 'trade']
+    results = run_tournament(specs, turns=10, games=2, workers=2)
+
+    # Two round-robin games per pair, plus two free-for-alls
+    assert all(results.games[spec] == 6 for spec in specs)
+    assert results.win_rate('basic') < results.win_rate('create')
+    assert results.pair_games['create', 'basic'] == 2
+    assert results.head_to_head['create', 'basic'] == 2
+
+def trade_first(opponents):
+    return TradeStrategy(opponents[0])
+
+def test_load_strategy():
+    assert isinstance(load_strategy('create')(['a']), CreateStrategy)
+
+    # `module:attr` factories are called with the opponents too
+    factory = load_strategy(f'{__name__}:trade_first')
+    strategy = factory(['a', 'b'])
+    assert isinstance(strategy, TradeStrategy) and strategy.trade_partner == 'a'
+    create, trade = play_game(('create', f'{__name__}:trade_first'), 5, seed=1)
+    assert trade['culture'][-1] > 0
+
+    with pytest.raises(ValueError):
+        load_strategy('nope')
@@ -0,0 +1,63 @@
+import pytest
+from civ.testing import accounts, reverts
+from civ.helpers import *
+
+# Seeding state directly into the test harness
+
+def test_seed_state(world_harness, basic_strategy):
+    player = accounts[1]
+    seed_state(world_harness, player, basic_strategy, land=12, soldiers=3)
+
+    assert world_harness.isPlayerActive(player)
+    assert world_harness.numActivePlayers() == 1
+    assert world_harness.getStrategy(player) == basic_strategy.address
+    assert_player_state(world_harness, player, 'land', 12)
+    assert_player_state(world_harness, player, 'soldiers', 3)
+    assert_player_state(world_harness, player, 'resources', INITIAL_RESOURCES)
+
+    # Seeding again keeps the other fields and doesn't count the player twice
+    seed_state(world_harness, player, culture=7)
+    assert world_harness.numActivePlayers() == 1
+    assert world_harness.getStrategy(player) == basic_strategy.address
+    assert_player_state(world_harness, player, 'land', 12)
+    assert_player_state(world_harness, player, 'culture', 7)
+
+def test_seed_state_unknown_field(world_harness, basic_strategy):
+    with pytest.raises(KeyError):
+        seed_state(world_harness, accounts[1], basic_strategy, gold=1)
+
+def test_seed_only_game_master(world_harness, basic_strategy):
+    state = [accounts[1], *INITIAL_STATE.values()]
+    with reverts("Caller must be game master"):
+        world_harness.seedState(basic_strategy, state, { 'from': accounts[1] })
+    with reverts("Caller must be game master"):
+        world_harness.seedTurn(5, 0, { 'from': accounts[1] })
+
+def test_seed_turn(world_harness, create_strategy):
+    players = accounts[1:3]
+    for player in players:
+        seed_state(world_harness, player, create_strategy, current_turn=9)
+    seed_turn(world_harness, 10, 1)
+
+    world_harness.playTurn(players[0])
+    assert world_harness.currentTurn() == 11
+    assert world_harness.currentTurnCompleted() == 0
+    assert_player_state(world_harness, players[0], 'current_turn', 10)
+
+def test_seeded_attack_fight_win(world_harness, attack_strategy):
+    player, defender = accounts[1:3]
+    seed_state(world_harness, player, attack_strategy, soldiers=5, population=10)
+    seed_state(world_harness, defender, attack_strategy, soldiers=1, population=10)
+    seed_turn(world_harness, 1)
+
+    attack_strategy.setAttackTarget(defender, { 'from': player })
+    attack_strategy.setAttackResponse(1, 1, 0, { 'from': defender })
+    world_harness.playTurn(player)
+
+    assert_player_state(world_harness, player, 'land', INITIAL_LAND + 1)
+    assert_player_state(world_harness, player, 'soldiers', 0)
+    assert_player_state(world_harness, player, 'population', 5)
+    assert_player_state(world_harness, defender, 'land', INITIAL_LAND - 1)
+    assert_player_state(world_harness, defender, 'resources', INITIAL_RESOURCES - compute_loot())
+    assert_player_state(world_harness, defender, 'soldiers', 0)
+    assert_player_state(world_harness, defender, 'population', 9)
@@ -1,5 +1,14 @@
 import pytest
-from brownie import World, accounts, reverts
+from civ.testing import ZERO_ADDRESS, LegacyWorld, World, accounts, reverts
+from civ.helpers import *
+from civ.migration import (
+    get_active_players,
+    get_source,
+    get_unpulled_players,
+    has_view,
+    pull_players,
+    verify_migration,
+)
 from errors import *
 
 
@@ -40,3 +49,155 @@ def test_world_migration(world, create_strategy):
     for player in players:
         new_world.playTurn(player)
     assert new_world.currentTurn() == 3
+
+
+@pytest.fixture
+def played_world(world, create_strategy):
+    # 9 players, all but the first played turn 1
+    players = accounts[1:10]
+    for player in players:
+        world.registerStrategy(create_strategy, { 'from': player })
+    world.startGame()
+    for player in players[1:]:
+        world.playTurn(player)
+    return world
+
+@pytest.mark.brownie_only
+def test_lazy_world_migration(played_world, create_strategy):
+    world = played_world
+    players = accounts[1:10]
+
+    new_world = accounts[0].deploy(World)
+    new_world.migrateWorldLazily(world)
+    assert new_world.migrationSource() == world
+    assert new_world.validateMigration(world)
+
+    # Nothing copied, views read through to the old world
+    assert new_world.numRegisteredPlayers() == 0
+    assert new_world.numActivePlayers() == 9
+    assert new_world.getState(players[0]) == world.getState(players[0])
+    assert new_world.isPlayerActive(players[0])
+    assert new_world.getStrategy(players[0]) == create_strategy
+    assert get_states(new_world, players) == get_states(world, players)
+    assert get_active_players(new_world) == get_players(world)
+
+    report = verify_migration(new_world, world)
+    assert len(report.missing) == 9
+    assert not report.complete
+
+    # The last turn of the round pulls its player and completes the round
+    new_world.playTurn(players[0])
+    assert new_world.numRegisteredPlayers() == 1
+    assert new_world.currentTurn() == 2
+    assert new_world.currentTurnCompleted() == 0
+    assert_player_state(new_world, players[0], 'culture', INITIAL_POP)
+
+    # A new round pulls everyone
+    for player in players:
+        new_world.playTurn(player)
+    assert new_world.currentTurn() == 3
+    assert new_world.numRegisteredPlayers() == 9
+    assert new_world.numActivePlayers() == 9
+
+    report = verify_migration(new_world, world)
+    assert report.missing == []
+    assert len(report.advanced) == 9
+
+    new_world.completeMigration()
+    assert new_world.migrationSource() == ZERO_ADDRESS
+    assert new_world.numActivePlayers() == 9
+
+def test_lazy_world_migration_pull_players(played_world):
+    world = played_world
+    players = accounts[1:10]
+
+    new_world = accounts[0].deploy(World)
+    new_world.migrateWorldLazily(world)
+    with reverts(ERROR_PLAYERS_LEFT_TO_PULL):
+        new_world.completeMigration()
+    with reverts(ERROR_NOT_GM):
+        new_world.pullPlayers(players, { 'from': players[0] })
+
+    # Bulk pulls, pulling twice or pulling non players does nothing
+    pull_players(new_world, list(players) + [accounts[0]], accounts[0], batch_size=4)
+    new_world.pullPlayers(players[:2])
+    assert new_world.numRegisteredPlayers() == 9
+    assert get_registered_players(new_world) == get_registered_players(world)
+
+    report = verify_migration(new_world, world)
+    assert report.complete
+    assert report.verified == 9
+
+    new_world.completeMigration()
+    assert new_world.validateMigration(world)
+
+def test_lazy_world_migration_actions(played_world, attack_strategy):
+    world = played_world
+    players = accounts[1:10]
+
+    new_world = accounts[0].deploy(World)
+    new_world.migrateWorldLazily(world)
+
+    # Attack targets are pulled before the attack
+    new_world.updateStrategy(attack_strategy, { 'from': players[1] })
+    attack_strategy.setAttackTarget(players[2], { 'from': players[1] })
+    new_world.playTurn(players[0])
+    new_world.playTurn(players[1])
+    assert new_world.numRegisteredPlayers() == 3
+    state = parse_player_state(new_world.getState(players[2]))
+    assert state['resources'] < parse_player_state(world.getState(players[2]))['resources']
+    assert new_world.numActivePlayers() == 9
+
+    # Resigning pulls the player first
+    new_world.resign({ 'from': players[8] })
+    assert new_world.numRegisteredPlayers() == 4
+    assert new_world.numActivePlayers() == 8
+    assert not new_world.isPlayerActive(players[8])
+
+def test_lazy_world_migration_live_source(played_world):
+    world = played_world
+    players = accounts[1:10]
+
+    new_world = accounts[0].deploy(World)
+    new_world.migrateWorldLazily(world)
+    new_world.pullPlayers(players[:1])
+
+    # Resignations on the source are recounted, unpulled players still play
+    world.resign({ 'from': players[1] })
+    new_world.pullPlayers([])
+    assert new_world.numActivePlayers() == 8
+    new_world.playTurn(players[2])
+
+    pull_players(new_world, list(players), accounts[0])
+    assert not new_world.isPlayerActive(players[1])
+    new_world.completeMigration()
+    assert new_world.numActivePlayers() == 8
+
+@pytest.mark.brownie_only
+def test_lazy_world_migration_legacy_source(played_world):
+    players = accounts[1:10]
+    legacy = accounts[0].deploy(LegacyWorld, played_world)
+    new_world = accounts[0].deploy(World)
+    new_world.migrateWorldLazily(legacy)
+    new_world.pullPlayers(players[:2])
+
+    # No registry or getStates on the source, its players are passed in
+    source = get_source(new_world)
+    assert not has_view(source, 'numRegisteredPlayers')
+    assert has_view(source, 'numActivePlayers')
+    with pytest.raises(ValueError):
+        get_unpulled_players(new_world)
+    with pytest.raises(ValueError):
+        get_active_players(new_world)
+    assert get_unpulled_players(new_world, players=players) == players[2:]
+    assert get_active_players(new_world, source_players=players) == players
+
+    report = verify_migration(new_world, source, players)
+    assert report.verified == 2
+    assert report.missing == players[2:]
+
+def test_lazy_world_migration_requires_empty_world(played_world, create_strategy):
+    new_world = accounts[0].deploy(World)
+    new_world.registerStrategy(create_strategy, { 'from': accounts[1] })
+    with reverts(ERROR_WORLD_HAS_PLAYERS):
+        new_world.migrateWorldLazily(played_world)
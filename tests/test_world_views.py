@@ -0,0 +1,74 @@
+from civ.testing import ZERO_ADDRESS, accounts
+from civ.helpers import *
+from civ.state import (
+    call_raw,
+    decode_snapshot_array,
+    decode_summary,
+    get_state_raw,
+    get_states_array,
+    to_address,
+)
+
+# Bulk views
+
+def test_get_states(world, create_strategy, explore_strategy):
+    player, partner, rando = accounts[1:4]
+    world.registerStrategy(create_strategy, { 'from': player })
+    world.registerStrategy(explore_strategy, { 'from': partner })
+    world.startGame()
+    world.playTurn(player)
+    world.playTurn(partner)
+
+    players = [player, partner, rando]
+    states, active, strategies = get_states(world, players)
+    assert states == [parse_player_state(world.getState(p)) for p in players]
+    assert active == [True, True, False]
+    assert strategies == [create_strategy.address, explore_strategy.address, ZERO_ADDRESS]
+
+    # Paginated fetch returns the same
+    assert get_states(world, players, page_size=2) == (states, active, strategies)
+
+def test_get_snapshot(world, create_strategy):
+    players = accounts[1:4]
+    for player in players:
+        world.registerStrategy(create_strategy, { 'from': player })
+    world.startGame()
+    world.playTurn(players[0])
+
+    snapshot = get_snapshot(world, players)
+    assert snapshot['current_turn'] == 1
+    assert snapshot['current_turn_completed'] == 1
+    assert snapshot['states'][players[0]]['culture'] == INITIAL_POP
+    assert snapshot['states'][players[1]]['current_turn'] == 0
+    assert all(snapshot['active'].values())
+
+def test_get_states_raw(world, create_strategy):
+    players = accounts[1:4]
+    for player in players[:2]:
+        world.registerStrategy(create_strategy, { 'from': player })
+    world.startGame()
+    world.playTurn(players[0])
+
+    # Raw decoding matches brownie's
+    assert get_state_raw(world, players[0]).as_dict() == parse_player_state(world.getState(players[0]))
+
+    states, active, strategies = get_states_array(world, players, page_size=2)
+    expected, expected_active, expected_strategies = get_states(world, players)
+    for record, state in zip(states, expected):
+        assert to_address(record['player']) == state['player']
+        assert {key: int(record[key]) for key in PLAYER_STATE_KEYS[1:]} == {
+            key: state[key] for key in PLAYER_STATE_KEYS[1:]
+        }
+    assert active.tolist() == expected_active
+    assert [to_address(strategy) for strategy in strategies] == expected_strategies
+
+    turn, turn_completed, states, *_ = decode_snapshot_array(call_raw(world, 'getSnapshot', players))
+    assert (turn, turn_completed) == (1, 1)
+    assert states['culture'].tolist() == [INITIAL_POP, 0, 0]
+
+    # TurnSummary logs, emitted after the TurnAction
+    tx = world.playTurn(players[1])
+    log = [log for log in tx.logs if log['address'] == world.address][-1]
+    game, state = decode_summary(log)
+    assert game == 1
+    assert state == get_state_raw(world, players[1])